@@ -1,31 +1,63 @@
 """
 Queries and downloads papers from arXiv.org
+
+feedparser, dateutil, urllib.request and the ArxivCategory enum
+are only imported once they are needed, so that importing pyarxiv
+(and starting pyarxiv-cli) stays cheap.
 """
+import io
 import os.path
 import re
 import sys
 import urllib  # todo check python 2
 
-import dateutil.parser
-import feedparser
-
-from pyarxiv.arxiv_categories import ArxivCategory, arxiv_category_map
-
 ARXIV_DL_BASE_URL = "https://arxiv.org/pdf/"
 ARXIV_API_BASE_URI = 'http://export.arxiv.org/api/query?'
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# longest API URL lookup_ids() builds, well below common server limits
+MAX_URL_LENGTH = 2000
+# entries download_query() parses ahead of the downloads
+PREFETCH_SIZE = 100
+# what make_filename_safe() replaces, \w is str.isalnum() and '_'
+UNSAFE_FILENAME_CHARACTERS = re.compile(r'[^\w.]')
+SORT_BY_OPTIONS = ('relevance', 'lastUpdatedDate', 'submittedDate')
+SORT_ORDER_OPTIONS = ('ascending', 'descending')
+# bounds of open-ended submittedDate ranges, as YYYYMMDDHHMM in GMT
+EARLIEST_SUBMISSION = '199101010000'
+LATEST_SUBMISSION = '999912312359'
 
 if sys.version_info < (3, 0):
     from urllib import quote_plus
-    from urllib import urlopen
 else:
     from urllib.parse import quote_plus
-    from urllib.request import urlopen
+
+
+def __getattr__(name):
+    # ArxivCategory and arxiv_category_map used to be imported eagerly
+    if name in ('ArxivCategory', 'arxiv_category_map'):
+        from pyarxiv import arxiv_categories
+        return getattr(arxiv_categories, name)
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def urlopen(url, *args, **kwargs):
+    headers = kwargs.pop('headers', None)
+    method = kwargs.pop('method', None)
+    if sys.version_info < (3, 0):  # pragma: no-cover
+        return urllib.urlopen(url, *args, **kwargs)
+    else:
+        import urllib.request
+        if headers or method:
+            url = urllib.request.Request(url, headers=headers or {},
+                                         method=method)
+        return urllib.request.urlopen(url, *args, **kwargs)
 
 
 def retrieve(url, file):
     if sys.version_info <= (3, 0):  # pragma: no-cover
         urllib.urlretrieve(url, file)
     else:
+        import urllib.request
         urllib.request.urlretrieve(url, file)
 
 
@@ -36,13 +68,753 @@ class ArxivQueryError(Exception):
         self.cause = cause
 
 
-def query(max_results=100, ids=[], categories=[],
+class UrllibTransport(object):
+    """
+    Default transport of ArxivClient, talks to arXiv.org through urllib.
+    Transports implement open(url), returning a file-like response,
+    and retrieve(url, filename), saving the body of url to filename.
+    Transports may implement head(url), returning the response headers
+    without the body, which plan_downloads() needs.
+
+    :param bool compress: Ask for gzip or deflate encoded responses,
+                   which open() decompresses while they are read.
+                   Their byte counts add up in self.stats,
+                   a pyarxiv.compression.TransferStats.
+    """
+
+    def __init__(self, compress=True):
+        self.compress = compress
+        self.stats = None
+        if compress:
+            from pyarxiv.compression import TransferStats
+            self.stats = TransferStats()
+
+    def open(self, url):
+        if not self.compress:
+            return urlopen(url)
+        from pyarxiv.compression import ACCEPT_ENCODING, decode_response
+        response = urlopen(url, headers={'Accept-Encoding': ACCEPT_ENCODING})
+        return decode_response(response, self.stats)
+
+    def head(self, url):
+        response = urlopen(url, method='HEAD')
+        try:
+            return response.headers
+        finally:
+            response.close()
+
+    def retrieve(self, url, filename):
+        retrieve(url, filename)
+
+
+class ArxivClient(object):
+    """
+    Queries and downloads papers from arXiv.org.
+
+    A client holds its transport, response cache, rate limiter,
+    endpoints and defaults. It is safe to share between threads,
+    and can be pickled or forked into worker processes.
+    Differently configured clients do not interfere with each other.
+
+    :param transport: Used for all network access,
+                   default is UrllibTransport().
+    :param cache: Response cache with get(key) and set(key, value),
+                   e.g. pyarxiv.cache.MemoryCache(). Default is no cache.
+    :param limiter: Rate limiter with wait(), called before each request,
+                   e.g. pyarxiv.ratelimit.RateLimiter(). Default is no limit.
+    :param str api_url: Base URI of the arXiv API.
+    :param str pdf_url: Base URL PDFs are downloaded from.
+    :param int max_results: Default max number of results of query().
+    :param str target_folder: Default folder of download_entry().
+    :param store: If given, PDFs are downloaded into this
+                   pyarxiv.store.PdfStore once, and linked into
+                   target folders. Default is to download each time.
+    :param bandwidth: pyarxiv.ratelimit.BandwidthScheduler limiting
+                   the bytes per second of PDF downloads. Share one
+                   between clients to limit their combined bandwidth.
+    :param int priority: Priority of this client's downloads at the
+                   bandwidth scheduler, lower values are served first.
+    :param job: Name this client's downloads are accounted to,
+                   jobs of equal priority share bandwidth fairly.
+    """
+
+    def __init__(self, transport=None, cache=None, limiter=None,
+                 api_url=ARXIV_API_BASE_URI, pdf_url=ARXIV_DL_BASE_URL,
+                 max_results=100, target_folder='.', store=None,
+                 bandwidth=None, priority=0, job=None):
+        self.transport = transport if transport is not None \
+            else UrllibTransport()
+        self.cache = cache
+        self.limiter = limiter
+        self.api_url = api_url
+        self.pdf_url = pdf_url
+        self.max_results = max_results
+        self.target_folder = target_folder
+        self.store = store
+        self.bandwidth = bandwidth
+        self.priority = priority
+        self.job = job
+
+    def copy(self, **overrides):
+        """
+        Creates a client sharing this client's state,
+        except for the given constructor arguments.
+
+        :return: new client
+        :rtype: ArxivClient
+        """
+        settings = dict(transport=self.transport,
+                        cache=self.cache,
+                        limiter=self.limiter,
+                        api_url=self.api_url,
+                        pdf_url=self.pdf_url,
+                        max_results=self.max_results,
+                        target_folder=self.target_folder,
+                        store=self.store,
+                        bandwidth=self.bandwidth,
+                        priority=self.priority,
+                        job=self.job)
+        settings.update(overrides)
+        return self.__class__(**settings)
+
+    def fetch(self, url):
+        """
+        Fetches the body of url, going through cache and rate limiter.
+
+        :param str url: URL to fetch
+        :return: response body
+        :rtype: bytes
+        """
+        from pyarxiv.profiling import BODY_READ, HTTP_WAIT, stage
+
+        def load():
+            if self.limiter is not None:
+                self.limiter.wait()
+            with stage(HTTP_WAIT, url):
+                response = self.transport.open(url)
+            with stage(BODY_READ, url):
+                return response.read()
+
+        if self.cache is None:
+            return load()
+        if hasattr(self.cache, 'get_or_set'):
+            return self.cache.get_or_set(url, load)
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached
+        body = load()
+        self.cache.set(url, body)
+        return body
+
+    def head(self, url):
+        """
+        Sends a HEAD request for url, going through the rate limiter.
+
+        :return: response headers, e.g. Content-Length and ETag
+        :raises ValueError: if the transport cannot send HEAD requests
+        """
+        from pyarxiv.profiling import HTTP_WAIT, stage
+        if not hasattr(self.transport, 'head'):
+            raise ValueError('%s cannot send HEAD requests'
+                             % type(self.transport).__name__)
+        if self.limiter is not None:
+            self.limiter.wait()
+        with stage(HTTP_WAIT, url):
+            return self.transport.head(url)
+
+    def retrieve(self, url, filename, progress=None):
+        """
+        Saves the body of url to filename, going through the rate limiter.
+        With a bandwidth scheduler or progress, the body is copied
+        chunk by chunk into a temporary file that replaces filename
+        once complete, otherwise the transport's retrieve() is used.
+
+        :param progress: called as progress(bytes_done, bytes_total)
+                   after each chunk, bytes_total is None if unknown.
+        """
+        from pyarxiv import profiling
+        if self.limiter is not None:
+            self.limiter.wait()
+        if self.bandwidth is None and progress is None:
+            with profiling.stage(profiling.RETRIEVE, url):
+                self.transport.retrieve(url, filename)
+            return
+        import tempfile
+        with profiling.stage(profiling.HTTP_WAIT, url):
+            response = self.transport.open(url)
+        folder = os.path.dirname(os.path.abspath(filename))
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.pyarxiv-',
+                                        suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self._copy_chunks(response, f, progress, url)
+            os.replace(tmp_path, filename)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        finally:
+            if hasattr(response, 'close'):
+                response.close()
+
+    def _copy_chunks(self, response, f, progress, url=None):
+        from pyarxiv.profiling import BODY_READ, DISK_WRITE, stage
+        reading = stage(BODY_READ, url, accumulate=True)
+        writing = stage(DISK_WRITE, url, accumulate=True)
+        bytes_total = _content_length(response)
+        bytes_done = 0
+        while True:
+            with reading:
+                chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if self.bandwidth is not None:
+                self.bandwidth.acquire(len(chunk), self.priority, self.job)
+            with writing:
+                f.write(chunk)
+            bytes_done += len(chunk)
+            if progress is not None:
+                progress(bytes_done, bytes_total)
+        reading.record()
+        writing.record()
+
+    def _locate_pdf(self, arxiv_entry_or_id_or_uri):
+        """
+        :return: (id, version) and PDF URL of an entry, id or URI
+        :raises ValueError: if no arXiv id can be found
+        """
+        arxiv_id = get_arxiv_id(arxiv_entry_or_id_or_uri)
+        if arxiv_id[0] is None:
+            raise ValueError('Illegal arxiv_id of entry %s'
+                             % str(arxiv_entry_or_id_or_uri))
+        return arxiv_id, self.pdf_url + _id_str(arxiv_id) + '.pdf'
+
+    def iter_pdf(self, arxiv_entry_or_id_or_uri,
+                 chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """
+        Yields the PDF of an arXiv entry in chunks as they arrive,
+        without writing it to disk. Goes through rate limiter and
+        bandwidth scheduler; PDFs already in the client's store
+        are read from there.
+
+        :param arxiv_entry_or_id_or_uri: Paper at hand.
+        :type arxiv_entry_or_id_or_uri: str, dict
+        :param int chunk_size: max number of bytes per chunk
+        :return: generator of chunks
+        :rtype: Iterator[bytes]
+        """
+        arxiv_id, url = self._locate_pdf(arxiv_entry_or_id_or_uri)
+        digest = None
+        if self.store is not None:
+            digest = self.store.lookup(arxiv_id[0], arxiv_id[1])
+        if digest is not None:
+            response = open(self.store.blob_path(digest), 'rb')
+        else:
+            if self.limiter is not None:
+                self.limiter.wait()
+            response = self.transport.open(url)
+        try:
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                if self.bandwidth is not None and digest is None:
+                    self.bandwidth.acquire(len(chunk), self.priority,
+                                           self.job)
+                yield chunk
+        finally:
+            if hasattr(response, 'close'):
+                response.close()
+
+    def fetch_pdf(self, arxiv_entry_or_id_or_uri):
+        """
+        Downloads the PDF of an arXiv entry into memory.
+
+        :param arxiv_entry_or_id_or_uri: Paper at hand.
+        :type arxiv_entry_or_id_or_uri: str, dict
+        :return: the PDF
+        :rtype: bytes
+        """
+        return b''.join(self.iter_pdf(arxiv_entry_or_id_or_uri))
+
+    def fetch_pdf_into(self, arxiv_entry_or_id_or_uri, sink):
+        """
+        Streams the PDF of an arXiv entry into sink as it arrives.
+
+        :param arxiv_entry_or_id_or_uri: Paper at hand.
+        :type arxiv_entry_or_id_or_uri: str, dict
+        :param sink: file-like object with write(bytes), e.g. an upload
+                   stream, or a writable buffer such as a bytearray or
+                   memoryview, which is filled from its start.
+        :return: number of bytes written
+        :rtype: int
+        :raises ValueError: if a buffer is too small for the PDF
+        """
+        if not hasattr(sink, 'write'):
+            sink = _BufferWriter(sink)
+        size = 0
+        for chunk in self.iter_pdf(arxiv_entry_or_id_or_uri):
+            sink.write(chunk)
+            size += len(chunk)
+        return size
+
+    def query(self, max_results=None, ids=[], categories=[],
+              title='', authors='', abstract='', journal_ref='',
+              querystring='', sort_by='', sort_order='',
+              submitted_after=None, submitted_before=None, fields=None):
+        """
+        Queries arXiv.org for papers, see pyarxiv.query().
+        max_results defaults to the client's max_results.
+
+        :return: List of dictionaries of arXiv entries matching query.
+        :rtype: List[dict]
+        """
+        from pyarxiv.profiling import PARSE, URL_BUILD, stage
+        if max_results is None:
+            max_results = self.max_results
+        with stage(URL_BUILD):
+            query = get_query_params(max_results, ids, categories,
+                                     title, authors, abstract, journal_ref,
+                                     querystring, sort_by=sort_by,
+                                     sort_order=sort_order,
+                                     submitted_after=submitted_after,
+                                     submitted_before=submitted_before)
+        if fields is not None:
+            from pyarxiv.feed import check_fields, parse_entries
+            fields = check_fields(fields)
+        try:
+            raw_d = self.fetch(self.api_url + query)
+            with stage(PARSE, self.api_url + query):
+                if fields is not None:
+                    return parse_entries(raw_d, fields)
+                import feedparser
+                d = feedparser.parse(raw_d)
+                return d.entries
+        except Exception as e:
+            raise ArxivQueryError(
+                'Unable to query paper with query: %s' % query, e)
+
+    def iter_query(self, max_results=None, ids=[], categories=[],
+                   title='', authors='', abstract='', journal_ref='',
+                   querystring='', page_size=None, sort_by='',
+                   sort_order='', submitted_after=None,
+                   submitted_before=None, fields=None):
+        """
+        Like query(), but yields entries one by one as soon as they
+        are parsed, while the rest of the feed is still being received.
+        Results are requested in pages of page_size entries,
+        the next page is only requested once the previous one is consumed.
+
+        :param int page_size: Entries per request, default is max_results.
+        :return: generator of arXiv entries matching query.
+        :rtype: Iterator[dict]
+        """
+        from pyarxiv.feed import check_fields
+        from pyarxiv.profiling import URL_BUILD, stage
+        fields = check_fields(fields)
+        if max_results is None:
+            max_results = self.max_results
+        if page_size is None or page_size > max_results:
+            page_size = max_results
+        start = 0
+        while start < max_results:
+            n = min(page_size, max_results - start)
+            with stage(URL_BUILD):
+                query = get_query_params(n, ids, categories, title, authors,
+                                         abstract, journal_ref, querystring,
+                                         start=start, sort_by=sort_by,
+                                         sort_order=sort_order,
+                                         submitted_after=submitted_after,
+                                         submitted_before=submitted_before)
+            received = 0
+            try:
+                for entry in self._stream_entries(self.api_url + query,
+                                                  fields):
+                    received += 1
+                    yield entry
+            except Exception as e:
+                raise ArxivQueryError(
+                    'Unable to query paper with query: %s' % query, e)
+            if received < n:
+                break
+            start += n
+
+    def lookup_ids(self, ids, chunk_size=100, max_workers=1, fields=None):
+        """
+        Resolves many ids to their entries, see pyarxiv.lookup_ids().
+        """
+        wanted = []
+        for element in ids:
+            arxiv_id = get_arxiv_id(element)
+            wanted.append(_id_str(arxiv_id) if arxiv_id[0] else None)
+        unique = []
+        seen = set()
+        for arxiv_id in wanted:
+            if arxiv_id is not None and arxiv_id not in seen:
+                seen.add(arxiv_id)
+                unique.append(arxiv_id)
+        chunks = self._id_chunks(unique, chunk_size)
+        if fields is not None:
+            # entries are matched to the ids by their id
+            fields = set(fields) | {'id'}
+
+        def fetch_chunk(chunk):
+            return self.query(max_results=len(chunk), ids=chunk,
+                              fields=fields)
+
+        if max_workers <= 1 or len(chunks) <= 1:
+            results = map(fetch_chunk, chunks)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(fetch_chunk, chunks))
+        by_id = {}
+        for entries in results:
+            for entry in entries:
+                arxiv_id = get_arxiv_id(entry)
+                if arxiv_id[0] is None:
+                    continue
+                by_id[_id_str(arxiv_id)] = entry
+                # unversioned requests get the latest version
+                by_id[arxiv_id[0]] = entry
+        found = []
+        missing = []
+        for element, arxiv_id in zip(ids, wanted):
+            if arxiv_id in by_id:
+                found.append(by_id[arxiv_id])
+            else:
+                missing.append(element)
+        return found, missing
+
+    def _id_chunks(self, ids, chunk_size):
+        # the fixed part of the URL, with the longest max_results
+        base = len(self.api_url + get_query_params(chunk_size, ids=['']))
+        chunks = []
+        chunk = []
+        length = base
+        for arxiv_id in ids:
+            if chunk and (len(chunk) >= chunk_size or
+                          length + 1 + len(arxiv_id) > MAX_URL_LENGTH):
+                chunks.append(chunk)
+                chunk = []
+                length = base
+            chunk.append(arxiv_id)
+            length += 1 + len(arxiv_id)
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _stream_entries(self, url, fields=None):
+        from pyarxiv.feed import iter_entries
+        from pyarxiv.profiling import HTTP_WAIT, stage
+        cached = None
+        if self.cache is not None:
+            cached = self.cache.get(url)
+        if cached is not None:
+            for entry in _timed_parse(
+                    iter_entries(io.BytesIO(cached), fields=fields), url):
+                yield entry
+            return
+        if self.limiter is not None:
+            self.limiter.wait()
+        with stage(HTTP_WAIT, url):
+            response = _RecordingReader(self.transport.open(url))
+        for entry in _timed_parse(iter_entries(response, fields=fields), url):
+            yield entry
+        if self.cache is not None:
+            self.cache.set(url, response.getvalue())
+
+    def download_entry(self, arxiv_entry_or_id_or_uri=None,
+                       target_folder=None,
+                       target_filename='',
+                       use_title_for_filename=False,
+                       append_id=False,
+                       byte_progress_callback=None):
+        """
+        Downloads an arXiv entry as PDF, see pyarxiv.download_entry().
+        target_folder defaults to the client's target_folder.
+
+        :param byte_progress_callback: called while downloading as
+                   byte_progress_callback(element, bytes_done, bytes_total),
+                   bytes_total is None if the size is unknown.
+        """
+        from pyarxiv.profiling import FILENAME, URL_BUILD, stage
+        if target_folder is None:
+            target_folder = self.target_folder
+        with stage(URL_BUILD):
+            arxiv_id, full_dl_url = self._locate_pdf(arxiv_entry_or_id_or_uri)
+        arxiv_id_str = _id_str(arxiv_id)
+        if target_filename != '':
+            full_filename = target_filename
+        else:
+            with stage(FILENAME, arxiv_id_str):
+                full_filename = self._filename(
+                    arxiv_entry_or_id_or_uri, arxiv_id_str,
+                    use_title_for_filename, append_id)
+        if os.path.isdir(target_folder):
+            target_path = os.path.join(target_folder, full_filename + '.pdf')
+            progress = None
+            if byte_progress_callback is not None:
+                def progress(bytes_done, bytes_total):
+                    byte_progress_callback(arxiv_entry_or_id_or_uri,
+                                           bytes_done, bytes_total)
+            if self.store is not None:
+                self.store.materialize(
+                    arxiv_id[0], arxiv_id[1], target_path,
+                    lambda filename: self.retrieve(full_dl_url, filename,
+                                                   progress))
+            else:
+                self.retrieve(full_dl_url, target_path, progress)
+        else:
+            raise ValueError(
+                'Directory %s does not exist, '
+                'cannot download paper' % target_folder)
+
+    def _filename(self, arxiv_entry_or_id_or_uri, arxiv_id_str,
+                  use_title_for_filename=False, append_id=False):
+        """
+        :return: file name of the PDF of an entry, without '.pdf'
+        :raises ValueError: if the title of the paper cannot be found
+        """
+        if not use_title_for_filename:
+            # may contain '/'
+            return make_filename_safe(arxiv_id_str)
+        if isinstance(arxiv_entry_or_id_or_uri, dict):
+            title = arxiv_entry_or_id_or_uri['title']
+        else:
+            query_result = self.query(ids=[arxiv_id_str])
+            if len(query_result) < 1:
+                raise ValueError(
+                    'Could not find title for paper id '
+                    '\"%s\"' % arxiv_id_str)
+            title = query_result[0]['title']
+        if append_id:
+            return make_filename_safe(title + arxiv_id_str)
+        return make_filename_safe(title)
+
+    def download_entries(self, entries_or_ids_or_uris=[], target_folder=None,
+                         use_title_for_filename=False, append_id=False,
+                         progress_callback=(lambda x, y: id),
+                         max_workers=1, byte_progress_callback=None,
+                         retry_policy=None, report=None):
+        """
+        Download multiple entries at once, see pyarxiv.download_entries().
+
+        :return: list of all exceptions thrown
+        :rtype: List[Exception]
+        """
+        exceptions = []
+        extra_kwargs = {}
+        if byte_progress_callback is not None:
+            extra_kwargs['byte_progress_callback'] = byte_progress_callback
+        if retry_policy is None:
+            from pyarxiv.retry import NO_RETRY
+            retry_policy = NO_RETRY
+        planner = None
+        if use_title_for_filename:
+            # titles may repeat, name files in the order of the batch,
+            # and claim them in the folder against other processes
+            from pyarxiv.filenames import FilenamePlanner
+            planner = FilenamePlanner(
+                self, target_folder or self.target_folder,
+                use_title_for_filename, append_id, reserve=True)
+            planned = planner.plan(entries_or_ids_or_uris)
+        else:
+            planned = ((e, None, None) for e in entries_or_ids_or_uris)
+
+        def download(planned_element):
+            e, filename, new_exception = planned_element
+            skipped = False
+            kwargs = dict(extra_kwargs)
+            if filename is not None:
+                kwargs['target_filename'] = filename
+            if new_exception is None:
+                skipped = self._in_store(e)
+                try:
+                    retry_policy.call(
+                        self.download_entry, e, target_folder,
+                        use_title_for_filename=use_title_for_filename,
+                        append_id=append_id, **kwargs)
+                except Exception as exc:
+                    new_exception = exc
+                    if planner is not None:
+                        planner.release(filename)
+            if report is not None:
+                report.add(e, new_exception, skipped)
+            return new_exception
+
+        if max_workers <= 1:
+            for planned_element in planned:
+                new_exception = download(planned_element)
+                if new_exception is not None:
+                    exceptions.append(new_exception)
+                progress_callback(planned_element[0], new_exception)
+            return exceptions
+
+        import threading
+        from pyarxiv._pool import run_bounded
+        callback_lock = threading.Lock()
+
+        def download_and_report(planned_element):
+            new_exception = download(planned_element)
+            with callback_lock:
+                if new_exception is not None:
+                    exceptions.append(new_exception)
+                progress_callback(planned_element[0], new_exception)
+
+        run_bounded(download_and_report, planned, max_workers)
+        return exceptions
+
+    def download_query(self, target_folder=None,
+                       use_title_for_filename=False, append_id=False,
+                       progress_callback=(lambda x, y: id),
+                       max_workers=4, buffer_size=PREFETCH_SIZE,
+                       byte_progress_callback=None, retry_policy=None,
+                       report=None, **query_kwargs):
+        """
+        Queries and downloads at once, see pyarxiv.download_query().
+
+        :return: list of all exceptions thrown by downloads
+        :rtype: List[Exception]
+        """
+        from pyarxiv._pool import prefetch
+        fields = query_kwargs.get('fields')
+        if fields is not None:
+            query_kwargs['fields'] = set(fields) | {'id', 'title'}
+        entries = prefetch(self.iter_query(**query_kwargs), buffer_size)
+        try:
+            return self.download_entries(
+                entries, target_folder,
+                use_title_for_filename=use_title_for_filename,
+                append_id=append_id, progress_callback=progress_callback,
+                max_workers=max_workers,
+                byte_progress_callback=byte_progress_callback,
+                retry_policy=retry_policy, report=report)
+        finally:
+            entries.close()
+
+    def plan_downloads(self, entries_or_ids_or_uris, max_workers=8,
+                       known=None):
+        """
+        Fetches the metadata of PDFs, see pyarxiv.plan_downloads().
+
+        :rtype: pyarxiv.planning.DownloadPlan
+        """
+        from pyarxiv.planning import plan_downloads
+        return plan_downloads(self, entries_or_ids_or_uris, max_workers,
+                              known)
+
+    def _in_store(self, arxiv_entry_or_id_or_uri):
+        if self.store is None:
+            return False
+        try:
+            arxiv_id = self._locate_pdf(arxiv_entry_or_id_or_uri)[0]
+        except ValueError:
+            return False
+        return self.store.lookup(*arxiv_id) is not None
+
+
+def _timed_parse(entries, url):
+    """
+    Yields entries, timing the parsing of all of them as one PARSE stage.
+    """
+    from pyarxiv.profiling import PARSE, stage
+    parsing = stage(PARSE, url, accumulate=True)
+    while True:
+        with parsing:
+            entry = next(entries, None)
+        if entry is None:
+            break
+        yield entry
+    parsing.record()
+
+
+def _id_str(arxiv_id):
+    """
+    :param arxiv_id: (id, version) as returned by get_arxiv_id()
+    :return: e.g. '1709.05312v1', or '1709.05312' without version
+    :rtype: str
+    """
+    if arxiv_id[1] is None:
+        return arxiv_id[0]
+    return arxiv_id[0] + 'v' + arxiv_id[1]
+
+
+class _BufferWriter(object):
+    """
+    File-like writer filling a writable buffer from its start.
+    """
+
+    def __init__(self, buffer):
+        self.view = memoryview(buffer).cast('B')
+        self.position = 0
+
+    def write(self, data):
+        end = self.position + len(data)
+        if end > len(self.view):
+            raise ValueError('Buffer of %i bytes is too small'
+                             % len(self.view))
+        self.view[self.position:end] = data
+        self.position = end
+        return len(data)
+
+
+def _content_length(response):
+    headers = getattr(response, 'headers', None)
+    try:
+        return int(headers.get('Content-Length'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class _RecordingReader(object):
+    """
+    Wraps a file-like object and remembers everything read from it.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.chunks = []
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.chunks.append(data)
+        return data
+
+    def getvalue(self):
+        return b''.join(self.chunks)
+
+
+_default_client = ArxivClient()
+
+
+def get_default_client():
+    """
+    :return: The client used by the module-level functions.
+    :rtype: ArxivClient
+    """
+    return _default_client
+
+
+def set_default_client(client):
+    """
+    Replaces the client used by the module-level functions,
+    e.g. to give all of them a cache or rate limiter.
+
+    :param ArxivClient client: new default client
+    """
+    global _default_client
+    _default_client = client
+
+
+def query(max_results=None, ids=[], categories=[],
           title='', authors='', abstract='', journal_ref='',
-          querystring=''):
+          querystring='', sort_by='', sort_order='',
+          submitted_after=None, submitted_before=None, fields=None):
     """
     Queries arXiv.org for papers.
 
-    :param max_results: Max number of results, by default 100.
+    :param max_results: Max number of results, by default the
+               default client's max_results, 100 unless configured.
     :type max_results: int
     :param ids: arXiv ids of entries to be found (OR-ed together).
     :type ids: List[str]
@@ -54,41 +826,137 @@ def query(max_results=100, ids=[], categories=[],
     :param str authors: Restrict search with this string in author name(s).
     :param str abstract: Restrict search with this string in abstract.
     :param str journal_ref: Restrict search to e.g. 'Phys Rev Lett'.
-    :param str querystring: Simply enter a query string ('manual mode').
+    :param querystring: Simply enter a query string ('manual mode').
                    This query string must be properly escaped as by the
                    arXiv API docs:
                    https://arxiv.org/help/api/user-manual#query_details
+                   Or pass a query built with pyarxiv.search,
+                   e.g. Title('neural') & ~Cat('cs.AI').
                    If this argument is present, all other values,
-                   except for max_results and ids are ignored.
+                   except for max_results, ids and sorting are ignored.
+    :type querystring: str, pyarxiv.search.Query
+    :param str sort_by: One of SORT_BY_OPTIONS: 'relevance',
+                   'lastUpdatedDate' or 'submittedDate'.
+                   Default is the API's default, relevance.
+    :param str sort_order: 'ascending' or 'descending'.
+    :param submitted_after: Restrict search to papers submitted
+                   at or after this time (GMT).
+    :type submitted_after: datetime.datetime, datetime.date, str
+    :param submitted_before: Restrict search to papers submitted
+                   at or before this time (GMT).
+    :type submitted_before: datetime.datetime, datetime.date, str
+    :param fields: Only parse these keys of each entry, e.g.
+                   ['id', 'title', 'tags'], see pyarxiv.feed.FIELDS.
+                   Entries are then parsed by pyarxiv.feed,
+                   not by feedparser. Default is all keys.
+    :type fields: List[str]
     :return: List of dictionaries of arXiv entries matching query.
     :rtype: List[dict]
+    :raises ValueError: for unknown fields
+    """
+    return _default_client.query(max_results, ids, categories,
+                                 title, authors, abstract, journal_ref,
+                                 querystring, sort_by, sort_order,
+                                 submitted_after, submitted_before, fields)
+
+
+def iter_query(max_results=None, ids=[], categories=[],
+               title='', authors='', abstract='', journal_ref='',
+               querystring='', page_size=None, sort_by='', sort_order='',
+               submitted_after=None, submitted_before=None, fields=None):
+    """
+    Queries arXiv.org for papers, yielding each entry as soon as it is
+    parsed. Takes the same arguments as query().
+
+    :param int page_size: Entries per request, default is max_results.
+               Smaller pages deliver the first entries sooner.
+    :return: generator of arXiv entries matching query.
+    :rtype: Iterator[dict]
     """
-    if len(querystring) > 0:
+    return _default_client.iter_query(max_results, ids, categories,
+                                      title, authors, abstract, journal_ref,
+                                      querystring, page_size,
+                                      sort_by, sort_order,
+                                      submitted_after, submitted_before,
+                                      fields)
+
+
+def lookup_ids(ids, chunk_size=100, max_workers=1, fields=None):
+    """
+    Resolves many ids, e.g. from citations, to their arXiv entries.
+    Ids are requested in chunks of at most chunk_size ids whose URL
+    stays below MAX_URL_LENGTH, on up to max_workers threads.
+    The client's cache keeps the response of each chunk, so it only
+    saves requests when the same ids are looked up again in the same
+    order; ids resolved by an earlier, different lookup are requested
+    again.
+
+    :param ids: ids, URLs or entries, as taken by get_arxiv_id().
+               Ids without version resolve to the latest version.
+    :type ids: List[str], List[dict]
+    :param int chunk_size: Max number of ids per request.
+    :param int max_workers: Number of concurrent requests.
+    :param fields: Only parse these keys of each entry, see query();
+                   'id' is always parsed.
+    :type fields: List[str]
+    :return: the entries in the order of ids, one per id found,
+             and the elements of ids that were not found
+    :rtype: (List[dict], List)
+    :raises ArxivQueryError: if a request fails
+    """
+    return _default_client.lookup_ids(ids, chunk_size, max_workers, fields)
+
+
+def get_query_params(max_results=100, ids=[], categories=[],
+                     title='', authors='', abstract='', journal_ref='',
+                     querystring='', start=0, sort_by='', sort_order='',
+                     submitted_after=None, submitted_before=None):
+    """
+    Helper function for query() builds up the parameters of an API request.
+    Takes the same arguments as query().
+
+    :param int start: Index of the first result, used for paging.
+    :return: Parameters to be appended to the API base URI.
+    :rtype: str
+    :raises ValueError: for unknown sort options
+    """
+    if len(sort_by) > 0 and sort_by not in SORT_BY_OPTIONS:
+        raise ValueError('sort_by must be one of %s, not %r'
+                         % (', '.join(SORT_BY_OPTIONS), sort_by))
+    if len(sort_order) > 0 and sort_order not in SORT_ORDER_OPTIONS:
+        raise ValueError('sort_order must be one of %s, not %r'
+                         % (', '.join(SORT_ORDER_OPTIONS), sort_order))
+    if hasattr(querystring, 'encode') and hasattr(querystring, 'compile'):
+        # a pyarxiv.search.Query, encoded once and cached
+        real_querystring = querystring.encode()
+    elif len(querystring) > 0:
         real_querystring = querystring
     else:
         real_querystring = get_querystring(categories,
                                            title,
                                            authors,
                                            abstract,
-                                           journal_ref)
+                                           journal_ref,
+                                           submitted_after,
+                                           submitted_before)
     search_query = "&search_query=" + real_querystring
     query = 'max_results=%i' % max_results
+    if start > 0:
+        query += '&start=%i' % start
     if len(real_querystring) > 0:
         query += search_query
     if len(ids) > 0:
         query += "&id_list=" + ",".join(ids)
-    try:
-        raw_d = urlopen(
-            ARXIV_API_BASE_URI + query).read()
-        d = feedparser.parse(raw_d)
-        return d.entries
-    except Exception as e:
-        raise ArxivQueryError(
-            'Unable to query paper with query: %s' % query, e)
+    if len(sort_by) > 0:
+        query += '&sortBy=' + sort_by
+    if len(sort_order) > 0:
+        query += '&sortOrder=' + sort_order
+    return query
 
 
 def get_querystring(categories=[], title='', authors='',
-                    abstract='', journal_ref=''):
+                    abstract='', journal_ref='',
+                    submitted_after=None, submitted_before=None):
     """
     Helper function for query() builds up a custom search query.
 
@@ -98,15 +966,15 @@ def get_querystring(categories=[], title='', authors='',
     :param str authors: authors.
     :param str abstract: abstract.
     :param str journal_ref: journal ref.
+    :param submitted_after: start of the submission date range.
+    :param submitted_before: end of the submission date range.
     :return: Properly escaped search query.
     :rtype: str
     """
     query_elements = []
     if len(categories) > 0 and isinstance(categories, list):
-        str_categories = list(map(lambda x:
-                                  arxiv_category_map[x]
-                                  if isinstance(x, ArxivCategory)
-                                  else x, categories))
+        from pyarxiv.categories import expand_categories
+        str_categories = expand_categories(categories)
         used_categories = " OR ".join(
             list(map(lambda x: 'cat:' + x, str_categories)))
         query_elements.append("(" + used_categories + ")")
@@ -118,11 +986,71 @@ def get_querystring(categories=[], title='', authors='',
         query_elements.append("abs:\"" + abstract + "\"")
     if len(journal_ref) > 0:
         query_elements.append("jr:\"" + journal_ref + "\"")
+    if submitted_after is not None or submitted_before is not None:
+        query_elements.append('submittedDate:[%s TO %s]' % (
+            format_submitted_date(submitted_after, EARLIEST_SUBMISSION),
+            format_submitted_date(submitted_before, LATEST_SUBMISSION,
+                                  end_of_day=True)))
     built_query = " AND ".join(query_elements)
     return quote_plus(built_query, safe=':+')
 
 
-def convert_to_native_types(arxiv_entry):
+def format_submitted_date(value, default=EARLIEST_SUBMISSION,
+                          end_of_day=False):
+    """
+    Formats a bound of a submittedDate range as used by the arXiv API.
+
+    format_submitted_date(datetime.date(2017, 9, 1)) -> '201709010000'
+
+    format_submitted_date('2017-09-01 12:30') -> '201709011230'
+
+    format_submitted_date('2017-09-30', end_of_day=True) -> '201709302359'
+
+    :param value: date, datetime (converted to GMT if it has a timezone),
+                   or string with the digits of year, month, day
+                   and optionally hours and minutes, in this order
+    :type value: datetime.datetime, datetime.date, str, None
+    :param str default: returned if value is None
+    :param bool end_of_day: complete missing hours and minutes with
+                   23:59 instead of 00:00, for inclusive upper bounds
+    :return: YYYYMMDDHHMM
+    :rtype: str
+    :raises ValueError: if value has less than 8 digits
+    """
+    if value is None:
+        return default
+    time = '2359' if end_of_day else '0000'
+    if hasattr(value, 'strftime'):
+        if getattr(value, 'tzinfo', None) is not None:
+            import datetime
+            value = value.astimezone(datetime.timezone.utc)
+        return value.strftime('%Y%m%d') + (
+            value.strftime('%H%M') if hasattr(value, 'hour') else time)
+    digits = re.sub(r'\D', '', str(value))
+    if len(digits) < 8:
+        raise ValueError('Cannot read a date from %r' % value)
+    return (digits + time[len(digits) - 8:])[:12]
+
+
+def category_to_str(category):
+    """
+    Converts an ArxivCategory to the string used by the arXiv API,
+    e.g. ArxivCategory.cs_AI -> 'cs.AI'. Strings are returned unchanged.
+    Members are looked up by name in pyarxiv.category_table,
+    so the ArxivCategory enum is never imported here.
+
+    :param category: category to be converted
+    :type category: str, ArxivCategory
+    :return: category string
+    :rtype: str
+    """
+    if isinstance(category, str):
+        return category
+    from pyarxiv.category_table import arxiv_category_names
+    return arxiv_category_names.get(getattr(category, 'name', None), category)
+
+
+def convert_to_native_types(arxiv_entry, fields=None):
     """
     Replaces all JSON constructs to native Python types.
     Concretely, we
@@ -132,11 +1060,33 @@ def convert_to_native_types(arxiv_entry):
     3. Parse dates in 'published', 'updated' to datetime.datetime objects
 
     :param dict arxiv_entry: dict of arXiv entry
+    :param fields: only convert these fields, e.g. the fields
+                   passed to query(). Default is all of them.
+    :type fields: List[str]
     """
-    fix_entry_whitespace(arxiv_entry)
-    arxiv_entry['tags'] = list(map(lambda x: x['term'], arxiv_entry['tags']))
-    arxiv_entry['published'] = dateutil.parser.parse(arxiv_entry['published'])
-    arxiv_entry['updated'] = dateutil.parser.parse(arxiv_entry['updated'])
+    from pyarxiv.profiling import CONVERT, stage
+    with stage(CONVERT, arxiv_entry.get('id')):
+        _convert(arxiv_entry, fields)
+
+
+def _convert(arxiv_entry, fields):
+    if fields is None:
+        fix_entry_whitespace(arxiv_entry)
+        fields = ('tags', 'published', 'updated')
+    else:
+        for name in ('title', 'summary'):
+            if name in fields:
+                arxiv_entry[name] = fix_str_whitespace(arxiv_entry[name])
+                detail = arxiv_entry.get(name + '_detail')
+                if detail is not None and 'value' in detail:
+                    detail['value'] = arxiv_entry[name]
+    if 'tags' in fields:
+        arxiv_entry['tags'] = list(map(lambda x: x['term'],
+                                       arxiv_entry['tags']))
+    for name in ('published', 'updated'):
+        if name in fields:
+            import dateutil.parser
+            arxiv_entry[name] = dateutil.parser.parse(arxiv_entry[name])
 
 
 def fix_entry_whitespace(arxiv_entry):
@@ -220,20 +1170,28 @@ def uses_new_id(url_or_id):
 
 
 def make_filename_safe(filename):
-    return "".join([c if c.isalnum() or c in '.' else '_' for c in filename])
+    """
+    :return: filename with all characters but letters, digits
+             and '.' replaced by '_'
+    :rtype: str
+    """
+    return UNSAFE_FILENAME_CHARACTERS.sub('_', filename)
 
 
 def download_entry(arxiv_entry_or_id_or_uri=None,
-                   target_folder='.',
+                   target_folder=None,
                    target_filename='',
                    use_title_for_filename=False,
-                   append_id=False):
+                   append_id=False,
+                   store=None):
     """
     Downloads an arXiv entry as PDF.
 
     :param arxiv_entry_or_id_or_uri: Paper at hand.
     :type arxiv_entry_or_id_or_uri: str, dict
-    :param str target_folder: Default is '.'; Can be absolute or relative
+    :param str target_folder: Default is the default client's
+                   target_folder, '.' unless configured;
+                   Can be absolute or relative
     :param str target_filename: Pick file name manually,
                    .pdf is appended automatically.
     :param bool use_title_for_filename: Use title as file name
@@ -242,75 +1200,185 @@ def download_entry(arxiv_entry_or_id_or_uri=None,
     :param bool append_id: if use_title_for_filename is True,
                     and append_id is True, the paper's arXiv id will be
                     appended to the filename.
+    :param store: Download into this pyarxiv.store.PdfStore
+                    and link the PDF into target_folder.
+                    Papers already in the store are not downloaded again.
+    :type store: PdfStore
     """
-    arxiv_id = get_arxiv_id(arxiv_entry_or_id_or_uri)
-    if arxiv_id[0] is None:
-        raise ValueError('Illegal arxiv_id of entry %s'
-                         % str(arxiv_entry_or_id_or_uri))
-    arxiv_id_str = arxiv_id[0]
-    if not arxiv_id[1] is None:
-        arxiv_id_str += 'v' + arxiv_id[1]
-    if target_filename != '':
-        full_filename = target_filename
-    else:
-        if use_title_for_filename:
-            if isinstance(arxiv_entry_or_id_or_uri, dict):
-                title = arxiv_entry_or_id_or_uri['title']
-            else:
-                query_result = query(ids=[arxiv_id_str])
-                if len(query_result) < 1:
-                    raise ValueError(
-                        'Could not find title for paper id '
-                        '\"%s\"' % arxiv_id_str)
-                else:
-                    title = query_result[0]['title']
-            if append_id:
-                full_filename = make_filename_safe(title + arxiv_id_str)
-            else:
-                full_filename = make_filename_safe(title)
-        else:
-            full_filename = make_filename_safe(arxiv_id_str)  # may contain '/'
-    full_dl_url = ARXIV_DL_BASE_URL + arxiv_id_str + ".pdf"
-    if os.path.isdir(target_folder):
-        retrieve(full_dl_url, os.path.join(
-            target_folder, full_filename + '.pdf'))
-    else:
-        raise ValueError(
-            'Directory %s does not exist, '
-            'cannot download paper' % target_folder)
+    client = _default_client
+    if store is not None:
+        client = client.copy(store=store)
+    client.download_entry(arxiv_entry_or_id_or_uri,
+                          target_folder,
+                          target_filename,
+                          use_title_for_filename,
+                          append_id)
 
 
-def download_entries(entries_or_ids_or_uris=[], target_folder='.',
+def download_entries(entries_or_ids_or_uris=[], target_folder=None,
                      use_title_for_filename=False, append_id=False,
-                     progress_callback=(lambda x, y: id)):
+                     progress_callback=(lambda x, y: id),
+                     max_workers=1, store=None,
+                     byte_progress_callback=None,
+                     retry_policy=None, report=None):
     """
-    Download multiple entries at once. Will catch ValueErrors silently.
+    Download multiple entries at once. Failures of single entries
+    are caught, so they do not abort the batch.
 
     :param entries_or_ids_or_uris: ids to download
     :type entries_or_ids_or_uris: List[str], List[dict]
-    :param str target_folder: default is '.'.
-    :param bool use_title_for_filename: If True, will query for each paper.
+    :param str target_folder: default is the default client's
+                   target_folder, '.' unless configured.
+    :param bool use_title_for_filename: If True, will query the titles
+                    of papers given by id, in batches. Papers whose title
+                    an earlier paper, or a file in target_folder, has
+                    already taken get their id appended,
+                    see pyarxiv.filenames.FilenamePlanner.
     :param bool append_id: If use_title_for_filename,
                     will append each paper's id to its filename
     :param progress_callback: called when each paper is done downloading.
                Signature of progress_callback is
                progress_callback(element, maybe_exception)
                element is the id/entry/uri that was just downloaded,
-               maybe_exception is either None or a caught ValueError,
+               maybe_exception is either None or the caught exception,
                depending on whether the method error'd or not
-    :return: list of all exceptions thrown
-    :rtype: List[ValueError]
+    :param int max_workers: Number of concurrent downloads, default is 1.
+               If larger than 1, progress_callback is called in
+               completion order, but never concurrently.
+               entries_or_ids_or_uris may then be any iterable;
+               it is consumed while earlier papers are downloading.
+    :param store: Download into this pyarxiv.store.PdfStore
+               and link each PDF into target_folder.
+               Papers already in the store are not downloaded again.
+    :type store: PdfStore
+    :param byte_progress_callback: called while each paper is downloading.
+               Signature is
+               byte_progress_callback(element, bytes_done, bytes_total),
+               bytes_total is None if the size is unknown.
+    :param retry_policy: pyarxiv.retry.RetryPolicy deciding whether and
+               when failed downloads are tried again.
+               Default is a single attempt.
+    :param report: pyarxiv.retry.DownloadReport, filled with the elements
+               that succeeded, were skipped or failed; its resume_list()
+               can be passed to download_entries() again.
+    :return: list of all exceptions thrown, those of the last attempts
+    :rtype: List[Exception]
     """
-    exceptions = []
-    for e in entries_or_ids_or_uris:
-        new_exception = None
-        try:
-            download_entry(e, target_folder,
-                           use_title_for_filename=use_title_for_filename,
-                           append_id=append_id)
-        except ValueError as exc:  # Maybe catch more types of exception?
-            exceptions.append(exc)
-            new_exception = exc
-        finally:
-            progress_callback(e, new_exception)
-    return exceptions
+    client = _default_client
+    if store is not None:
+        client = client.copy(store=store)
+    return client.download_entries(
+        entries_or_ids_or_uris, target_folder,
+        use_title_for_filename=use_title_for_filename,
+        append_id=append_id,
+        progress_callback=progress_callback,
+        max_workers=max_workers,
+        byte_progress_callback=byte_progress_callback,
+        retry_policy=retry_policy, report=report)
+
+
+def download_query(target_folder=None, use_title_for_filename=False,
+                   append_id=False, progress_callback=(lambda x, y: id),
+                   max_workers=4, buffer_size=PREFETCH_SIZE, store=None,
+                   byte_progress_callback=None, retry_policy=None,
+                   report=None, **query_kwargs):
+    """
+    Queries arXiv.org and downloads the results while the query is
+    still running. A background thread parses entries, page by page,
+    up to buffer_size entries ahead of the downloads, which start with
+    the first entry parsed. Titles come from the parsed entries,
+    so use_title_for_filename sends no further queries.
+
+        download_query('papers', categories=['cs.CL'], title='parsing',
+                       max_results=500, page_size=100, max_workers=4)
+
+    :param str target_folder: default is the default client's
+                   target_folder, '.' unless configured.
+    :param int max_workers: Number of concurrent downloads, default is 4.
+    :param int buffer_size: Max number of entries parsed ahead of the
+               downloads; the query pauses once they are all waiting.
+    :param query_kwargs: arguments of iter_query(), e.g. categories,
+               max_results and page_size
+    :return: list of all exceptions thrown by downloads
+    :rtype: List[Exception]
+    :raises ArxivQueryError: if the query fails, once the entries
+               parsed before the failure are downloaded
+
+    For the other arguments see download_entries().
+    """
+    client = _default_client
+    if store is not None:
+        client = client.copy(store=store)
+    return client.download_query(
+        target_folder, use_title_for_filename=use_title_for_filename,
+        append_id=append_id, progress_callback=progress_callback,
+        max_workers=max_workers, buffer_size=buffer_size,
+        byte_progress_callback=byte_progress_callback,
+        retry_policy=retry_policy, report=report, **query_kwargs)
+
+
+def plan_downloads(entries_or_ids_or_uris, max_workers=8, known=None):
+    """
+    Sends concurrent HEAD requests for the PDFs of entries, to learn
+    their size, Last-Modified and ETag without downloading them.
+
+        plan = plan_downloads(ids, known=previous_state)
+        report = DownloadReport()
+        download_entries(plan.to_download(), max_workers=4, report=report)
+        previous_state = plan.state(report)
+
+    :param entries_or_ids_or_uris: ids to plan
+    :type entries_or_ids_or_uris: List[str], List[dict]
+    :param int max_workers: Number of concurrent HEAD requests.
+    :param dict known: DownloadPlan.state(report) of an earlier plan;
+               PDFs whose ETag, or Last-Modified and size, match are
+               marked unchanged. PDFs in the client's store are always
+               unchanged, and are not requested.
+    :return: the PDFs, largest first, with the ones to download,
+             their total size and the estimated transfer time
+    :rtype: pyarxiv.planning.DownloadPlan
+    :raises ValueError: if the transport cannot send HEAD requests
+    """
+    return _default_client.plan_downloads(entries_or_ids_or_uris,
+                                          max_workers, known)
+
+
+def fetch_pdf(arxiv_entry_or_id_or_uri):
+    """
+    Downloads the PDF of an arXiv entry into memory,
+    without writing it to disk.
+
+    :param arxiv_entry_or_id_or_uri: Paper at hand, resolved
+                   like by download_entry().
+    :type arxiv_entry_or_id_or_uri: str, dict
+    :return: the PDF
+    :rtype: bytes
+    """
+    return _default_client.fetch_pdf(arxiv_entry_or_id_or_uri)
+
+
+def iter_pdf(arxiv_entry_or_id_or_uri, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """
+    Yields the PDF of an arXiv entry in chunks as they arrive.
+
+    :param arxiv_entry_or_id_or_uri: Paper at hand.
+    :type arxiv_entry_or_id_or_uri: str, dict
+    :param int chunk_size: max number of bytes per chunk
+    :return: generator of chunks
+    :rtype: Iterator[bytes]
+    """
+    return _default_client.iter_pdf(arxiv_entry_or_id_or_uri, chunk_size)
+
+
+def fetch_pdf_into(arxiv_entry_or_id_or_uri, sink):
+    """
+    Streams the PDF of an arXiv entry into sink as it arrives.
+
+    :param arxiv_entry_or_id_or_uri: Paper at hand.
+    :type arxiv_entry_or_id_or_uri: str, dict
+    :param sink: file-like object with write(bytes),
+                   or a writable buffer such as a memoryview.
+    :return: number of bytes written
+    :rtype: int
+    """
+    return _default_client.fetch_pdf_into(arxiv_entry_or_id_or_uri, sink)
@@ -0,0 +1,80 @@
+"""
+Locks that can be shared between threads and survive os.fork() and pickling,
+and a hook for resetting other per-process state, such as open
+connections, in forked children.
+"""
+import os
+import threading
+import weakref
+
+_live_locks = weakref.WeakSet()
+_fork_handlers = weakref.WeakSet()
+# handles inherited from the parent, which a child must neither use
+# nor close, e.g. SQLite connections, see reset_after_fork()
+_inherited_handles = []
+
+
+class ForkSafeLock(object):
+    """
+    Thin wrapper around threading.Lock.
+
+    A plain lock that happens to be held while the process forks stays held
+    forever in the child. This lock is replaced by a fresh one in every child
+    process, and pickles to a fresh lock too, so objects owning one can be
+    handed to multiprocessing workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        _live_locks.add(self)
+
+    def acquire(self, blocking=True):
+        return self._lock.acquire(blocking)
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._lock.release()
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+
+
+def reset_after_fork(obj):
+    """
+    Calls obj._after_fork() in every child process forked while obj
+    is alive, before the child runs anything else.
+    """
+    _fork_handlers.add(obj)
+
+
+def abandon_inherited(handle):
+    """
+    Keeps a handle inherited from the parent alive, so that it is
+    never closed by the child. Closing a SQLite connection, for one,
+    may release or remove files the parent is still using.
+    """
+    if handle is not None:
+        _inherited_handles.append(handle)
+
+
+def _reset_locks_in_child():
+    for lock in list(_live_locks):
+        lock._reset()
+    for obj in list(_fork_handlers):
+        obj._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_locks_in_child)
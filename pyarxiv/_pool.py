@@ -0,0 +1,100 @@
+"""
+Bounded thread pool helpers.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def run_bounded(fn, iterable, max_workers, max_pending=None):
+    """
+    Calls fn(item) for every item of iterable on max_workers threads.
+
+    The iterable is consumed lazily: at most max_pending items are
+    in flight at once, so a slow consumer applies backpressure to
+    a producer such as a generator reading from stdin or the network.
+    Exceptions raised by fn are re-raised once all pending calls finished.
+
+    :param fn: called with each item
+    :param iterable: items, may be infinite or slow to produce
+    :param int max_workers: number of threads
+    :param int max_pending: default is 2 * max_workers
+    """
+    if max_pending is None:
+        max_pending = 2 * max_workers
+    error = None
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for item in iterable:
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                error = error or _first_error(done)
+                if error is not None:
+                    break
+            pending.add(executor.submit(fn, item))
+        done, _ = wait(pending)
+        error = error or _first_error(done)
+    if error is not None:
+        raise error
+
+
+def _first_error(futures):
+    for future in futures:
+        if future.exception() is not None:
+            return future.exception()
+    return None
+
+
+_DONE = object()
+
+
+def prefetch(iterable, buffer_size):
+    """
+    Consumes iterable on a background thread, ahead of the caller.
+
+    At most buffer_size items wait to be taken, so the producer blocks
+    once the caller falls behind. An exception raised by the iterable
+    is re-raised by the generator after the items produced before it.
+    Closing the generator early stops the producer.
+
+    :param iterable: items, e.g. entries parsed from a network stream
+    :param int buffer_size: maximum number of items produced ahead
+    :return: generator of the items of iterable, in order
+    :rtype: Iterator
+    """
+    import queue
+    import threading
+    items = queue.Queue(maxsize=max(1, buffer_size))
+    stop = threading.Event()
+    failure = []
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except Exception as e:
+            failure.append(e)
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, name='pyarxiv-prefetch')
+    producer.daemon = True
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+    if failure:
+        raise failure[0]
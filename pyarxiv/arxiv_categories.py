@@ -1,8 +1,6 @@
 """
 THIS FILE IS AUTOGENERATED.
-
 DO NOT MODIFY.
-
 INSTEAD, RUN scripts/scrape_categories.py
 """
 
@@ -269,4 +267,9 @@ arxiv_category_map = {
     ArxivCategory.quant_ph: 'quant-ph'
 }
 
+# category -> ArxivCategory, e.g. 'cs.AI' -> ArxivCategory.cs_AI
+arxiv_category_from_str = dict(
+    (category, member)
+    for member, category in arxiv_category_map.items())
+
 # print(arxiv_category_map[ArxivCategory.cs_AI])
@@ -0,0 +1,213 @@
+"""
+Normalised author names and a local author -> paper index.
+
+Names are compared by key: the last name and first initial,
+lower case and without diacritics, so that 'Hinton, Geoffrey E.',
+'G. E. Hinton' and 'Geoffrey Hinton' all have the key 'hinton g'.
+
+    index = AuthorIndex(query(categories=['cs.LG'], max_results=1000))
+    index.lookup('G. Hinton')      # entries by Geoffrey Hinton
+    index.prefix('hint')           # entries by Hinton, Hintze, ...
+    index.fuzzy('Geoffry Hintn')   # tolerates typos
+"""
+import bisect
+import difflib
+import re
+import unicodedata
+
+# lower-case words that belong to the last name, e.g. 'van den Oord'
+NAME_PARTICLES = frozenset((
+    'da', 'de', 'del', 'della', 'den', 'der', 'des', 'di', 'dos', 'du',
+    'la', 'le', 'st', 'ten', 'ter', 'van', 'von', 'zu'))
+NAME_SUFFIXES = frozenset(('jr', 'sr', 'ii', 'iii', 'iv'))
+# words of names, keeping hyphens and apostrophes: "o'neil", 'smith-jones'
+WORD = re.compile(r"\w[\w'-]*", re.UNICODE)
+# letters without a decomposition into base letter and diacritic
+TRANSLITERATIONS = {u'ø': u'o', u'ł': u'l', u'đ': u'd', u'ð': u'd',
+                    u'ß': u'ss', u'æ': u'ae', u'œ': u'oe', u'ı': u'i',
+                    u'þ': u'th'}
+
+
+def _fold(text):
+    """
+    Lower-cases text and removes diacritics, e.g. 'Erdős' -> 'erdos'.
+    """
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return u''.join(TRANSLITERATIONS.get(c, c) for c in decomposed
+                    if not unicodedata.combining(c))
+
+
+def parse_author(name):
+    """
+    Splits an author name into last name and given names,
+    accepting 'First Middle Last' and 'Last, First Middle'.
+
+    :param str name: e.g. 'Aäron van den Oord' or 'Hinton, G. E.'
+    :return: folded last name and given names,
+             e.g. ('van den oord', ['aaron'])
+    :rtype: (str, List[str])
+    """
+    folded = _fold(name)
+    if ',' in folded:
+        last, given = folded.split(',', 1)
+        if re.sub(r'[\s.]', '', given) in NAME_SUFFIXES:
+            # 'John Smith, Jr.'
+            return parse_author(last)
+        last_words = WORD.findall(last)
+        given_words = [w for w in WORD.findall(given)
+                       if w not in NAME_SUFFIXES]
+        return ' '.join(last_words), given_words
+    words = [w for w in WORD.findall(folded)
+             if w not in NAME_SUFFIXES]
+    if len(words) == 0:
+        return '', []
+    i = len(words) - 1
+    while i > 1 and words[i - 1] in NAME_PARTICLES:
+        i -= 1
+    if i == 1 and words[0] in NAME_PARTICLES and len(words) > 2:
+        i = 0
+    return ' '.join(words[i:]), words[:i]
+
+
+def normalize_author(name):
+    """
+    :param str name: e.g. 'Hinton, Geoffrey E.'
+    :return: last name and all initials, e.g. 'hinton g e'
+    :rtype: str
+    """
+    last, given = parse_author(name)
+    initials = [part[0] for g in given for part in g.split('-') if part]
+    return ' '.join([last] + initials)
+
+
+def author_key(name):
+    """
+    :param str name: e.g. 'G. E. Hinton'
+    :return: last name and first initial, e.g. 'hinton g',
+             or the last name alone if there are no given names
+    :rtype: str
+    """
+    last, given = parse_author(name)
+    if len(given) == 0:
+        return last
+    return last + ' ' + given[0][0]
+
+
+def entry_authors(entry):
+    """
+    :param dict entry: arXiv entry, as returned by query()
+    :return: the author names of entry
+    :rtype: List[str]
+    """
+    authors = entry.get('authors')
+    if not authors:
+        return [entry['author']] if entry.get('author') else []
+    return [a['name'] if isinstance(a, dict) else a for a in authors]
+
+
+class AuthorIndex(object):
+    """
+    Maps authors to the entries they wrote. Lookups return the entries
+    themselves, in the order they were added. An entry added again
+    under the same id replaces the earlier one.
+
+    :param entries: arXiv entries to add, as returned by query()
+    :type entries: Iterable[dict]
+    """
+
+    def __init__(self, entries=()):
+        self._entries = []
+        self._positions = {}
+        self._by_key = {}
+        self._names = {}
+        self._sorted_keys = None
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def add(self, entry):
+        """
+        :param dict entry: arXiv entry with 'id' and 'authors'
+        """
+        position = self._positions.get(entry['id'])
+        if position is None:
+            position = len(self._entries)
+            self._positions[entry['id']] = position
+            self._entries.append(entry)
+        else:
+            old = self._entries[position]
+            for name in entry_authors(old):
+                self._by_key[author_key(name)].discard(position)
+            self._entries[position] = entry
+            self._sorted_keys = None
+        for name in entry_authors(entry):
+            key = author_key(name)
+            if key not in self._by_key:
+                self._by_key[key] = set()
+                self._sorted_keys = None
+            self._by_key[key].add(position)
+            self._names.setdefault(key, set()).add(name)
+
+    def keys(self):
+        """
+        :return: all author keys, sorted
+        :rtype: List[str]
+        """
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(
+                key for key, positions in self._by_key.items() if positions)
+        return self._sorted_keys
+
+    def names(self, name):
+        """
+        :param str name: author name
+        :return: the spellings of name seen in entries
+        :rtype: Set[str]
+        """
+        return set(self._names.get(author_key(name), ()))
+
+    def _collect(self, keys):
+        positions = set()
+        for key in keys:
+            positions.update(self._by_key.get(key, ()))
+        return [self._entries[p] for p in sorted(positions)]
+
+    def _prefixed(self, prefix):
+        keys = self.keys()
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + u'\uffff')
+        return keys[start:end]
+
+    def lookup(self, name):
+        """
+        :param str name: e.g. 'Geoffrey Hinton', 'Hinton, G.',
+                   or only a last name like 'Hinton' for every Hinton
+        :return: entries by the author
+        :rtype: List[dict]
+        """
+        last, given = parse_author(name)
+        if len(given) == 0:
+            return self._collect([last] + self._prefixed(last + ' '))
+        return self._collect([last + ' ' + given[0][0]])
+
+    def prefix(self, text):
+        """
+        :param str text: beginning of a last name, e.g. 'hint'
+        :return: entries by authors whose last name starts with text
+        :rtype: List[dict]
+        """
+        return self._collect(self._prefixed(_fold(text).strip()))
+
+    def fuzzy(self, name, cutoff=0.85, n=10):
+        """
+        :param str name: author name, possibly misspelled
+        :param float cutoff: minimum similarity of keys, 0 to 1
+        :param int n: maximum number of matching authors
+        :return: entries by the most similar authors
+        :rtype: List[dict]
+        """
+        matches = difflib.get_close_matches(author_key(name), self.keys(),
+                                            n, cutoff)
+        return self._collect(matches)
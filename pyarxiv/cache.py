@@ -0,0 +1,311 @@
+"""
+Response caches for ArxivClient.
+
+A cache maps request keys (usually the full request URL) to the raw
+response bytes. Every cache implements get(key) and set(key, value).
+Caches may also implement get_or_set(key, load), which ArxivClient
+prefers, to let a single caller refresh an expired key.
+Results of the same query change as papers are submitted, so caches
+shared by long-lived processes should be given a ttl.
+"""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+from collections import OrderedDict
+
+from pyarxiv._locks import ForkSafeLock, abandon_inherited, \
+    reset_after_fork
+
+
+class MemoryCache(object):
+    """
+    Thread-safe in-memory LRU cache.
+
+    :param int max_entries: Maximum number of responses kept,
+                   least recently used ones are evicted first.
+    :param float ttl: Seconds a response is kept, None for no expiry.
+    """
+
+    def __init__(self, max_entries=256, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = ForkSafeLock()
+
+    def get(self, key):
+        """
+        :param str key: cache key
+        :return: cached value or None
+        """
+        with self._lock:
+            if key not in self._data:
+                return None
+            expires, value = self._data.pop(key)
+            if expires is not None and expires <= time.monotonic():
+                return None
+            self._data[key] = (expires, value)
+            return value
+
+    def set(self, key, value):
+        """
+        :param str key: cache key
+        :param bytes value: value to be stored
+        """
+        expires = None
+        if self.ttl is not None:
+            expires = time.monotonic() + self.ttl
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (expires, value)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DirectoryCache(object):
+    """
+    Cache storing each response in its own file below directory.
+    Writes are atomic, so several threads and processes
+    (e.g. consecutive pyarxiv-cli invocations) can share a directory.
+
+    :param str directory: created if it does not exist
+    :param float ttl: Seconds a response is kept, None for no expiry.
+                   Expired files are ignored, and replaced on the next set.
+    """
+
+    def __init__(self, directory, ttl=None):
+        self.directory = directory
+        self.ttl = ttl
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def get(self, key):
+        """
+        :param str key: cache key
+        :return: cached value or None
+        """
+        path = self._path(key)
+        try:
+            if self.ttl is not None and \
+                    os.path.getmtime(path) + self.ttl <= time.time():
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+        except (IOError, OSError):
+            return None
+
+    def set(self, key, value):
+        """
+        :param str key: cache key
+        :param bytes value: value to be stored
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+class SQLiteCache(object):
+    """
+    LRU cache in an SQLite database in WAL mode, shared by all threads
+    and processes on a host, e.g. the workers of a gunicorn or celery
+    deployment, which then hold no copies of the responses in memory.
+
+    get_or_set() protects against stampedes: when a key expired, one
+    caller, in whichever process, loads it again while the others
+    keep getting the expired response, or wait if there is none.
+
+    :param str path: database file, created if it does not exist
+    :param int max_entries: Maximum number of responses kept,
+                   least recently used ones are evicted first.
+    :param float ttl: Seconds a response is fresh, None for no expiry.
+    :param float lock_timeout: Seconds a refresh may take before other
+                   callers stop waiting for it and load the key themselves.
+    :param float touch_interval: Seconds the access time of an entry may
+                   lag behind. Reads only take the database's write lock
+                   to update it when it is older than that, so readers
+                   in different processes do not wait for each other.
+    """
+
+    def __init__(self, path, max_entries=10000, ttl=None, lock_timeout=60.0,
+                 touch_interval=60.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.touch_interval = touch_interval
+        self.poll_interval = 0.05
+        self._lock = ForkSafeLock()
+        self._db = None
+        reset_after_fork(self)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_db'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        reset_after_fork(self)
+
+    def _after_fork(self):
+        abandon_inherited(self._db)
+        self._db = None
+
+    def _connection(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=60,
+                                       check_same_thread=False,
+                                       isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, '
+                'value BLOB NOT NULL, '
+                'expires REAL, '
+                'accessed REAL NOT NULL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_accessed '
+                             'ON entries (accessed)')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS refreshes ('
+                'key TEXT PRIMARY KEY, '
+                'expires REAL NOT NULL)')
+        return self._db
+
+    def _transaction(self, statements):
+        with self._lock:
+            db = self._connection()
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                result = statements(db)
+                db.execute('COMMIT')
+                return result
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+
+    def _lookup(self, key):
+        """
+        :return: value and whether it is still fresh, (None, False)
+                 if key is not cached
+        """
+        now = time.time()
+        with self._lock:
+            # a read-only statement, WAL readers do not block each other
+            row = self._connection().execute(
+                'SELECT value, expires, accessed FROM entries '
+                'WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None, False
+        value, expires, accessed = row
+        if now - accessed >= self.touch_interval:
+            self._transaction(lambda db: db.execute(
+                'UPDATE entries SET accessed = ? '
+                'WHERE key = ? AND accessed < ?', (now, key, now)))
+        return bytes(value), expires is None or expires > now
+
+    def get(self, key):
+        """
+        :param str key: cache key
+        :return: cached value or None
+        """
+        value, fresh = self._lookup(key)
+        return value if fresh else None
+
+    def set(self, key, value):
+        """
+        :param str key: cache key
+        :param bytes value: value to be stored
+        """
+        now = time.time()
+        expires = None if self.ttl is None else now + self.ttl
+
+        def store(db):
+            db.execute('INSERT OR REPLACE INTO entries '
+                       '(key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+                       (key, sqlite3.Binary(value), expires, now))
+            excess = db.execute('SELECT COUNT(*) FROM entries'
+                                ).fetchone()[0] - self.max_entries
+            if excess > 0:
+                db.execute('DELETE FROM entries WHERE key IN ('
+                           'SELECT key FROM entries '
+                           'ORDER BY accessed LIMIT ?)', (excess,))
+        self._transaction(store)
+
+    def _start_refresh(self, key):
+        """
+        :return: True if this caller is to load key, False if another
+                 caller started loading it less than lock_timeout ago
+        """
+        now = time.time()
+
+        def claim(db):
+            db.execute('DELETE FROM refreshes WHERE key = ? AND expires <= ?',
+                       (key, now))
+            before = db.total_changes
+            db.execute('INSERT OR IGNORE INTO refreshes (key, expires) '
+                       'VALUES (?, ?)', (key, now + self.lock_timeout))
+            return db.total_changes > before
+        return self._transaction(claim)
+
+    def _end_refresh(self, key):
+        self._transaction(lambda db: db.execute(
+            'DELETE FROM refreshes WHERE key = ?', (key,)))
+
+    def get_or_set(self, key, load):
+        """
+        :param str key: cache key
+        :param load: called without arguments to get the value of key
+                   if it is missing or expired
+        :return: the cached value if it is fresh, the value returned by
+                 load(), or the expired value while another caller
+                 loads key
+        :rtype: bytes
+        """
+        deadline = time.time() + self.lock_timeout
+        while True:
+            value, fresh = self._lookup(key)
+            if fresh:
+                return value
+            if self._start_refresh(key):
+                try:
+                    value = load()
+                    self.set(key, value)
+                    return value
+                finally:
+                    self._end_refresh(key)
+            if value is not None:
+                return value
+            if time.time() >= deadline:
+                value = load()
+                self.set(key, value)
+                return value
+            time.sleep(self.poll_interval)
+
+    def clear(self):
+        def delete(db):
+            db.execute('DELETE FROM entries')
+            db.execute('DELETE FROM refreshes')
+        self._transaction(delete)
+
+    def __len__(self):
+        with self._lock:
+            return self._connection().execute(
+                'SELECT COUNT(*) FROM entries').fetchone()[0]
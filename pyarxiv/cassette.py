@@ -0,0 +1,193 @@
+"""
+Transport recording responses to a cassette file and replaying them,
+for reproducible runs without network access.
+
+A cassette is a zip file with one deflated member per URL, named by the
+SHA-1 of the URL. The member comment holds the URL and the headers
+needed for replay, e.g. Content-Length.
+
+    client = ArxivClient(transport=CassetteTransport('run.zip', 'record'))
+    client.download_entries(client.query(title='WaveNet'))
+    # later, anywhere, without network
+    client = ArxivClient(transport=CassetteTransport('run.zip'))
+"""
+import hashlib
+import io
+import json
+import os
+import time
+import zipfile
+
+from pyarxiv._locks import ForkSafeLock, reset_after_fork
+
+MODES = ('replay', 'record', 'auto')
+RECORDED_HEADERS = ('Content-Type', 'Last-Modified', 'ETag')
+
+
+class CassetteMiss(IOError):
+    """
+    Raised when replaying a URL that is not on the cassette.
+    """
+
+
+def cassette_key(url):
+    """
+    :param str url: request URL
+    :return: member name of url's response on a cassette
+    :rtype: str
+    """
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+class CassetteTransport(object):
+    """
+    Thread-safe transport serving responses from a cassette.
+    Can be passed as transport to ArxivClient.
+
+    Only successful responses are recorded, errors are raised as usual.
+    Responses already on the cassette are not recorded again;
+    delete the cassette to record afresh. Only one process at a time
+    may record to a cassette.
+
+    :param str path: cassette file, created when recording
+    :param str mode: 'replay' only serves recorded responses,
+                   'record' fetches every URL with transport and records
+                   the response, 'auto' replays recorded responses and
+                   records the others.
+    :param transport: used for recording, default is UrllibTransport()
+    :param float latency: seconds to wait before each replayed response,
+                   default is to replay at full speed
+    """
+
+    def __init__(self, path, mode='replay', transport=None, latency=None):
+        if mode not in MODES:
+            raise ValueError('mode must be one of %s, not %r'
+                             % (', '.join(MODES), mode))
+        if transport is None and mode != 'replay':
+            from pyarxiv import UrllibTransport
+            transport = UrllibTransport()
+        self.path = path
+        self.mode = mode
+        self.transport = transport
+        self.latency = latency
+        self._lock = ForkSafeLock()
+        self._reader = None
+        reset_after_fork(self)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_reader'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        reset_after_fork(self)
+
+    def _after_fork(self):
+        # the file position of the inherited reader is shared with the parent
+        self._reader = None
+
+    def _zip(self):
+        # called with the lock held
+        if self._reader is None and os.path.exists(self.path):
+            self._reader = zipfile.ZipFile(self.path)
+        return self._reader
+
+    def urls(self):
+        """
+        :return: the URLs on the cassette
+        :rtype: List[str]
+        """
+        with self._lock:
+            reader = self._zip()
+            if reader is None:
+                return []
+            return [json.loads(info.comment.decode('utf-8'))['url']
+                    for info in reader.infolist()]
+
+    def __contains__(self, url):
+        return self._load(url) is not None
+
+    def _load(self, url):
+        with self._lock:
+            reader = self._zip()
+            if reader is None:
+                return None
+            try:
+                info = reader.getinfo(cassette_key(url))
+            except KeyError:
+                return None
+            headers = json.loads(info.comment.decode('utf-8'))['headers']
+            return headers, reader.read(info)
+
+    def _record(self, url):
+        response = self.transport.open(url)
+        try:
+            body = response.read()
+            response_headers = getattr(response, 'headers', None) or {}
+            headers = {}
+            for name in RECORDED_HEADERS:
+                if response_headers.get(name) is not None:
+                    headers[name] = response_headers.get(name)
+        finally:
+            close = getattr(response, 'close', None)
+            if close is not None:
+                close()
+        headers['Content-Length'] = str(len(body))
+        info = zipfile.ZipInfo(cassette_key(url),
+                               date_time=time.gmtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.comment = json.dumps({'url': url, 'headers': headers},
+                                  sort_keys=True).encode('utf-8')
+        with self._lock:
+            if self._reader is not None:
+                if cassette_key(url) in self._reader.NameToInfo:
+                    return headers, body
+                self._reader.close()
+                self._reader = None
+            with zipfile.ZipFile(self.path, 'a') as writer:
+                if cassette_key(url) not in writer.NameToInfo:
+                    writer.writestr(info, body)
+        return headers, body
+
+    def open(self, url):
+        """
+        :param str url: URL to GET
+        :return: file-like response with headers
+        :raises CassetteMiss: if url is not on the cassette in replay mode
+        """
+        recorded = None
+        if self.mode != 'record':
+            recorded = self._load(url)
+        if recorded is None:
+            if self.mode == 'replay':
+                raise CassetteMiss('%s is not on cassette %s'
+                                   % (url, self.path))
+            recorded = self._record(url)
+        elif self.latency:
+            time.sleep(self.latency)
+        headers, body = recorded
+        return CassetteResponse(body, headers)
+
+    def retrieve(self, url, filename):
+        """
+        Saves the body of url to filename.
+        """
+        body = self.open(url).read()
+        with open(filename, 'wb') as f:
+            f.write(body)
+
+
+class CassetteResponse(io.BytesIO):
+    """
+    Replayed response, a BytesIO with the recorded headers.
+    """
+
+    status = 200
+
+    def __init__(self, body, headers):
+        super(CassetteResponse, self).__init__(body)
+        self.headers = headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
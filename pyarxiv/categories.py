@@ -0,0 +1,90 @@
+"""
+Lookups of arXiv categories and archives,
+backed by the tables generated into pyarxiv.category_table.
+
+    >>> expand_categories(['stat.*', 'cs.AI'])
+    ['stat.AP', 'stat.CO', 'stat.ML', 'stat.ME', 'stat.TH', 'cs.AI']
+"""
+from pyarxiv.category_table import (arxiv_archives, arxiv_category_members,
+                                    arxiv_category_names)
+
+
+def is_category(category):
+    """
+    :param category: e.g. 'cs.AI' or ArxivCategory.cs_AI
+    :type category: str, ArxivCategory
+    :return: whether category is a known arXiv category
+    :rtype: bool
+    """
+    if isinstance(category, str):
+        return category in arxiv_category_members
+    return getattr(category, 'name', None) in arxiv_category_names
+
+
+def validate_category(category):
+    """
+    :param category: e.g. 'cs.AI', 'cs_AI' or ArxivCategory.cs_AI
+    :type category: str, ArxivCategory
+    :return: the category string, e.g. 'cs.AI'
+    :rtype: str
+    :raises ValueError: if category is unknown
+    """
+    if isinstance(category, str):
+        if category in arxiv_category_members:
+            return category
+        if category in arxiv_category_names:
+            return arxiv_category_names[category]
+    elif getattr(category, 'name', None) in arxiv_category_names:
+        return arxiv_category_names[category.name]
+    raise ValueError('Unknown arXiv category %r' % (category,))
+
+
+def category_from_str(category):
+    """
+    :param str category: e.g. 'cs.AI'
+    :return: the enum member, e.g. ArxivCategory.cs_AI
+    :rtype: ArxivCategory
+    :raises ValueError: if category is unknown
+    """
+    from pyarxiv.arxiv_categories import ArxivCategory
+    return ArxivCategory[arxiv_category_members[validate_category(category)]]
+
+
+def archive_of(category):
+    """
+    :param str category: e.g. 'cs.AI' or 'hep-th'
+    :return: its archive, e.g. 'cs' or 'hep-th'
+    :rtype: str
+    """
+    return category.split('.', 1)[0]
+
+
+def expand_categories(categories):
+    """
+    Replaces archive wildcards like 'cs.*' by all categories of the archive.
+    Other categories are converted to strings and passed through unchecked,
+    as the API may know categories newer than pyarxiv.category_table.
+
+    :param categories: e.g. ['cs.*', ArxivCategory.math_AG]
+    :type categories: List[str], List[ArxivCategory]
+    :return: category strings without duplicates, in the given order
+    :rtype: List[str]
+    :raises ValueError: for a wildcard of an unknown archive
+    """
+    from pyarxiv import category_to_str
+    expanded = []
+    seen = set()
+    for category in categories:
+        category = category_to_str(category)
+        if category.endswith('.*'):
+            archive = category[:-2]
+            if archive not in arxiv_archives:
+                raise ValueError('Unknown arXiv archive %r' % archive)
+            members = arxiv_archives[archive]
+        else:
+            members = (category,)
+        for member in members:
+            if member not in seen:
+                seen.add(member)
+                expanded.append(member)
+    return expanded
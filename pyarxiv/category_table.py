@@ -0,0 +1,165 @@
+"""
+THIS FILE IS AUTOGENERATED.
+DO NOT MODIFY.
+INSTEAD, RUN scripts/scrape_categories.py
+"""
+
+# (ArxivCategory member name, category, description)
+arxiv_categories = (
+    ('stat_AP', 'stat.AP', 'Statistics - Applications'),
+    ('stat_CO', 'stat.CO', 'Statistics - Computation'),
+    ('stat_ML', 'stat.ML', 'Statistics - Machine Learning'),
+    ('stat_ME', 'stat.ME', 'Statistics - Methodology'),
+    ('stat_TH', 'stat.TH', 'Statistics - Theory'),
+    ('q_bio_BM', 'q-bio.BM', 'Quantitative Biology - Biomolecules'),
+    ('q_bio_CB', 'q-bio.CB', 'Quantitative Biology - Cell Behavior'),
+    ('q_bio_GN', 'q-bio.GN', 'Quantitative Biology - Genomics'),
+    ('q_bio_MN', 'q-bio.MN', 'Quantitative Biology - Molecular Networks'),
+    ('q_bio_NC', 'q-bio.NC', 'Quantitative Biology - Neurons and Cognition'),
+    ('q_bio_OT', 'q-bio.OT', 'Quantitative Biology - Other'),
+    ('q_bio_PE', 'q-bio.PE', 'Quantitative Biology - Populations and Evolution'),
+    ('q_bio_QM', 'q-bio.QM', 'Quantitative Biology - Quantitative Methods'),
+    ('q_bio_SC', 'q-bio.SC', 'Quantitative Biology - Subcellular Processes'),
+    ('q_bio_TO', 'q-bio.TO', 'Quantitative Biology - Tissues and Organs'),
+    ('cs_AR', 'cs.AR', 'Computer Science - Architecture'),
+    ('cs_AI', 'cs.AI', 'Computer Science - Artificial Intelligence'),
+    ('cs_CL', 'cs.CL', 'Computer Science - Computation and Language'),
+    ('cs_CC', 'cs.CC', 'Computer Science - Computational Complexity'),
+    ('cs_CE', 'cs.CE', 'Computer Science - Computational Engineering; Finance; and Science'),
+    ('cs_CG', 'cs.CG', 'Computer Science - Computational Geometry'),
+    ('cs_GT', 'cs.GT', 'Computer Science - Computer Science and Game Theory'),
+    ('cs_CV', 'cs.CV', 'Computer Science - Computer Vision and Pattern Recognition'),
+    ('cs_CY', 'cs.CY', 'Computer Science - Computers and Society'),
+    ('cs_CR', 'cs.CR', 'Computer Science - Cryptography and Security'),
+    ('cs_DS', 'cs.DS', 'Computer Science - Data Structures and Algorithms'),
+    ('cs_DB', 'cs.DB', 'Computer Science - Databases'),
+    ('cs_DL', 'cs.DL', 'Computer Science - Digital Libraries'),
+    ('cs_DM', 'cs.DM', 'Computer Science - Discrete Mathematics'),
+    ('cs_DC', 'cs.DC', 'Computer Science - Distributed; Parallel; and Cluster Computing'),
+    ('cs_GL', 'cs.GL', 'Computer Science - General Literature'),
+    ('cs_GR', 'cs.GR', 'Computer Science - Graphics'),
+    ('cs_HC', 'cs.HC', 'Computer Science - Human-Computer Interaction'),
+    ('cs_IR', 'cs.IR', 'Computer Science - Information Retrieval'),
+    ('cs_IT', 'cs.IT', 'Computer Science - Information Theory'),
+    ('cs_LG', 'cs.LG', 'Computer Science - Learning'),
+    ('cs_LO', 'cs.LO', 'Computer Science - Logic in Computer Science'),
+    ('cs_MS', 'cs.MS', 'Computer Science - Mathematical Software'),
+    ('cs_MA', 'cs.MA', 'Computer Science - Multiagent Systems'),
+    ('cs_MM', 'cs.MM', 'Computer Science - Multimedia'),
+    ('cs_NI', 'cs.NI', 'Computer Science - Networking and Internet Architecture'),
+    ('cs_NE', 'cs.NE', 'Computer Science - Neural and Evolutionary Computing'),
+    ('cs_NA', 'cs.NA', 'Computer Science - Numerical Analysis'),
+    ('cs_OS', 'cs.OS', 'Computer Science - Operating Systems'),
+    ('cs_OH', 'cs.OH', 'Computer Science - Other'),
+    ('cs_PF', 'cs.PF', 'Computer Science - Performance'),
+    ('cs_PL', 'cs.PL', 'Computer Science - Programming Languages'),
+    ('cs_RO', 'cs.RO', 'Computer Science - Robotics'),
+    ('cs_SE', 'cs.SE', 'Computer Science - Software Engineering'),
+    ('cs_SD', 'cs.SD', 'Computer Science - Sound'),
+    ('cs_SC', 'cs.SC', 'Computer Science - Symbolic Computation'),
+    ('nlin_AO', 'nlin.AO', 'Nonlinear Sciences - Adaptation and Self-Organizing Systems'),
+    ('nlin_CG', 'nlin.CG', 'Nonlinear Sciences - Cellular Automata and Lattice Gases'),
+    ('nlin_CD', 'nlin.CD', 'Nonlinear Sciences - Chaotic Dynamics'),
+    ('nlin_SI', 'nlin.SI', 'Nonlinear Sciences - Exactly Solvable and Integrable Systems'),
+    ('nlin_PS', 'nlin.PS', 'Nonlinear Sciences - Pattern Formation and Solitons'),
+    ('math_AG', 'math.AG', 'Mathematics - Algebraic Geometry'),
+    ('math_AT', 'math.AT', 'Mathematics - Algebraic Topology'),
+    ('math_AP', 'math.AP', 'Mathematics - Analysis of PDEs'),
+    ('math_CT', 'math.CT', 'Mathematics - Category Theory'),
+    ('math_CA', 'math.CA', 'Mathematics - Classical Analysis and ODEs'),
+    ('math_CO', 'math.CO', 'Mathematics - Combinatorics'),
+    ('math_AC', 'math.AC', 'Mathematics - Commutative Algebra'),
+    ('math_CV', 'math.CV', 'Mathematics - Complex Variables'),
+    ('math_DG', 'math.DG', 'Mathematics - Differential Geometry'),
+    ('math_DS', 'math.DS', 'Mathematics - Dynamical Systems'),
+    ('math_FA', 'math.FA', 'Mathematics - Functional Analysis'),
+    ('math_GM', 'math.GM', 'Mathematics - General Mathematics'),
+    ('math_GN', 'math.GN', 'Mathematics - General Topology'),
+    ('math_GT', 'math.GT', 'Mathematics - Geometric Topology'),
+    ('math_GR', 'math.GR', 'Mathematics - Group Theory'),
+    ('math_HO', 'math.HO', 'Mathematics - History and Overview'),
+    ('math_IT', 'math.IT', 'Mathematics - Information Theory'),
+    ('math_KT', 'math.KT', 'Mathematics - K-Theory and Homology'),
+    ('math_LO', 'math.LO', 'Mathematics - Logic'),
+    ('math_MP', 'math.MP', 'Mathematics - Mathematical Physics'),
+    ('math_MG', 'math.MG', 'Mathematics - Metric Geometry'),
+    ('math_NT', 'math.NT', 'Mathematics - Number Theory'),
+    ('math_NA', 'math.NA', 'Mathematics - Numerical Analysis'),
+    ('math_OA', 'math.OA', 'Mathematics - Operator Algebras'),
+    ('math_OC', 'math.OC', 'Mathematics - Optimization and Control'),
+    ('math_PR', 'math.PR', 'Mathematics - Probability'),
+    ('math_QA', 'math.QA', 'Mathematics - Quantum Algebra'),
+    ('math_RT', 'math.RT', 'Mathematics - Representation Theory'),
+    ('math_RA', 'math.RA', 'Mathematics - Rings and Algebras'),
+    ('math_SP', 'math.SP', 'Mathematics - Spectral Theory'),
+    ('math_ST', 'math.ST', 'Mathematics - Statistics'),
+    ('math_SG', 'math.SG', 'Mathematics - Symplectic Geometry'),
+    ('astro_ph', 'astro-ph', 'Astrophysics'),
+    ('cond_mat_dis_nn', 'cond-mat.dis-nn', 'Physics - Disordered Systems and Neural Networks'),
+    ('cond_mat_mes_hall', 'cond-mat.mes-hall', 'Physics - Mesoscopic Systems and Quantum Hall Effect'),
+    ('cond_mat_mtrl_sci', 'cond-mat.mtrl-sci', 'Physics - Materials Science'),
+    ('cond_mat_other', 'cond-mat.other', 'Physics - Other'),
+    ('cond_mat_soft', 'cond-mat.soft', 'Physics - Soft Condensed Matter'),
+    ('cond_mat_stat_mech', 'cond-mat.stat-mech', 'Physics - Statistical Mechanics'),
+    ('cond_mat_str_el', 'cond-mat.str-el', 'Physics - Strongly Correlated Electrons'),
+    ('cond_mat_supr_con', 'cond-mat.supr-con', 'Physics - Superconductivity'),
+    ('gr_qc', 'gr-qc', 'General Relativity and Quantum Cosmology'),
+    ('hep_ex', 'hep-ex', 'High Energy Physics - Experiment'),
+    ('hep_lat', 'hep-lat', 'High Energy Physics - Lattice'),
+    ('hep_ph', 'hep-ph', 'High Energy Physics - Phenomenology'),
+    ('hep_th', 'hep-th', 'High Energy Physics - Theory'),
+    ('math_ph', 'math-ph', 'Mathematical Physics'),
+    ('nucl_ex', 'nucl-ex', 'Nuclear Experiment'),
+    ('nucl_th', 'nucl-th', 'Nuclear Theory'),
+    ('physics_acc_ph', 'physics.acc-ph', 'Physics - Accelerator Physics'),
+    ('physics_ao_ph', 'physics.ao-ph', 'Physics - Atmospheric and Oceanic Physics'),
+    ('physics_atom_ph', 'physics.atom-ph', 'Physics - Atomic Physics'),
+    ('physics_atm_clus', 'physics.atm-clus', 'Physics - Atomic and Molecular Clusters'),
+    ('physics_bio_ph', 'physics.bio-ph', 'Physics - Biological Physics'),
+    ('physics_chem_ph', 'physics.chem-ph', 'Physics - Chemical Physics'),
+    ('physics_class_ph', 'physics.class-ph', 'Physics - Classical Physics'),
+    ('physics_comp_ph', 'physics.comp-ph', 'Physics - Computational Physics'),
+    ('physics_data_an', 'physics.data-an', 'Physics - Data Analysis; Statistics and Probability'),
+    ('physics_flu_dyn', 'physics.flu-dyn', 'Physics - Fluid Dynamics'),
+    ('physics_gen_ph', 'physics.gen-ph', 'Physics - General Physics'),
+    ('physics_geo_ph', 'physics.geo-ph', 'Physics - Geophysics'),
+    ('physics_hist_ph', 'physics.hist-ph', 'Physics - History of Physics'),
+    ('physics_ins_det', 'physics.ins-det', 'Physics - Instrumentation and Detectors'),
+    ('physics_med_ph', 'physics.med-ph', 'Physics - Medical Physics'),
+    ('physics_optics', 'physics.optics', 'Physics - Optics'),
+    ('physics_ed_ph', 'physics.ed-ph', 'Physics - Physics Education'),
+    ('physics_soc_ph', 'physics.soc-ph', 'Physics - Physics and Society'),
+    ('physics_plasm_ph', 'physics.plasm-ph', 'Physics - Plasma Physics'),
+    ('physics_pop_ph', 'physics.pop-ph', 'Physics - Popular Physics'),
+    ('physics_space_ph', 'physics.space-ph', 'Physics - Space Physics'),
+    ('quant_ph', 'quant-ph', 'Quantum Physics')
+)
+
+# ArxivCategory member name -> category, e.g. 'cs_AI' -> 'cs.AI'
+arxiv_category_names = dict(
+    (name, category) for name, category, _ in arxiv_categories)
+
+# category -> ArxivCategory member name, e.g. 'cs.AI' -> 'cs_AI'
+arxiv_category_members = dict(
+    (category, name) for name, category, _ in arxiv_categories)
+
+# archive -> its categories, e.g. 'cs' -> ('cs.AR', 'cs.AI', ...)
+arxiv_archives = {
+    'astro-ph': ('astro-ph',),
+    'cond-mat': ('cond-mat.dis-nn', 'cond-mat.mes-hall', 'cond-mat.mtrl-sci', 'cond-mat.other', 'cond-mat.soft', 'cond-mat.stat-mech', 'cond-mat.str-el', 'cond-mat.supr-con'),
+    'cs': ('cs.AR', 'cs.AI', 'cs.CL', 'cs.CC', 'cs.CE', 'cs.CG', 'cs.GT', 'cs.CV', 'cs.CY', 'cs.CR', 'cs.DS', 'cs.DB', 'cs.DL', 'cs.DM', 'cs.DC', 'cs.GL', 'cs.GR', 'cs.HC', 'cs.IR', 'cs.IT', 'cs.LG', 'cs.LO', 'cs.MS', 'cs.MA', 'cs.MM', 'cs.NI', 'cs.NE', 'cs.NA', 'cs.OS', 'cs.OH', 'cs.PF', 'cs.PL', 'cs.RO', 'cs.SE', 'cs.SD', 'cs.SC'),
+    'gr-qc': ('gr-qc',),
+    'hep-ex': ('hep-ex',),
+    'hep-lat': ('hep-lat',),
+    'hep-ph': ('hep-ph',),
+    'hep-th': ('hep-th',),
+    'math': ('math.AG', 'math.AT', 'math.AP', 'math.CT', 'math.CA', 'math.CO', 'math.AC', 'math.CV', 'math.DG', 'math.DS', 'math.FA', 'math.GM', 'math.GN', 'math.GT', 'math.GR', 'math.HO', 'math.IT', 'math.KT', 'math.LO', 'math.MP', 'math.MG', 'math.NT', 'math.NA', 'math.OA', 'math.OC', 'math.PR', 'math.QA', 'math.RT', 'math.RA', 'math.SP', 'math.ST', 'math.SG'),
+    'math-ph': ('math-ph',),
+    'nlin': ('nlin.AO', 'nlin.CG', 'nlin.CD', 'nlin.SI', 'nlin.PS'),
+    'nucl-ex': ('nucl-ex',),
+    'nucl-th': ('nucl-th',),
+    'physics': ('physics.acc-ph', 'physics.ao-ph', 'physics.atom-ph', 'physics.atm-clus', 'physics.bio-ph', 'physics.chem-ph', 'physics.class-ph', 'physics.comp-ph', 'physics.data-an', 'physics.flu-dyn', 'physics.gen-ph', 'physics.geo-ph', 'physics.hist-ph', 'physics.ins-det', 'physics.med-ph', 'physics.optics', 'physics.ed-ph', 'physics.soc-ph', 'physics.plasm-ph', 'physics.pop-ph', 'physics.space-ph'),
+    'q-bio': ('q-bio.BM', 'q-bio.CB', 'q-bio.GN', 'q-bio.MN', 'q-bio.NC', 'q-bio.OT', 'q-bio.PE', 'q-bio.QM', 'q-bio.SC', 'q-bio.TO'),
+    'quant-ph': ('quant-ph',),
+    'stat': ('stat.AP', 'stat.CO', 'stat.ML', 'stat.ME', 'stat.TH')
+}
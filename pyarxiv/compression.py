@@ -0,0 +1,162 @@
+"""
+Compressed transfer of API responses.
+
+Transports send ACCEPT_ENCODING and wrap gzip or deflate encoded
+responses in a DecompressingReader, which decompresses while the body
+is read, so incremental parsing still starts with the first chunk.
+"""
+import zlib
+
+from pyarxiv._locks import ForkSafeLock
+
+ACCEPT_ENCODING = 'gzip, deflate'
+CHUNK_SIZE = 16 * 1024
+# headers describing the encoded body, not the decompressed one
+ENCODING_HEADERS = ('content-encoding', 'content-length')
+
+
+class TransferStats(object):
+    """
+    Thread-safe totals of compressed responses:
+    bytes received and bytes after decompression.
+    """
+
+    def __init__(self):
+        self.compressed_bytes = 0
+        self.uncompressed_bytes = 0
+        self.responses = 0
+        self._lock = ForkSafeLock()
+
+    def add(self, compressed_bytes, uncompressed_bytes):
+        with self._lock:
+            self.compressed_bytes += compressed_bytes
+            self.uncompressed_bytes += uncompressed_bytes
+            self.responses += 1
+
+    def ratio(self):
+        """
+        :return: uncompressed / compressed bytes, or None before any response
+        :rtype: float
+        """
+        with self._lock:
+            if self.compressed_bytes == 0:
+                return None
+            return float(self.uncompressed_bytes) / self.compressed_bytes
+
+
+def content_encoding(response):
+    """
+    :return: the lower-case Content-Encoding of response, or None
+    :rtype: str
+    """
+    headers = getattr(response, 'headers', None)
+    try:
+        encoding = headers.get('Content-Encoding')
+    except AttributeError:
+        return None
+    if not isinstance(encoding, str):
+        return None
+    return encoding.strip().lower()
+
+
+def decode_response(response, stats=None):
+    """
+    :param response: file-like response
+    :param TransferStats stats: counts the bytes of compressed responses
+    :return: response itself, or a DecompressingReader
+             if it is gzip or deflate encoded
+    :raises ValueError: for other content encodings
+    """
+    encoding = content_encoding(response)
+    if encoding in (None, '', 'identity'):
+        return response
+    return DecompressingReader(response, encoding, stats)
+
+
+class DecompressingReader(object):
+    """
+    File-like object decompressing a gzip or deflate encoded response
+    while it is read.
+
+    :param raw: file-like encoded response
+    :param str encoding: 'gzip', 'x-gzip' or 'deflate'
+    :param TransferStats stats: gets the byte counts once raw is exhausted
+                   or the reader is closed
+    """
+
+    def __init__(self, raw, encoding, stats=None):
+        if encoding in ('gzip', 'x-gzip'):
+            wbits = 16 + zlib.MAX_WBITS
+        elif encoding == 'deflate':
+            wbits = zlib.MAX_WBITS
+        else:
+            raise ValueError('Unsupported Content-Encoding %r' % encoding)
+        self.raw = raw
+        self.encoding = encoding
+        self.compressed_bytes = 0
+        self.uncompressed_bytes = 0
+        self.status = getattr(raw, 'status', None)
+        self.headers = dict(
+            (name, value) for name, value in raw.headers.items()
+            if name.lower() not in ENCODING_HEADERS)
+        self._stats = stats
+        self._decompressor = zlib.decompressobj(wbits)
+        self._buffer = b''
+        self._eof = False
+
+    def getheader(self, name, default=None):
+        for key, value in self.headers.items():
+            if key.lower() == name.lower():
+                return value
+        return default
+
+    def _decompress(self, data):
+        try:
+            return self._decompressor.decompress(data)
+        except zlib.error:
+            if self.encoding != 'deflate' or self.uncompressed_bytes \
+                    or self._buffer:
+                raise
+            # some servers send raw deflate data without the zlib header
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._decompressor.decompress(data)
+
+    def _fill(self):
+        chunk = self.raw.read(CHUNK_SIZE)
+        if not chunk:
+            self._buffer += self._decompressor.flush()
+            self._finish()
+            return
+        self.compressed_bytes += len(chunk)
+        self._buffer += self._decompress(chunk)
+
+    def _finish(self):
+        if not self._eof:
+            self._eof = True
+            if self._stats is not None:
+                self._stats.add(self.compressed_bytes,
+                                self.uncompressed_bytes + len(self._buffer))
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            while not self._eof:
+                self._fill()
+            data, self._buffer = self._buffer, b''
+        else:
+            while len(self._buffer) < size and not self._eof:
+                self._fill()
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self.uncompressed_bytes += len(data)
+        return data
+
+    def close(self):
+        self._finish()
+        close = getattr(self.raw, 'close', None)
+        if close is not None:
+            close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
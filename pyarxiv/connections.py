@@ -0,0 +1,215 @@
+"""
+Transport keeping HTTP connections alive between requests.
+"""
+import http.client as http_client
+import io
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+
+from pyarxiv._locks import ForkSafeLock, reset_after_fork
+from pyarxiv.compression import ACCEPT_ENCODING, TransferStats, \
+    decode_response
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+CHUNK_SIZE = 64 * 1024
+
+
+class PooledTransport(object):
+    """
+    Thread-safe transport reusing connections to each host.
+    Can be passed as transport to ArxivClient.
+
+    :param int max_per_host: Max number of idle connections kept per host.
+    :param float timeout: Socket timeout in seconds.
+    :param int max_redirects: Redirects followed before giving up.
+    :param bool compress: Ask for gzip or deflate encoded responses,
+                   which open() decompresses while they are read.
+                   Their byte counts add up in self.stats,
+                   a pyarxiv.compression.TransferStats.
+    """
+
+    def __init__(self, max_per_host=4, timeout=60, max_redirects=5,
+                 compress=True):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.compress = compress
+        self.stats = TransferStats() if compress else None
+        self._idle = {}
+        self._lock = ForkSafeLock()
+        reset_after_fork(self)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_idle'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        reset_after_fork(self)
+
+    def _after_fork(self):
+        # the parent keeps using these sockets
+        self._idle = {}
+
+    def _new_connection(self, key):
+        scheme, netloc = key
+        if scheme == 'https':
+            return http_client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http_client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._new_connection(key), False
+
+    def _release(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        """
+        Closes all idle connections.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _request(self, key, path, headers, method='GET'):
+        connection, reused = self._acquire(key)
+        try:
+            connection.request(method, path, headers=headers)
+            return connection, connection.getresponse()
+        except (http_client.HTTPException, IOError, OSError):
+            connection.close()
+            if not reused:
+                raise
+        # the server closed the idle connection, try once more
+        connection = self._new_connection(key)
+        connection.request(method, path, headers=headers)
+        return connection, connection.getresponse()
+
+    @staticmethod
+    def _split(url):
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        return (parts.scheme, parts.netloc), path
+
+    def open(self, url, headers=None):
+        """
+        :param str url: URL to GET
+        :param dict headers: additional request headers
+        :return: file-like response, its connection is reused
+                 once the body has been read completely.
+                 Encoded responses are decompressed.
+        :raises HTTPError: for status codes >= 400
+        """
+        headers = dict(headers or {})
+        if self.compress:
+            headers.setdefault('Accept-Encoding', ACCEPT_ENCODING)
+        for _ in range(self.max_redirects + 1):
+            key, path = self._split(url)
+            connection, response = self._request(key, path, headers)
+            if response.status in REDIRECT_CODES \
+                    or response.status >= 400:
+                body = response.read()
+                self._release(key, connection)
+                if response.status >= 400:
+                    raise HTTPError(url, response.status, response.reason,
+                                    response.msg, io.BytesIO(body))
+                url = urljoin(url, response.getheader('Location'))
+                continue
+            pooled = PooledResponse(
+                response, lambda: self._release(key, connection),
+                connection.close)
+            if self.compress:
+                return decode_response(pooled, self.stats)
+            return pooled
+        raise HTTPError(url, 310, 'Too many redirects', None, None)
+
+    def head(self, url, headers=None):
+        """
+        :param str url: URL to send a HEAD request to
+        :param dict headers: additional request headers
+        :return: response headers, of the last response if redirected
+        :rtype: http.client.HTTPMessage
+        :raises HTTPError: for status codes >= 400
+        """
+        for _ in range(self.max_redirects + 1):
+            key, path = self._split(url)
+            connection, response = self._request(key, path, headers or {},
+                                                 'HEAD')
+            response.read()
+            self._release(key, connection)
+            if response.status >= 400:
+                raise HTTPError(url, response.status, response.reason,
+                                response.msg, io.BytesIO())
+            if response.status not in REDIRECT_CODES:
+                return response.msg
+            url = urljoin(url, response.getheader('Location'))
+        raise HTTPError(url, 310, 'Too many redirects', None, None)
+
+    def retrieve(self, url, filename):
+        """
+        Saves the body of url to filename.
+        """
+        response = self.open(url)
+        with open(filename, 'wb') as f:
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+
+
+class PooledResponse(object):
+    """
+    File-like response handing its connection back to the pool
+    once the body is read completely.
+    Closing it early discards the connection instead.
+    """
+
+    def __init__(self, response, release, discard):
+        self.response = response
+        self.status = response.status
+        self.headers = response.msg
+        self._release = release
+        self._discard = discard
+        self._done = False
+
+    def getheader(self, name, default=None):
+        return self.response.getheader(name, default)
+
+    def read(self, size=-1):
+        if self._done:
+            return b''
+        if size is None or size < 0:
+            data = self.response.read()
+        else:
+            data = self.response.read(size)
+        if self.response.isclosed():
+            self._done = True
+            self._release()
+        return data
+
+    def close(self):
+        if not self._done:
+            self._done = True
+            self.response.close()
+            self._discard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,245 @@
+"""
+Long-lived local daemon owning connections, cache and rate limiter.
+
+Short-lived processes such as pyarxiv-cli invocations forward their
+queries and downloads to the daemon over a Unix domain socket,
+so they neither re-open connections nor start with a cold cache.
+
+The protocol is line-based JSON. A request starts with one line
+{"command": "query" | "download", "kwargs": {...}}.
+Downloads then send one JSON line per id or entry, and close
+their writing end. The daemon answers with one JSON line per result,
+{"entry": ...} or {"element": ..., "error": ...},
+and a final {"done": true} or {"error": "..."}.
+"""
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from pyarxiv import ArxivClient
+
+SOCKET_ENV_VAR = 'PYARXIV_SOCKET'
+# seconds query results are cached by the default daemon client
+CACHE_TTL = 10 * 60
+
+
+def default_socket_path():
+    """
+    :return: $PYARXIV_SOCKET or ~/.cache/pyarxiv/daemon.sock
+    :rtype: str
+    """
+    if os.environ.get(SOCKET_ENV_VAR):
+        return os.environ[SOCKET_ENV_VAR]
+    return os.path.join(os.path.expanduser('~'), '.cache', 'pyarxiv',
+                        'daemon.sock')
+
+
+class DaemonError(Exception):
+    """
+    Raised when the daemon reports an error or cannot be reached.
+    """
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def send(self, message):
+        self.wfile.write(json.dumps(message, default=str).encode('utf-8')
+                         + b'\n')
+        self.wfile.flush()
+
+    def read_elements(self):
+        for line in self.rfile:
+            line = line.strip()
+            if line:
+                yield json.loads(line.decode('utf-8'))
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline().decode('utf-8'))
+            kwargs = request.get('kwargs', {})
+            if request.get('command') == 'query':
+                for entry in self.server.client.iter_query(**kwargs):
+                    self.send({'entry': entry})
+            elif request.get('command') == 'download':
+                if kwargs.get('retry') is not None:
+                    from pyarxiv.retry import RetryPolicy
+                    kwargs['retry_policy'] = RetryPolicy(**kwargs['retry'])
+                kwargs.pop('retry', None)
+
+                def progress_callback(element, exc):
+                    self.send({'element': element,
+                               'error': None if exc is None else str(exc)})
+                self.server.client.download_entries(
+                    self.read_elements(),
+                    progress_callback=progress_callback, **kwargs)
+            else:
+                raise ValueError('Unknown command %r'
+                                 % request.get('command'))
+        except Exception as e:
+            self.send({'error': repr(e)})
+        else:
+            self.send({'done': True})
+
+
+class ArxivDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves query and download requests of DaemonClients with one
+    shared ArxivClient. Each connection is handled on its own thread.
+
+    :param str socket_path: Path of the Unix domain socket,
+                   only accessible to the current user.
+    :param ArxivClient client: Default is a client with pooled
+                   connections and an in-memory cache expiring
+                   after CACHE_TTL seconds.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path=None, client=None):
+        if socket_path is None:
+            socket_path = default_socket_path()
+        if client is None:
+            from pyarxiv.cache import MemoryCache
+            from pyarxiv.connections import PooledTransport
+            client = ArxivClient(transport=PooledTransport(),
+                                 cache=MemoryCache(ttl=CACHE_TTL))
+        self.client = client
+        if DaemonClient(socket_path).is_running():
+            raise DaemonError('A daemon is already listening on %s'
+                              % socket_path)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # left over by a daemon that died
+        directory = os.path.dirname(socket_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        old_umask = os.umask(0o077)
+        try:
+            socketserver.UnixStreamServer.__init__(self, socket_path,
+                                                   _RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class DaemonClient(object):
+    """
+    Forwards query and download requests to an ArxivDaemon.
+
+    :param str socket_path: default is default_socket_path()
+    """
+
+    def __init__(self, socket_path=None):
+        if socket_path is None:
+            socket_path = default_socket_path()
+        self.socket_path = socket_path
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except (IOError, OSError) as e:
+            sock.close()
+            raise DaemonError('Cannot reach daemon at %s: %r'
+                              % (self.socket_path, e))
+        return sock
+
+    def is_running(self):
+        """
+        :return: whether a daemon accepts connections on the socket
+        :rtype: bool
+        """
+        try:
+            self._connect().close()
+            return True
+        except DaemonError:
+            return False
+
+    @staticmethod
+    def _send(sock, message):
+        sock.sendall(json.dumps(message, default=str).encode('utf-8')
+                     + b'\n')
+
+    @staticmethod
+    def _responses(sock):
+        for line in sock.makefile('rb'):
+            response = json.loads(line.decode('utf-8'))
+            if 'error' in response and 'element' not in response:
+                raise DaemonError(response['error'])
+            if response.get('done'):
+                return
+            yield response
+        raise DaemonError('Daemon closed the connection')
+
+    def iter_query(self, **kwargs):
+        """
+        Like ArxivClient.iter_query(), takes the same keyword arguments.
+
+        :return: generator of arXiv entries
+        :rtype: Iterator[dict]
+        """
+        sock = self._connect()
+        try:
+            self._send(sock, {'command': 'query', 'kwargs': kwargs})
+            sock.shutdown(socket.SHUT_WR)
+            for response in self._responses(sock):
+                yield response['entry']
+        finally:
+            sock.close()
+
+    def query(self, **kwargs):
+        """
+        :return: List of dictionaries of arXiv entries matching query.
+        :rtype: List[dict]
+        """
+        return list(self.iter_query(**kwargs))
+
+    def download_entries(self, entries_or_ids_or_uris=[], target_folder='.',
+                         progress_callback=(lambda x, y: id), **kwargs):
+        """
+        Like ArxivClient.download_entries(), takes the same arguments.
+        Elements are sent while they are produced,
+        so entries_or_ids_or_uris may be a slow generator.
+
+        :return: list of all exceptions, as ValueErrors
+        :rtype: List[ValueError]
+        """
+        kwargs['target_folder'] = os.path.abspath(target_folder)
+        retry_policy = kwargs.pop('retry_policy', None)
+        if retry_policy is not None:
+            kwargs['retry'] = {'max_attempts': retry_policy.max_attempts,
+                               'base_delay': retry_policy.base_delay,
+                               'max_delay': retry_policy.max_delay,
+                               'jitter': retry_policy.jitter}
+        report = kwargs.pop('report', None)
+        sock = self._connect()
+        sender = threading.Thread(target=self._send_elements,
+                                  args=(sock, kwargs, entries_or_ids_or_uris))
+        sender.daemon = True
+        sender.start()
+        exceptions = []
+        try:
+            for response in self._responses(sock):
+                exc = None
+                if response['error'] is not None:
+                    exc = ValueError(response['error'])
+                    exceptions.append(exc)
+                if report is not None:
+                    report.add(response['element'], exc)
+                progress_callback(response['element'], exc)
+            sender.join()
+        finally:
+            sock.close()
+        return exceptions
+
+    def _send_elements(self, sock, kwargs, elements):
+        try:
+            self._send(sock, {'command': 'download', 'kwargs': kwargs})
+            for element in elements:
+                self._send(sock, element)
+            sock.shutdown(socket.SHUT_WR)
+        except (IOError, OSError):
+            pass  # the daemon hung up, _responses reports it
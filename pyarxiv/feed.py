@@ -0,0 +1,174 @@
+"""
+Incremental parser for the Atom feeds returned by the arXiv API.
+
+Entries are yielded as soon as their closing tag has been received,
+so callers can start working on the first results
+while the rest of the feed is still being transferred.
+Entries are plain dicts with the keys and values feedparser returns
+for arXiv feeds, including the *_parsed timestamps; unlike feedparser's
+entries they do not support attribute access (entry.title).
+"""
+import calendar
+import time
+from xml.etree.ElementTree import XMLPullParser
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+ARXIV_NS = '{http://arxiv.org/schemas/atom}'
+ENTRY_TAG = ATOM_NS + 'entry'
+CHUNK_SIZE = 16 * 1024
+ATOM_DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+# keys entries can be restricted to, see entry_to_dict()
+FIELDS = ('id', 'title', 'summary', 'published', 'updated', 'authors',
+          'links', 'tags', 'arxiv_primary_category', 'arxiv_comment',
+          'arxiv_journal_ref', 'arxiv_doi')
+
+
+def iter_entries(stream, chunk_size=CHUNK_SIZE, fields=None):
+    """
+    Parses an Atom feed incrementally.
+
+    :param stream: file-like object with read(size), e.g. a HTTP response
+    :param int chunk_size: number of bytes read at once
+    :param fields: only parse these fields, see entry_to_dict()
+    :type fields: Iterable[str]
+    :return: generator of arXiv entries
+    :rtype: Iterator[dict]
+    :raises ValueError: for unknown fields
+    """
+    fields = check_fields(fields)
+    parser = XMLPullParser(events=('end',))
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        parser.feed(chunk)
+        for entry in _completed_entries(parser, fields):
+            yield entry
+    parser.close()
+    for entry in _completed_entries(parser, fields):
+        yield entry
+
+
+def parse_entries(raw_feed, fields=None):
+    """
+    :param bytes raw_feed: complete Atom feed
+    :param fields: only parse these fields, see entry_to_dict()
+    :type fields: Iterable[str]
+    :return: all arXiv entries of the feed
+    :rtype: List[dict]
+    :raises ValueError: for unknown fields
+    """
+    fields = check_fields(fields)
+    parser = XMLPullParser(events=('end',))
+    parser.feed(raw_feed)
+    parser.close()
+    return list(_completed_entries(parser, fields))
+
+
+def _completed_entries(parser, fields=None):
+    for _, elem in parser.read_events():
+        if elem.tag == ENTRY_TAG:
+            entry = entry_to_dict(elem, fields)
+            elem.clear()
+            yield entry
+
+
+def _text(elem):
+    if elem is None or elem.text is None:
+        return ''
+    return elem.text
+
+
+def _parse_date(value):
+    """
+    :return: UTC time.struct_time like feedparser's, None if unparseable
+    """
+    try:
+        return time.gmtime(calendar.timegm(
+            time.strptime(value, ATOM_DATE_FORMAT)))
+    except ValueError:
+        return None
+
+
+def _detail(value):
+    return {'type': 'text/plain', 'language': None, 'base': '',
+            'value': value}
+
+
+def check_fields(fields):
+    """
+    :param fields: entry keys to parse, see FIELDS, or None for all
+    :type fields: Iterable[str]
+    :return: the fields as a set, or None for all
+    :rtype: frozenset
+    :raises ValueError: for unknown fields
+    """
+    if fields is None:
+        return None
+    fields = frozenset(fields)
+    unknown = fields.difference(FIELDS)
+    if unknown:
+        raise ValueError('Unknown fields %s, choose from %s'
+                         % (', '.join(sorted(unknown)), ', '.join(FIELDS)))
+    return fields
+
+
+def entry_to_dict(elem, fields=None):
+    """
+    Converts an <entry> element to a dict with feedparser's key names.
+
+    :param elem: parsed <entry> element
+    :type elem: xml.etree.ElementTree.Element
+    :param fields: only parse these fields, see FIELDS, default is all.
+                   Fields come with their derived keys, e.g. 'title'
+                   with 'title_detail' and 'published' with
+                   'published_parsed'.
+    :type fields: Iterable[str]
+    :return: arXiv entry
+    :rtype: dict
+    """
+    if fields is None:
+        fields = FIELDS
+    entry = {}
+    if 'id' in fields:
+        entry['id'] = _text(elem.find(ATOM_NS + 'id'))
+        entry['guidislink'] = True
+    for name in ('title', 'summary'):
+        if name in fields:
+            value = _text(elem.find(ATOM_NS + name)).strip()
+            entry[name] = value
+            entry[name + '_detail'] = _detail(value)
+    for name in ('published', 'updated'):
+        if name in fields:
+            value = _text(elem.find(ATOM_NS + name))
+            entry[name] = value
+            entry[name + '_parsed'] = _parse_date(value)
+    if 'authors' in fields:
+        entry['authors'] = [{'name': _text(author.find(ATOM_NS + 'name'))}
+                            for author in elem.iterfind(ATOM_NS + 'author')]
+        if len(entry['authors']) > 0:
+            entry['author'] = entry['authors'][-1]['name']
+            entry['author_detail'] = dict(entry['authors'][-1])
+    if 'links' in fields:
+        entry['links'] = []
+        for link in elem.iterfind(ATOM_NS + 'link'):
+            link_dict = dict(link.attrib)
+            entry['links'].append(link_dict)
+            if link_dict.get('rel') == 'alternate':
+                entry['link'] = link_dict.get('href')
+    if 'tags' in fields:
+        entry['tags'] = [{'term': category.get('term'),
+                          'scheme': category.get('scheme'),
+                          'label': None}
+                         for category in elem.iterfind(ATOM_NS + 'category')]
+    if 'arxiv_primary_category' in fields:
+        primary = elem.find(ARXIV_NS + 'primary_category')
+        if primary is not None:
+            entry['arxiv_primary_category'] = {
+                'term': primary.get('term'), 'scheme': primary.get('scheme')}
+    for name in ('comment', 'journal_ref', 'doi'):
+        if 'arxiv_' + name in fields:
+            child = elem.find(ARXIV_NS + name)
+            if child is not None:
+                entry['arxiv_' + name] = _text(child)
+    return entry
@@ -0,0 +1,213 @@
+"""
+File names for the PDFs of a batch, free of collisions.
+
+Titles are not unique: two papers called 'Introduction' would be saved
+to the same file, the later one overwriting the earlier one, and with
+concurrent downloads either one may win. A FilenamePlanner hands out
+names in the order of the batch. A paper keeps its plain name unless an
+earlier paper of the batch took it; it then gets its id appended, like
+append_id does, so names only depend on the order of the batch:
+
+    planner = FilenamePlanner(client, 'papers', use_title_for_filename=True)
+    for element, name, error in planner.plan(entries):
+        ...
+
+Titles of elements that are ids rather than entries are looked up
+with lookup_ids(), TITLE_BATCH_SIZE ids per request.
+"""
+import os
+from itertools import islice
+
+from pyarxiv._locks import ForkSafeLock
+
+# number of elements plan() reads ahead to look the titles of ids up
+TITLE_BATCH_SIZE = 100
+
+
+class FilenamePlanner(object):
+    """
+    Thread-safe assignment of file names to papers. Planners can be
+    pickled, e.g. to hand one to a worker process.
+
+    :param client: ArxivClient, queries the titles of elements
+                   that are ids rather than entries
+    :param str target_folder: folder the PDFs are saved to
+    :param bool use_title_for_filename: name files by title, not by id
+    :param bool append_id: append the id to titles
+    :param bool reserve: create each planned file, empty, with
+                   O_CREAT | O_EXCL, so that planners in other processes
+                   writing to target_folder never pick the same name.
+                   Names of existing files count as taken, unless
+                   the name ends in the paper's id.
+    :param int batch_size: number of elements plan() reads ahead
+                   when it needs the titles of ids
+    """
+
+    def __init__(self, client, target_folder, use_title_for_filename=False,
+                 append_id=False, reserve=False, batch_size=TITLE_BATCH_SIZE):
+        self.client = client
+        self.target_folder = target_folder
+        self.use_title_for_filename = use_title_for_filename
+        self.append_id = append_id
+        self.reserve = reserve
+        self.batch_size = batch_size
+        # case-folded name -> id, as file systems may ignore case
+        self._owners = {}
+        self._names = {}
+        # id -> title looked up by plan(), None if not found
+        self._titles = {}
+        self._reserved = set()
+        self._lock = ForkSafeLock()
+
+    def path(self, name):
+        """
+        :param str name: as returned by name()
+        :return: path of the PDF
+        :rtype: str
+        """
+        return os.path.join(self.target_folder, name + '.pdf')
+
+    def name(self, element):
+        """
+        :param element: id, URI or entry, as taken by download_entry()
+        :return: file name of the PDF of element, without '.pdf';
+                 the same name for the same versioned id
+        :rtype: str
+        :raises ValueError: if element has no arXiv id,
+                   or its title cannot be found
+        """
+        from pyarxiv import _id_str, make_filename_safe
+        arxiv_id = _id_str(self.client._locate_pdf(element)[0])
+        with self._lock:
+            if arxiv_id in self._names:
+                return self._names[arxiv_id]
+        named = element
+        if self.use_title_for_filename and arxiv_id in self._titles:
+            if self._titles[arxiv_id] is None:
+                raise ValueError('Could not find title for paper id '
+                                 '"%s"' % arxiv_id)
+            named = {'title': self._titles[arxiv_id]}
+        base = self.client._filename(named, arxiv_id,
+                                     self.use_title_for_filename,
+                                     self.append_id)
+        suffix = make_filename_safe(arxiv_id)
+        has_id = base.endswith(suffix)
+        with self._lock:
+            if arxiv_id in self._names:
+                return self._names[arxiv_id]
+            if self._claim(base, arxiv_id, has_id):
+                name = base
+            else:
+                if not has_id:
+                    base += suffix
+                name = base
+                n = 1
+                while not self._claim(name, arxiv_id, True):
+                    n += 1
+                    name = '%s_%i' % (base, n)
+            self._names[arxiv_id] = name
+            return name
+
+    def _claim(self, name, arxiv_id, may_exist):
+        """
+        :param bool may_exist: name belongs to arxiv_id, an existing
+                   file of that name is an earlier download of it
+        :return: whether arxiv_id got name
+        """
+        key = name.lower()
+        owner = self._owners.get(key)
+        if owner is not None:
+            return owner == arxiv_id
+        if self.reserve:
+            try:
+                fd = os.open(self.path(name),
+                             os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+                os.close(fd)
+                self._reserved.add(name)
+            except FileExistsError:
+                if not may_exist:
+                    return False
+        self._owners[key] = arxiv_id
+        return True
+
+    def _needs_title(self, element):
+        if not self.use_title_for_filename or isinstance(element, dict):
+            return False
+        from pyarxiv import _id_str
+        try:
+            arxiv_id = _id_str(self.client._locate_pdf(element)[0])
+        except ValueError:
+            return False
+        return arxiv_id not in self._titles and arxiv_id not in self._names
+
+    def _lookup_titles(self, elements):
+        """
+        Looks the titles of the ids among elements up in one batch.
+        If that fails, name() queries them one by one.
+        """
+        from pyarxiv import _id_str
+        ids = [e for e in elements if self._needs_title(e)]
+        if not ids:
+            return
+        try:
+            found, missing = self.client.lookup_ids(ids, fields=['title'])
+        except Exception:
+            return
+        missing = set(missing)
+        found = iter(found)
+        titles = {}
+        for element in ids:
+            arxiv_id = _id_str(self.client._locate_pdf(element)[0])
+            titles[arxiv_id] = None if element in missing \
+                else next(found)['title']
+        with self._lock:
+            self._titles.update(titles)
+
+    def plan(self, elements):
+        """
+        Names elements as they are consumed, so elements may be a
+        generator; names depend only on the order of elements.
+        Entries are named one by one. At an id whose title is needed,
+        the next batch_size elements are read, and the titles of their
+        ids looked up together.
+
+        :param elements: ids, URIs or entries
+        :return: generator of (element, name, None), or
+                 (element, None, exception) if element cannot be named,
+                 e.g. because its title cannot be found
+        :rtype: Iterator[(Any, str, Exception)]
+        """
+        from pyarxiv.profiling import FILENAME, stage
+        elements = iter(elements)
+        for first in elements:
+            batch = [first]
+            if self._needs_title(first):
+                batch.extend(islice(elements, self.batch_size - 1))
+                self._lookup_titles(batch)
+            for element in batch:
+                item = element.get('id') if isinstance(element, dict) \
+                    else element
+                try:
+                    with stage(FILENAME, item):
+                        name = self.name(element)
+                except Exception as e:
+                    yield element, None, e
+                    continue
+                yield element, name, None
+
+    def release(self, name):
+        """
+        Removes the file this planner reserved for name, along with
+        whatever a failed download left in it. Files it did not
+        create are kept. Names stay taken within this planner.
+
+        :param str name: as returned by name()
+        """
+        with self._lock:
+            if name not in self._reserved:
+                return
+            self._reserved.discard(name)
+        try:
+            os.remove(self.path(name))
+        except OSError:
+            pass
@@ -0,0 +1,224 @@
+"""
+Columnar pandas frames of entries, for filtering and reporting over
+large harvests without looping over dicts.
+
+to_frames() splits entries into three frames sharing the arxiv_id
+column: one row per paper with its dates as datetime64 and its
+abstract stored once, and long frames of its categories and authors,
+whose repeated strings are pandas categoricals:
+
+    frames = to_frames(Snapshot('corpus.snap'))
+    recent = filter_frames(frames, published_after='2017-01-01',
+                           categories=['cs.*'], keyword='transformer')
+    papers_per_month(recent)
+    top_authors(recent, n=20)
+
+pandas and numpy are optional dependencies of pyarxiv,
+they are imported when these functions are called.
+"""
+from collections import namedtuple
+
+EntryFrames = namedtuple('EntryFrames', ('papers', 'tags', 'authors'))
+EntryFrames.__doc__ = """
+papers: arxiv_id, version, title, summary, published, updated,
+        primary_category, one row per entry
+tags: arxiv_id, category, one row per category of an entry
+authors: arxiv_id, position, name, key (see pyarxiv.authors.author_key),
+         one row per author of an entry
+"""
+
+
+def _pandas():
+    try:
+        import pandas
+    except ImportError:
+        raise ImportError('pyarxiv.frames needs pandas, '
+                          'install it with pip install pandas')
+    return pandas
+
+
+def _terms(values):
+    return [v['term'] if isinstance(v, dict) else v for v in values]
+
+
+def _names(values):
+    return [v['name'] if isinstance(v, dict) else v for v in values]
+
+
+def _entry_columns(entry):
+    """
+    :param entry: entry as returned by query() or converted by
+                  convert_to_native_types(), or a SnapshotRecord
+    :return: arxiv_id, version, title, summary, published and updated
+             as UTC seconds, primary category, tags and author names
+    """
+    from pyarxiv import get_arxiv_id
+    from pyarxiv.snapshot import SnapshotRecord, _timestamp
+    if isinstance(entry, SnapshotRecord):
+        tags = entry.tags
+        return (entry.arxiv_id, entry.version, entry.title, entry.summary,
+                entry._get(2), entry._get(3), tags[0] if tags else None,
+                tags, entry.authors)
+    arxiv_id, version = get_arxiv_id(entry)
+    tags = _terms(entry.get('tags', ()))
+    primary = entry.get('arxiv_primary_category')
+    if isinstance(primary, dict):
+        primary = primary.get('term')
+    elif primary is None and tags:
+        primary = tags[0]
+    return (arxiv_id, int(version) if version else None,
+            entry.get('title', ''), entry.get('summary', ''),
+            _timestamp(entry.get('published')),
+            _timestamp(entry.get('updated')), primary,
+            tags, _names(entry.get('authors', ())))
+
+
+def _datetimes(seconds):
+    import numpy
+    from pyarxiv.snapshot import NO_DATE
+    pandas = _pandas()
+    values = numpy.array(seconds, dtype='int64')
+    missing = values == NO_DATE
+    values[missing] = 0
+    dates = pandas.Series(pandas.to_datetime(values, unit='s', utc=True))
+    dates[missing] = pandas.NaT
+    return dates
+
+
+def to_frames(entries):
+    """
+    :param entries: entries as returned by query() or iter_query(),
+                   converted by convert_to_native_types(),
+                   or the records of a pyarxiv.snapshot.Snapshot
+    :type entries: Iterable[dict]
+    :return: papers, tags and authors of the entries
+    :rtype: EntryFrames
+    :raises ImportError: if pandas is not installed
+    """
+    from pyarxiv.authors import author_key
+    pandas = _pandas()
+    columns = ([], [], [], [], [], [], [])
+    tag_ids, tag_terms = [], []
+    author_ids, positions, names = [], [], []
+    for entry in entries:
+        values = _entry_columns(entry)
+        for column, value in zip(columns, values):
+            column.append(value)
+        arxiv_id, tags, authors = values[0], values[7], values[8]
+        tag_ids.extend([arxiv_id] * len(tags))
+        tag_terms.extend(tags)
+        author_ids.extend([arxiv_id] * len(authors))
+        positions.extend(range(len(authors)))
+        names.extend(authors)
+    keys = dict((name, author_key(name)) for name in set(names))
+    papers = pandas.DataFrame({
+        'arxiv_id': columns[0],
+        'version': pandas.array(columns[1], dtype='Int64'),
+        'title': columns[2],
+        'summary': columns[3],
+        'published': _datetimes(columns[4]),
+        'updated': _datetimes(columns[5]),
+        'primary_category': pandas.Categorical(columns[6])})
+    tags = pandas.DataFrame({
+        'arxiv_id': tag_ids,
+        'category': pandas.Categorical(tag_terms)})
+    authors = pandas.DataFrame({
+        'arxiv_id': author_ids,
+        'position': pandas.array(positions, dtype='int32'),
+        'name': pandas.Categorical(names),
+        'key': pandas.Categorical([keys[name] for name in names])})
+    return EntryFrames(papers, tags, authors)
+
+
+def _utc(value):
+    pandas = _pandas()
+    timestamp = pandas.Timestamp(value)
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize('UTC')
+    return timestamp.tz_convert('UTC')
+
+
+def filter_frames(frames, published_after=None, published_before=None,
+                  categories=None, keyword=None):
+    """
+    Selects papers by vectorised comparisons; all given criteria apply.
+
+    :param EntryFrames frames: as returned by to_frames()
+    :param published_after: first publication date, inclusive,
+                   e.g. '2017-09-01' or a datetime, naive ones are UTC
+    :param published_before: last publication date, exclusive
+    :param categories: papers with any of these categories,
+                   e.g. ['cs.AI', 'stat.*']
+    :type categories: List[str]
+    :param str keyword: papers with keyword in title or abstract,
+                   case-insensitive
+    :return: the selected papers, with their tags and authors
+    :rtype: EntryFrames
+    """
+    papers = frames.papers
+    mask = papers['arxiv_id'].notna()
+    if published_after is not None:
+        mask &= papers['published'] >= _utc(published_after)
+    if published_before is not None:
+        mask &= papers['published'] < _utc(published_before)
+    if categories is not None:
+        from pyarxiv.categories import expand_categories
+        wanted = frames.tags['category'].isin(expand_categories(categories))
+        mask &= papers['arxiv_id'].isin(frames.tags['arxiv_id'][wanted])
+    if keyword is not None:
+        mask &= (papers['title'].str.contains(keyword, case=False,
+                                              regex=False) |
+                 papers['summary'].str.contains(keyword, case=False,
+                                                regex=False))
+    papers = papers[mask]
+    if len(papers) == len(frames.papers):
+        return frames
+    return EntryFrames(
+        papers,
+        frames.tags[frames.tags['arxiv_id'].isin(papers['arxiv_id'])],
+        frames.authors[frames.authors['arxiv_id'].isin(papers['arxiv_id'])])
+
+
+def papers_per_month(frames, primary_only=False):
+    """
+    :param EntryFrames frames: as returned by to_frames()
+    :param bool primary_only: count papers in their primary category
+                   only, instead of in each of their categories
+    :return: number of papers published per month (rows)
+             and category (columns)
+    :rtype: pandas.DataFrame
+    """
+    papers = frames.papers
+    months = papers['published'].dt.tz_localize(None).dt.to_period('M')
+    if primary_only:
+        counts = papers.groupby(
+            [months.rename('month'), papers['primary_category']],
+            observed=True).size()
+    else:
+        month_of = months.groupby(papers['arxiv_id']).first()
+        tags = frames.tags
+        counts = tags.groupby(
+            [tags['arxiv_id'].map(month_of).rename('month'),
+             tags['category']], observed=True).size()
+    return counts.unstack(fill_value=0).sort_index()
+
+
+def top_authors(frames, n=10):
+    """
+    :param EntryFrames frames: as returned by to_frames()
+    :param int n: number of authors
+    :return: the n authors with the most papers, with key,
+             their most frequent spelling as name, and papers
+    :rtype: pandas.DataFrame
+    """
+    authors = frames.authors
+    counts = authors.groupby('key', observed=True)['arxiv_id'].nunique()
+    top = counts.nlargest(n)
+    spellings = authors[authors['key'].isin(top.index)].groupby(
+        ['key', 'name'], observed=True).size()
+    names = spellings.sort_values(ascending=False, kind='stable') \
+        .reset_index().drop_duplicates('key').set_index('key')['name']
+    return _pandas().DataFrame({
+        'key': top.index.astype(str),
+        'name': names.reindex(top.index).astype(str).values,
+        'papers': top.values})
@@ -0,0 +1,214 @@
+"""
+Planning of batch downloads from metadata alone.
+
+plan_downloads() sends concurrent HEAD requests for the PDFs of a batch
+and returns their size, Last-Modified and ETag without transferring
+them. A sync compares these with the state saved by the previous run,
+skips the PDFs that did not change, and downloads the others largest
+first, so that no worker is left with a large file at the end:
+
+    plan = plan_downloads(ids, known=json.load(open('state.json')))
+    print(plan.total_bytes, plan.estimate_seconds(2 * 1024 * 1024))
+    report = DownloadReport()
+    download_entries(plan.to_download(), max_workers=4, report=report)
+    json.dump(plan.state(report), open('state.json', 'w'))
+"""
+
+
+class PlannedDownload(object):
+    """
+    Metadata of one PDF of a plan.
+
+    element: the id, URI or entry as given to plan_downloads()
+    arxiv_id: id, with version if one was given, e.g. '1709.05312v1'
+    url: URL of the PDF
+    size: Content-Length in bytes, None if unknown
+    last_modified, etag: as sent by the server, None if not sent
+    unchanged: True if the PDF matches the known state,
+               or is in the client's store
+    error: exception of the HEAD request, None if it succeeded
+    """
+
+    __slots__ = ('element', 'arxiv_id', 'url', 'size', 'last_modified',
+                 'etag', 'unchanged', 'error')
+
+    def __init__(self, element, arxiv_id, url, size=None,
+                 last_modified=None, etag=None, unchanged=False,
+                 error=None):
+        self.element = element
+        self.arxiv_id = arxiv_id
+        self.url = url
+        self.size = size
+        self.last_modified = last_modified
+        self.etag = etag
+        self.unchanged = unchanged
+        self.error = error
+
+    def matches(self, known):
+        """
+        :param dict known: etag, last_modified and size seen before
+        :return: True if the PDF did not change since, judged by its
+                 ETag, or else by Last-Modified and size
+        :rtype: bool
+        """
+        if self.etag is not None and known.get('etag') is not None:
+            return self.etag == known['etag']
+        return self.last_modified is not None and \
+            self.last_modified == known.get('last_modified') and \
+            self.size == known.get('size')
+
+    def __repr__(self):
+        return '<PlannedDownload %s %s bytes%s>' % (
+            self.arxiv_id, self.size, ', unchanged' if self.unchanged else '')
+
+
+class DownloadPlan(object):
+    """
+    Result of plan_downloads().
+
+    items: PlannedDownloads of all elements that have an arXiv id,
+           largest first, those of unknown size last
+    invalid: elements without an arXiv id
+    """
+
+    def __init__(self, items, invalid=()):
+        self.items = sorted(
+            items, key=lambda item: (item.size is None, -(item.size or 0)))
+        self.invalid = list(invalid)
+
+    def pending(self):
+        """
+        :return: PlannedDownloads of PDFs to download, largest first.
+                 PDFs whose HEAD request failed are included,
+                 so that their download reports the error.
+        :rtype: List[PlannedDownload]
+        """
+        return [item for item in self.items if not item.unchanged]
+
+    def to_download(self):
+        """
+        :return: elements to pass to download_entries(), largest first
+        :rtype: List
+        """
+        return [item.element for item in self.pending()]
+
+    def unchanged(self):
+        """
+        :return: elements that need not be downloaded again
+        :rtype: List
+        """
+        return [item.element for item in self.items if item.unchanged]
+
+    def errors(self):
+        """
+        :return: (element, exception) of failed HEAD requests
+        :rtype: List[(Any, Exception)]
+        """
+        return [(item.element, item.error) for item in self.items
+                if item.error is not None]
+
+    @property
+    def total_bytes(self):
+        """
+        :return: bytes of the PDFs to download, of those of known size
+        :rtype: int
+        """
+        return sum(item.size or 0 for item in self.pending())
+
+    def estimate_seconds(self, bytes_per_second, max_workers=1,
+                         seconds_per_file=0.0):
+        """
+        :param float bytes_per_second: combined throughput of downloads,
+                   e.g. the rate of a BandwidthScheduler
+        :param int max_workers: number of concurrent downloads
+        :param float seconds_per_file: fixed cost of each download,
+                   e.g. latency and rate limiting
+        :return: estimated seconds to download all pending PDFs
+        :rtype: float
+        """
+        pending = self.pending()
+        return self.total_bytes / float(bytes_per_second) + \
+            seconds_per_file * len(pending) / max(1, max_workers)
+
+    def state(self, report):
+        """
+        :param pyarxiv.retry.DownloadReport report: report of the
+                   download of to_download(). PDFs that failed, or were
+                   not downloaded at all, are left out, so that the next
+                   plan downloads them again.
+        :return: etag, last_modified and size per id, with version
+                 if one was given, of the unchanged and the downloaded
+                 PDFs, to pass as known to the next plan_downloads();
+                 JSON-serialisable
+        :rtype: Dict[str, dict]
+        """
+        from pyarxiv import _id_str, get_arxiv_id
+        done = set(_id_str(get_arxiv_id(element))
+                   for element in report.succeeded + report.skipped)
+        return dict(
+            (item.arxiv_id, {'etag': item.etag,
+                             'last_modified': item.last_modified,
+                             'size': item.size})
+            for item in self.items if item.error is None and
+            (item.unchanged or item.arxiv_id in done) and
+            (item.etag is not None or item.last_modified is not None))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return '<DownloadPlan %i to download (%i bytes), %i unchanged>' % (
+            len(self.pending()), self.total_bytes, len(self.unchanged()))
+
+
+def _content_length(headers):
+    try:
+        return int(headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return None
+
+
+def plan_downloads(client, elements, max_workers=8, known=None):
+    """
+    See pyarxiv.plan_downloads().
+
+    :param ArxivClient client: sends the HEAD requests
+    """
+    from pyarxiv import _id_str
+    if not hasattr(client.transport, 'head'):
+        raise ValueError('%s cannot send HEAD requests'
+                         % type(client.transport).__name__)
+    known = known or {}
+    items = []
+    invalid = []
+    for element in elements:
+        try:
+            arxiv_id, url = client._locate_pdf(element)
+        except ValueError:
+            invalid.append(element)
+            continue
+        item = PlannedDownload(element, _id_str(arxiv_id), url)
+        item.unchanged = client._in_store(element)
+        items.append(item)
+
+    def head(item):
+        if item.unchanged:
+            return
+        try:
+            headers = client.head(item.url)
+        except Exception as e:
+            item.error = e
+            return
+        item.size = _content_length(headers)
+        item.last_modified = headers.get('Last-Modified')
+        item.etag = headers.get('ETag')
+        previous = known.get(item.arxiv_id)
+        item.unchanged = previous is not None and item.matches(previous)
+
+    if max_workers <= 1:
+        for item in items:
+            head(item)
+    else:
+        from pyarxiv._pool import run_bounded
+        run_bounded(head, items, max_workers)
+    return DownloadPlan(items, invalid)
@@ -0,0 +1,272 @@
+"""
+Per-stage timing of queries and downloads.
+
+Inside a profile() block, ArxivClient records the wall and CPU time
+of each stage of its work, in all threads, along with the slowest
+items (URLs, ids) of each stage:
+
+    with profile() as profiler:
+        download_entries(query(categories=['cs.CL']), max_workers=4)
+    print(profiler.summary())
+
+Outside of profile() blocks the stages cost a function call each.
+Streamed queries (iter_query()) parse the body while it is received,
+so their 'parse' stage includes reading the body. Downloads are timed
+on the code path they take anyway: the transport's retrieve() as one
+'retrieve' stage, chunked copies (with a bandwidth scheduler or a
+progress callback) as 'http wait', 'body read' and 'disk write'.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+URL_BUILD = 'url build'
+HTTP_WAIT = 'http wait'
+BODY_READ = 'body read'
+PARSE = 'parse'
+CONVERT = 'convert'
+FILENAME = 'filename'
+DISK_WRITE = 'disk write'
+# a whole download by the transport's retrieve()
+RETRIEVE = 'retrieve'
+# the order of stages in summaries, other stages follow by name
+STAGES = (URL_BUILD, HTTP_WAIT, BODY_READ, PARSE, CONVERT, FILENAME,
+          DISK_WRITE, RETRIEVE)
+
+# profilers of the profile() blocks currently open
+_active = ()
+_active_lock = threading.Lock()
+
+
+class Profiler(object):
+    """
+    Thread-safe collection of stage timings.
+
+    :param int outliers: number of slowest items kept per stage
+    """
+
+    def __init__(self, outliers=5):
+        self.max_outliers = outliers
+        self.wall = None
+        self._started = time.perf_counter()
+        self._stats = {}
+        self._outliers = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def record(self, name, wall, cpu, item=None):
+        """
+        :param str name: stage, e.g. HTTP_WAIT
+        :param float wall: seconds spent in the stage
+        :param float cpu: CPU seconds the thread spent in the stage
+        :param item: what the stage worked on, e.g. a URL
+        """
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = [0, 0.0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += wall
+            stats[2] += cpu
+            stats[3] = max(stats[3], wall)
+            if item is not None and self.max_outliers > 0:
+                slowest = self._outliers.setdefault(name, [])
+                entry = (wall, next(self._counter), cpu, item)
+                if len(slowest) < self.max_outliers:
+                    heapq.heappush(slowest, entry)
+                elif wall > slowest[0][0]:
+                    heapq.heapreplace(slowest, entry)
+
+    def stage(self, name, item=None):
+        """
+        :return: context manager recording the time spent inside it
+        """
+        return _Timer((self,), name, item)
+
+    def start(self):
+        """
+        Starts the total wall time, called when the profile() block opens.
+        """
+        self._started = time.perf_counter()
+
+    def stop(self):
+        """
+        Fixes the total wall time, called when the profile() block ends.
+        """
+        self.wall = time.perf_counter() - self._started
+
+    def _names(self):
+        known = [name for name in STAGES if name in self._stats]
+        return known + sorted(set(self._stats).difference(STAGES))
+
+    def stats(self):
+        """
+        :return: per stage: count, wall and cpu seconds in total,
+                 mean_wall and max_wall seconds
+        :rtype: Dict[str, dict]
+        """
+        with self._lock:
+            return dict(
+                (name, {'count': count, 'wall': wall, 'cpu': cpu,
+                        'mean_wall': wall / count, 'max_wall': max_wall})
+                for name, (count, wall, cpu, max_wall)
+                in self._stats.items())
+
+    def outliers(self, name):
+        """
+        :param str name: stage
+        :return: the slowest items of the stage, slowest first,
+                 as dicts with item, wall and cpu
+        :rtype: List[dict]
+        """
+        with self._lock:
+            slowest = sorted(self._outliers.get(name, ()), reverse=True)
+        return [{'item': item, 'wall': wall, 'cpu': cpu}
+                for wall, _, cpu, item in slowest]
+
+    def to_dict(self):
+        """
+        :return: total wall time, stats() and outliers() of all stages
+        :rtype: dict
+        """
+        return {'wall': self.wall,
+                'stages': self.stats(),
+                'outliers': dict((name, self.outliers(name))
+                                 for name in self._names())}
+
+    def to_json(self, **kwargs):
+        """
+        :param kwargs: passed to json.dumps(), e.g. indent=2
+        :rtype: str
+        """
+        import json
+        return json.dumps(self.to_dict(), default=str, **kwargs)
+
+    def summary(self):
+        """
+        :return: table of the stages, and their slowest items
+        :rtype: str
+        """
+        stats = self.stats()
+        lines = ['%-12s %7s %10s %10s %10s %10s' % (
+            'stage', 'count', 'wall s', 'cpu s', 'mean ms', 'max ms')]
+        for name in self._names():
+            s = stats[name]
+            lines.append('%-12s %7i %10.3f %10.3f %10.1f %10.1f' % (
+                name, s['count'], s['wall'], s['cpu'],
+                1000 * s['mean_wall'], 1000 * s['max_wall']))
+        if self.wall is not None:
+            lines.append('%-12s %7s %10.3f' % ('total', '', self.wall))
+        for name in self._names():
+            slowest = self.outliers(name)
+            if slowest:
+                lines.append('')
+                lines.append('slowest %s:' % name)
+                for outlier in slowest:
+                    lines.append('  %10.1f ms  %s' % (
+                        1000 * outlier['wall'], outlier['item']))
+        return '\n'.join(lines)
+
+
+class _Timer(object):
+    """
+    Measures the time spent inside its with blocks. Used once it
+    records on leaving the block; with accumulate=True it sums up
+    several blocks, e.g. the reads of one file, until record().
+    """
+
+    __slots__ = ('profilers', 'name', 'item', 'accumulate', 'wall', 'cpu',
+                 '_wall_start', '_cpu_start')
+
+    def __init__(self, profilers, name, item=None, accumulate=False):
+        self.profilers = profilers
+        self.name = name
+        self.item = item
+        self.accumulate = accumulate
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def __enter__(self):
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wall += time.perf_counter() - self._wall_start
+        self.cpu += time.thread_time() - self._cpu_start
+        if not self.accumulate:
+            self.record()
+
+    def record(self):
+        for profiler in self.profilers:
+            profiler.record(self.name, self.wall, self.cpu, self.item)
+
+
+class _NullTimer(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def record(self):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def is_active():
+    """
+    :return: whether a profile() block is open
+    :rtype: bool
+    """
+    return len(_active) > 0
+
+
+def stage(name, item=None, accumulate=False):
+    """
+    Times a stage for the open profile() blocks.
+
+        with stage(HTTP_WAIT, url):
+            response = transport.open(url)
+
+    :param str name: stage, e.g. HTTP_WAIT
+    :param item: what the stage works on, e.g. a URL or an arXiv id
+    :param bool accumulate: sum up several with blocks until the
+               timer's record() is called
+    :return: context manager, doing nothing outside of profile() blocks
+    """
+    profilers = _active
+    if not profilers:
+        return _NULL_TIMER
+    return _Timer(profilers, name, item, accumulate)
+
+
+class profile(object):
+    """
+    Context manager recording the stages run in any thread
+    while it is open. Blocks may be nested; each records everything
+    run inside it.
+
+    :param int outliers: number of slowest items kept per stage
+    """
+
+    def __init__(self, outliers=5):
+        self.profiler = Profiler(outliers)
+
+    def __enter__(self):
+        global _active
+        self.profiler.start()
+        with _active_lock:
+            _active = _active + (self.profiler,)
+        return self.profiler
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active
+        self.profiler.stop()
+        with _active_lock:
+            _active = tuple(p for p in _active if p is not self.profiler)
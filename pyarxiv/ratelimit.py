@@ -0,0 +1,138 @@
+"""
+Request rate limiting for ArxivClient.
+"""
+import threading
+import time
+
+from pyarxiv._locks import ForkSafeLock
+
+
+class RateLimiter(object):
+    """
+    Thread-safe limiter spacing requests at least min_interval seconds apart.
+    The arXiv API asks clients to wait 3 seconds between calls.
+
+    :param float min_interval: Seconds between two requests.
+    """
+
+    def __init__(self, min_interval=3.0):
+        self.min_interval = min_interval
+        self._next_slot = 0.0
+        self._lock = ForkSafeLock()
+
+    @classmethod
+    def per_second(cls, rate):
+        """
+        :param float rate: Maximum number of requests per second.
+        :return: RateLimiter allowing rate requests per second.
+        """
+        if rate <= 0:
+            raise ValueError('Rate must be positive, got %r' % rate)
+        return cls(1.0 / rate)
+
+    def wait(self):
+        """
+        Blocks until the caller may issue its request.
+        Slots are handed out in call order across all threads.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class BandwidthScheduler(object):
+    """
+    Thread-safe byte-rate limit shared by concurrent downloads.
+
+    Downloads report each chunk they received with acquire(), which blocks
+    while the byte budget is used up. Waiting chunks are granted by
+    priority first (lower values first), then round-robin across jobs:
+    the job whose last chunk was granted longest ago goes next,
+    so jobs of equal priority share the bandwidth equally,
+    however much they received before.
+
+    :param float bytes_per_second: Sustained limit, None for no limit.
+    :param int burst: Bytes that may be sent at once after an idle period,
+                   default is one second's worth.
+    """
+
+    def __init__(self, bytes_per_second=None, burst=None):
+        self.bytes_per_second = bytes_per_second
+        self.burst = burst if burst is not None else bytes_per_second
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._changed = threading.Condition(ForkSafeLock())
+        self._waiting = []
+        self._sequence = 0
+        self._grants = 0
+        self._last_grant = {}
+        self._served = {}
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_changed']
+        state['_waiting'] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._changed = threading.Condition(ForkSafeLock())
+
+    def served(self, job):
+        """
+        :return: bytes granted to job so far
+        :rtype: int
+        """
+        with self._changed:
+            return self._served.get(job, 0)
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (
+            now - self._last_refill) * self.bytes_per_second)
+        self._last_refill = now
+
+    def _next_in_line(self):
+        return min(self._waiting,
+                   key=lambda w: (w[0], self._last_grant.get(w[2], -1), w[1]))
+
+    def _grant(self, nbytes, job):
+        self._grants += 1
+        self._last_grant[job] = self._grants
+        self._served[job] = self._served.get(job, 0) + nbytes
+
+    def acquire(self, nbytes, priority=0, job=None):
+        """
+        Blocks until nbytes may be transferred.
+
+        :param int nbytes: size of the chunk
+        :param int priority: lower values are served first
+        :param job: identifies the job the chunk belongs to
+        """
+        if self.bytes_per_second is None:
+            with self._changed:
+                self._grant(nbytes, job)
+            return
+        with self._changed:
+            self._sequence += 1
+            ticket = (priority, self._sequence, job)
+            self._waiting.append(ticket)
+            while True:
+                self._refill(time.monotonic())
+                if self._next_in_line() is ticket:
+                    if self._tokens > 0:
+                        break
+                    self._changed.wait(-self._tokens / self.bytes_per_second)
+                else:
+                    self._changed.wait()
+            self._waiting.remove(ticket)
+            # may go negative, delaying the next chunk accordingly
+            self._tokens -= nbytes
+            self._grant(nbytes, job)
+            if not self._waiting:
+                # forget jobs that are idle, they start afresh
+                self._last_grant.clear()
+            self._changed.notify_all()
@@ -0,0 +1,237 @@
+"""
+Classification of download failures, retries with jittered backoff,
+and reports of batch downloads.
+
+    report = DownloadReport()
+    download_entries(ids, retry_policy=RetryPolicy(max_attempts=5),
+                     report=report)
+    download_entries(report.resume_list(), report=DownloadReport())
+"""
+import copy
+import random
+import socket
+import time
+
+from pyarxiv._locks import ForkSafeLock
+
+
+class DownloadError(Exception):
+    """
+    Base class of classified download failures.
+
+    :param str message: description of the failure
+    :param Exception cause: the original exception, if any
+    """
+
+    def __init__(self, message, cause=None):
+        super(DownloadError, self).__init__(message)
+        self.cause = cause
+
+
+class TransientError(DownloadError):
+    """
+    A failure that may go away when retried,
+    e.g. a timeout, a reset connection or HTTP 500.
+    """
+
+
+class ThrottledError(TransientError):
+    """
+    The server asked to slow down, HTTP 429 or 503.
+
+    :param float retry_after: seconds to wait as requested by the server,
+                   None if it did not say
+    """
+
+    def __init__(self, message, cause=None, retry_after=None):
+        super(ThrottledError, self).__init__(message, cause)
+        self.retry_after = retry_after
+
+
+class PermanentError(DownloadError):
+    """
+    A failure that retrying will not fix,
+    e.g. an invalid id, a missing target folder or HTTP 403.
+    """
+
+
+class NotFoundError(PermanentError):
+    """
+    The paper does not exist, HTTP 404 or 410.
+    """
+
+
+def _retry_after(exc):
+    headers = getattr(exc, 'headers', None)
+    try:
+        return max(0.0, float(headers.get('Retry-After')))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def classify_error(exc):
+    """
+    :param Exception exc: exception raised by a download
+    :return: exc itself if it is a DownloadError,
+             otherwise a DownloadError subclass instance wrapping exc
+    :rtype: DownloadError
+    """
+    if isinstance(exc, DownloadError):
+        return exc
+    from urllib.error import HTTPError, URLError
+    from http.client import HTTPException
+    message = '%s: %s' % (exc.__class__.__name__, exc)
+    if isinstance(exc, HTTPError):
+        if exc.code in (404, 410):
+            return NotFoundError(message, exc)
+        if exc.code in (429, 503):
+            return ThrottledError(message, exc, _retry_after(exc))
+        if exc.code >= 500 or exc.code == 408:
+            return TransientError(message, exc)
+        return PermanentError(message, exc)
+    if isinstance(exc, (URLError, HTTPException, socket.timeout,
+                        ConnectionError, TimeoutError)):
+        return TransientError(message, exc)
+    return PermanentError(message, exc)
+
+
+class RetryPolicy(object):
+    """
+    Retries transient failures with exponential backoff.
+    The n-th retry waits base_delay * 2 ** (n - 1) seconds, at most
+    max_delay, scaled by a random factor in [1 - jitter, 1 + jitter]
+    so that parallel downloads do not retry in lockstep,
+    and at least as long as a throttling server asked for.
+
+    :param int max_attempts: attempts per element, 1 means no retries
+    :param float base_delay: seconds before the first retry
+    :param float max_delay: upper bound of the backoff, before jitter
+    :param float jitter: relative spread of delays, 0 to 1
+    :param retry_on: DownloadError classes to retry
+    :type retry_on: Tuple[type]
+    """
+
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=60.0,
+                 jitter=0.5, retry_on=(TransientError,)):
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        if not 0 <= jitter <= 1:
+            raise ValueError('jitter must be between 0 and 1')
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self._random = random.Random()
+
+    def delay(self, attempt, error=None):
+        """
+        :param int attempt: number of the failed attempt, starting at 1
+        :param DownloadError error: the classified failure
+        :return: seconds to wait before the next attempt
+        :rtype: float
+        """
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        backoff *= self._random.uniform(1 - self.jitter, 1 + self.jitter)
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            backoff = max(backoff, retry_after)
+        return backoff
+
+    def should_retry(self, attempt, error):
+        """
+        :param int attempt: number of the failed attempt, starting at 1
+        :param DownloadError error: the classified failure
+        :rtype: bool
+        """
+        return attempt < self.max_attempts and isinstance(error,
+                                                          self.retry_on)
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Calls fn until it succeeds or the policy gives up.
+
+        :return: what fn returns
+        :raises Exception: the exception of the last attempt, unchanged
+        """
+        attempt = 1
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as exc:
+                error = classify_error(exc)
+                if not self.should_retry(attempt, error):
+                    raise
+                time.sleep(self.delay(attempt, error))
+                attempt += 1
+
+
+# a single attempt, the default of download_entries()
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def _without_cause(error):
+    error = copy.copy(error)
+    error.cause = None
+    return error
+
+
+class DownloadReport(object):
+    """
+    Thread-safe record of the outcome of each element of a batch.
+    Reports can be pickled, e.g. to return them from a worker process;
+    the exceptions of failures, which may not unpickle (HTTPError),
+    are then replaced by their classified DownloadError without cause.
+
+    succeeded: elements downloaded
+    skipped: elements found in the client's store, not downloaded again
+    failed: (element, exception) of elements given up,
+            the exception being the one raised by the last attempt
+    """
+
+    def __init__(self):
+        self.succeeded = []
+        self.skipped = []
+        self.failed = []
+        self._lock = ForkSafeLock()
+
+    def add(self, element, exception=None, skipped=False):
+        with self._lock:
+            if exception is not None:
+                self.failed.append((element, exception))
+            elif skipped:
+                self.skipped.append(element)
+            else:
+                self.succeeded.append(element)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        with self._lock:
+            state['failed'] = [(element, _without_cause(classify_error(exc)))
+                               for element, exc in self.failed]
+            state['succeeded'] = list(self.succeeded)
+            state['skipped'] = list(self.skipped)
+        return state
+
+    def errors(self):
+        """
+        :return: (element, classified DownloadError) of failed elements
+        :rtype: List[(Any, DownloadError)]
+        """
+        with self._lock:
+            return [(element, classify_error(exc))
+                    for element, exc in self.failed]
+
+    def resume_list(self, include_permanent=False):
+        """
+        :param bool include_permanent: also list elements that failed
+                   permanently, e.g. that were not found
+        :return: failed elements to pass to download_entries() again
+        :rtype: List
+        """
+        return [element for element, error in self.errors()
+                if include_permanent or not isinstance(error, PermanentError)]
+
+    def __repr__(self):
+        return '<DownloadReport %i succeeded, %i skipped, %i failed>' % (
+            len(self.succeeded), len(self.skipped), len(self.failed))
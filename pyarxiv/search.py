@@ -0,0 +1,235 @@
+"""
+Composable search queries for the arXiv API.
+
+Terms are combined with & (AND), | (OR) and ~ (ANDNOT):
+
+    (Title('neural') & (Author('Hinton') | Author('LeCun'))
+     & ~Cat(ArxivCategory.cs_AI))
+
+A query compiles to the API's search_query syntax once, on first use,
+and can be passed as querystring to query() and iter_query().
+Equal queries compile to equal strings, so cache_key() is stable
+across processes and can be used to key response caches.
+"""
+import hashlib
+import re
+
+import pyarxiv
+
+
+class Query(object):
+    """
+    Base class of search queries.
+    """
+
+    _compiled = None
+    _encoded = None
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    def _compile(self):
+        raise NotImplementedError
+
+    def compile(self):
+        """
+        :return: the query in the API's search_query syntax, unescaped
+        :rtype: str
+        :raises ValueError: if the query cannot be expressed by the API,
+                 e.g. a negation that is not part of an AND
+        """
+        if self._compiled is None:
+            self._compiled = self._compile()
+        return self._compiled
+
+    def encode(self):
+        """
+        :return: the compiled query, escaped for the request URL
+        :rtype: str
+        """
+        if self._encoded is None:
+            self._encoded = pyarxiv.quote_plus(self.compile(), safe=':+')
+        return self._encoded
+
+    def cache_key(self):
+        """
+        :return: hex SHA-1 of the encoded query,
+                 the same for equal queries in every process
+        :rtype: str
+        """
+        return hashlib.sha1(self.encode().encode('utf-8')).hexdigest()
+
+    def _nested(self):
+        # compiled form for use as an operand of AND or OR
+        return self.compile()
+
+    def __eq__(self, other):
+        return isinstance(other, Query) and self.compile() == other.compile()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.compile())
+
+    def __str__(self):
+        return self.compile()
+
+    def __repr__(self):
+        try:
+            return '<%s %s>' % (self.__class__.__name__, self.compile())
+        except ValueError:
+            return '<%s>' % self.__class__.__name__
+
+
+class Field(Query):
+    """
+    Search for value in one field, e.g. Field('ti', 'neural networks').
+    Values with spaces are searched as a phrase.
+
+    :param str prefix: field prefix of the API, e.g. 'ti', 'au', 'cat'
+    :param str value: text to search for
+    """
+
+    def __init__(self, prefix, value):
+        self.prefix = prefix
+        self.value = value
+
+    def _compile(self):
+        value = self.value.replace('"', '').strip()
+        if len(value) == 0:
+            raise ValueError('Empty search term for %s' % self.prefix)
+        if re.search(r'[\s()]', value):
+            value = '"' + value + '"'
+        return self.prefix + ':' + value
+
+
+class Title(Field):
+    def __init__(self, value):
+        super(Title, self).__init__('ti', value)
+
+
+class Author(Field):
+    def __init__(self, value):
+        super(Author, self).__init__('au', value)
+
+
+class Abstract(Field):
+    def __init__(self, value):
+        super(Abstract, self).__init__('abs', value)
+
+
+class Comment(Field):
+    def __init__(self, value):
+        super(Comment, self).__init__('co', value)
+
+
+class JournalRef(Field):
+    def __init__(self, value):
+        super(JournalRef, self).__init__('jr', value)
+
+
+class ReportNumber(Field):
+    def __init__(self, value):
+        super(ReportNumber, self).__init__('rn', value)
+
+
+class All(Field):
+    """
+    Search for value in all fields.
+    """
+
+    def __init__(self, value):
+        super(All, self).__init__('all', value)
+
+
+class Cat(Field):
+    """
+    :param category: e.g. 'cs.AI' or ArxivCategory.cs_AI
+    :type category: str, ArxivCategory
+    """
+
+    def __init__(self, category):
+        super(Cat, self).__init__('cat', pyarxiv.category_to_str(category))
+
+
+class SubmittedDate(Query):
+    """
+    Restricts the search to a range of submission dates (GMT),
+    see pyarxiv.format_submitted_date() for accepted values.
+    Either end may be None for an open range.
+    """
+
+    def __init__(self, after=None, before=None):
+        self.after = after
+        self.before = before
+
+    def _compile(self):
+        return 'submittedDate:[%s TO %s]' % (
+            pyarxiv.format_submitted_date(self.after,
+                                          pyarxiv.EARLIEST_SUBMISSION),
+            pyarxiv.format_submitted_date(self.before,
+                                          pyarxiv.LATEST_SUBMISSION))
+
+
+class Not(Query):
+    """
+    Negation, only valid as part of an And: a & ~b is a ANDNOT b.
+    """
+
+    def __init__(self, query):
+        self.query = query
+
+    def __invert__(self):
+        return self.query
+
+    def _compile(self):
+        raise ValueError('Negated term %r must be combined with & and a '
+                         'positive term' % self.query)
+
+
+class _Compound(Query):
+    def __init__(self, *queries):
+        operands = []
+        for q in queries:
+            # flatten (a & b) & c to a & b & c
+            if type(q) is type(self):
+                operands.extend(q.operands)
+            else:
+                operands.append(q)
+        self.operands = tuple(operands)
+
+    def _nested(self):
+        return '(' + self.compile() + ')'
+
+
+class And(_Compound):
+    def _compile(self):
+        positives = [q for q in self.operands if not isinstance(q, Not)]
+        negatives = [q.query for q in self.operands if isinstance(q, Not)]
+        if len(positives) == 0:
+            raise ValueError('%d negated terms need a positive term '
+                             'to be subtracted from' % len(negatives))
+        compiled = ' AND '.join(q._nested() for q in positives)
+        for q in negatives:
+            compiled += ' ANDNOT ' + q._nested()
+        return compiled
+
+    def _nested(self):
+        if len(self.operands) == 1:
+            return self.operands[0]._nested()
+        return super(And, self)._nested()
+
+
+class Or(_Compound):
+    def _compile(self):
+        for q in self.operands:
+            if isinstance(q, Not):
+                raise ValueError('Cannot OR a negated term, %r' % q.query)
+        return ' OR '.join(q._nested() for q in self.operands)
@@ -0,0 +1,330 @@
+"""
+Compact binary snapshots of harvested entries, read through mmap.
+
+A snapshot file consists of
+
+    header   magic, format version, record count, offset of the records
+    heap     UTF-8 strings, short ones stored once and shared
+    records  one fixed-width record per entry: arXiv id, version,
+             published and updated as UTC seconds, and (offset, length)
+             of title, summary, authors and tags in the heap
+
+Readers map the file and decode fields only when they are accessed,
+so opening a snapshot is instant whatever its size, and processes
+reading the same snapshot share its pages.
+
+    write_snapshot('corpus.snap', query(categories=['cs.CL']))
+    with Snapshot('corpus.snap') as snapshot:
+        titles = [record.title for record in snapshot]
+"""
+import calendar
+import datetime
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+MAGIC = b'PYAXSNAP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sIIQ')
+# id, version, published, updated, (offset, length) of 4 strings
+RECORD = struct.Struct('<32sHqq' + 'QI' * 4)
+STRING_FIELDS = ('title', 'summary', 'authors', 'tags')
+# joins the authors and tags of a record in the heap
+SEPARATOR = u'\x1f'
+NO_DATE = -2 ** 63
+# strings up to this many bytes are stored once per snapshot
+SHARED_STRING_SIZE = 256
+
+
+def _timestamp(value):
+    """
+    :param value: datetime, ISO 8601 str as in feeds, struct_time or None
+    :return: UTC seconds since the epoch, NO_DATE for None
+    :rtype: int
+    """
+    if value is None or value == '':
+        return NO_DATE
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            return calendar.timegm(value.timetuple())
+        return calendar.timegm(value.utctimetuple())
+    if isinstance(value, str):
+        from pyarxiv.feed import ATOM_DATE_FORMAT
+        value = time.strptime(value, ATOM_DATE_FORMAT)
+    return calendar.timegm(value)
+
+
+def _names(values, key):
+    return [v[key] if isinstance(v, dict) else v for v in values]
+
+
+class _SnapshotWriter(object):
+    def __init__(self, f):
+        self.f = f
+        self.records = []
+        self.shared = {}
+        self.position = HEADER.size
+
+    def string(self, value):
+        data = value.encode('utf-8')
+        if len(data) <= SHARED_STRING_SIZE and data in self.shared:
+            return self.shared[data], len(data)
+        offset = self.position
+        self.f.write(data)
+        self.position += len(data)
+        if len(data) <= SHARED_STRING_SIZE:
+            self.shared[data] = offset
+        return offset, len(data)
+
+    def add(self, entry):
+        from pyarxiv import get_arxiv_id
+        arxiv_id, version = get_arxiv_id(entry)
+        if not arxiv_id:
+            raise ValueError('Entry without arXiv id: %r' % (entry,))
+        encoded_id = arxiv_id.encode('ascii')
+        if len(encoded_id) > 32:
+            raise ValueError('arXiv id %r is too long' % arxiv_id)
+        strings = (
+            entry.get('title', ''),
+            entry.get('summary', ''),
+            SEPARATOR.join(_names(entry.get('authors', []), 'name')),
+            SEPARATOR.join(_names(entry.get('tags', []), 'term')))
+        fields = []
+        for value in strings:
+            fields.extend(self.string(value))
+        self.records.append(RECORD.pack(
+            encoded_id, int(version or 0),
+            _timestamp(entry.get('published')),
+            _timestamp(entry.get('updated')),
+            *fields))
+
+    def finish(self):
+        records_offset = self.position
+        for record in self.records:
+            self.f.write(record)
+        self.f.seek(0)
+        self.f.write(HEADER.pack(MAGIC, FORMAT_VERSION,
+                                 len(self.records), records_offset))
+
+
+def write_snapshot(path, entries):
+    """
+    Writes entries to a snapshot file, replacing it atomically.
+
+    :param str path: snapshot file
+    :param entries: arXiv entries as returned by query(),
+                   or converted by convert_to_native_types()
+    :type entries: Iterable[dict]
+    :return: number of entries written
+    :rtype: int
+    :raises ValueError: for entries without a valid arXiv id
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.pyarxiv-',
+                                    suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            writer = _SnapshotWriter(f)
+            f.write(b'\0' * HEADER.size)
+            for entry in entries:
+                writer.add(entry)
+            writer.finish()
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return len(writer.records)
+
+
+class Snapshot(object):
+    """
+    Read-only view of a snapshot file, a sequence of SnapshotRecords.
+    Can be pickled, e.g. to hand it to worker processes,
+    which map the file again.
+
+    :param str path: snapshot file written by write_snapshot()
+    :raises ValueError: if path is not a snapshot
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._open()
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError('%s is not a pyarxiv snapshot' % self.path)
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, records_offset = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError('%s is not a pyarxiv snapshot of version %i'
+                             % (self.path, FORMAT_VERSION))
+        self._count = count
+        self._records_offset = records_offset
+        self._index = None
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._open()
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('snapshot index out of range')
+        return SnapshotRecord(self, i)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield SnapshotRecord(self, i)
+
+    def _record(self, i):
+        return RECORD.unpack_from(self._map,
+                                  self._records_offset + i * RECORD.size)
+
+    def _arxiv_id(self, i):
+        raw = self._map[self._records_offset + i * RECORD.size:
+                        self._records_offset + i * RECORD.size + 32]
+        return raw.rstrip(b'\0').decode('ascii')
+
+    def ids(self):
+        """
+        :return: arXiv ids of all records, without versions
+        :rtype: List[str]
+        """
+        return [self._arxiv_id(i) for i in range(self._count)]
+
+    def get(self, arxiv_id, default=None):
+        """
+        :param str arxiv_id: e.g. '1709.05312', versions are ignored
+        :return: the last record of arxiv_id, or default
+        :rtype: SnapshotRecord
+        """
+        if self._index is None:
+            self._index = dict(
+                (record_id, i) for i, record_id in enumerate(self.ids()))
+        from pyarxiv import get_arxiv_id
+        i = self._index.get(get_arxiv_id(arxiv_id)[0])
+        if i is None:
+            return default
+        return SnapshotRecord(self, i)
+
+
+def _datetime(timestamp):
+    if timestamp == NO_DATE:
+        return None
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+
+
+class SnapshotRecord(object):
+    """
+    One entry of a snapshot, decoding its fields when they are accessed.
+    """
+
+    __slots__ = ('snapshot', 'index', '_fields')
+
+    def __init__(self, snapshot, index):
+        self.snapshot = snapshot
+        self.index = index
+        self._fields = None
+
+    def _get(self, i):
+        if self._fields is None:
+            self._fields = self.snapshot._record(self.index)
+        return self._fields[i]
+
+    def raw(self, name):
+        """
+        :param str name: one of 'title', 'summary', 'authors', 'tags'
+        :return: the UTF-8 bytes of the field, without copying them
+        :rtype: memoryview
+        """
+        i = 4 + 2 * STRING_FIELDS.index(name)
+        offset, length = self._get(i), self._get(i + 1)
+        return memoryview(self.snapshot._map)[offset:offset + length]
+
+    def _string(self, name):
+        return self.raw(name).tobytes().decode('utf-8')
+
+    def _list(self, name):
+        value = self._string(name)
+        return value.split(SEPARATOR) if value else []
+
+    @property
+    def arxiv_id(self):
+        return self._get(0).rstrip(b'\0').decode('ascii')
+
+    @property
+    def version(self):
+        """
+        :return: version number, None if the entry had no version
+        :rtype: int
+        """
+        return self._get(1) or None
+
+    @property
+    def id(self):
+        """
+        :return: URL of the abstract page, as in query() entries
+        :rtype: str
+        """
+        version = self.version
+        return 'http://arxiv.org/abs/' + self.arxiv_id + \
+            ('v%i' % version if version else '')
+
+    @property
+    def published(self):
+        return _datetime(self._get(2))
+
+    @property
+    def updated(self):
+        return _datetime(self._get(3))
+
+    @property
+    def title(self):
+        return self._string('title')
+
+    @property
+    def summary(self):
+        return self._string('summary')
+
+    @property
+    def authors(self):
+        return self._list('authors')
+
+    @property
+    def tags(self):
+        return self._list('tags')
+
+    def to_dict(self):
+        """
+        :return: the entry in the shape convert_to_native_types() gives,
+                 limited to the fields kept in snapshots
+        :rtype: dict
+        """
+        return {'id': self.id, 'title': self.title, 'summary': self.summary,
+                'authors': [{'name': name} for name in self.authors],
+                'tags': self.tags, 'published': self.published,
+                'updated': self.updated}
+
+    def __repr__(self):
+        return '<SnapshotRecord %s>' % self.id
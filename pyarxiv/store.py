@@ -0,0 +1,202 @@
+"""
+Content-addressed store for downloaded PDFs.
+
+Every PDF is kept once, named by its SHA-256, below
+root/objects/<first two hex digits>/<remaining digits>.
+An SQLite index maps (arXiv id, version) to the digest.
+Unversioned downloads, which get whatever version is latest,
+are stored but not indexed, so they are always downloaded again.
+Files in target folders are hard links (or symlinks, or copies)
+to the stored blob, so a paper downloaded for several folders
+or under several names takes up disk space only once,
+and papers already in the store are not downloaded again.
+"""
+import errno
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import uuid
+
+from pyarxiv._locks import ForkSafeLock, abandon_inherited, \
+    reset_after_fork
+
+LINK_MODES = ('hardlink', 'symlink', 'copy')
+CHUNK_SIZE = 64 * 1024
+
+
+def file_digest(path):
+    """
+    :param str path: file to hash
+    :return: hex SHA-256 of the file's content
+    :rtype: str
+    """
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class PdfStore(object):
+    """
+    Content-addressed PDF store, safe to share between threads
+    and between processes using the same root.
+
+    :param str root: Folder of the store, created if it does not exist.
+    :param str link: How files in target folders refer to blobs:
+                   'hardlink' (default), 'symlink' or 'copy'.
+                   Hard links fall back to symlinks across file systems.
+    """
+
+    def __init__(self, root, link='hardlink'):
+        if link not in LINK_MODES:
+            raise ValueError('link must be one of %s, not %r'
+                             % (', '.join(LINK_MODES), link))
+        self.root = os.path.abspath(root)
+        self.link_mode = link
+        for folder in ('objects', 'tmp'):
+            path = os.path.join(self.root, folder)
+            if not os.path.isdir(path):
+                os.makedirs(path)
+        self._lock = ForkSafeLock()
+        self._db = None
+        reset_after_fork(self)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_db'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        reset_after_fork(self)
+
+    def _after_fork(self):
+        abandon_inherited(self._db)
+        self._db = None
+
+    def _connection(self):
+        if self._db is None:
+            self._db = sqlite3.connect(
+                os.path.join(self.root, 'index.sqlite'),
+                timeout=30, check_same_thread=False,
+                isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS papers ('
+                'arxiv_id TEXT NOT NULL, version TEXT NOT NULL, '
+                'digest TEXT NOT NULL, size INTEGER NOT NULL, '
+                'PRIMARY KEY (arxiv_id, version))')
+        return self._db
+
+    def blob_path(self, digest):
+        """
+        :param str digest: hex SHA-256
+        :return: path of the blob, which may not exist
+        :rtype: str
+        """
+        return os.path.join(self.root, 'objects', digest[:2], digest[2:])
+
+    def lookup(self, arxiv_id, version=None):
+        """
+        :param str arxiv_id: e.g. '1709.05312'
+        :param str version: e.g. '2'
+        :return: digest of the stored PDF, or None,
+                 always None without a version
+        :rtype: str
+        """
+        if version is None:
+            return None
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT digest FROM papers WHERE arxiv_id = ? AND version = ?',
+                (arxiv_id, version)).fetchone()
+        if row is None or not os.path.exists(self.blob_path(row[0])):
+            return None
+        return row[0]
+
+    def __contains__(self, arxiv_id_and_version):
+        return self.lookup(*arxiv_id_and_version) is not None
+
+    def add_file(self, path, arxiv_id, version=None):
+        """
+        Moves the file at path into the store, and indexes it
+        if a version is given.
+
+        :return: digest of the file
+        :rtype: str
+        """
+        digest = file_digest(path)
+        size = os.path.getsize(path)
+        blob = self.blob_path(digest)
+        if os.path.exists(blob):
+            os.remove(path)
+        else:
+            if not os.path.isdir(os.path.dirname(blob)):
+                try:
+                    os.makedirs(os.path.dirname(blob))
+                except OSError as e:  # created concurrently
+                    if e.errno != errno.EEXIST:
+                        raise
+            os.chmod(path, 0o444)
+            os.replace(path, blob)
+        if version is not None:
+            with self._lock:
+                self._connection().execute(
+                    'INSERT OR REPLACE INTO papers VALUES (?, ?, ?, ?)',
+                    (arxiv_id, version, digest, size))
+        return digest
+
+    def link(self, digest, target_path):
+        """
+        Makes target_path refer to the blob, replacing any existing file.
+        """
+        blob = self.blob_path(digest)
+        if os.path.exists(target_path) and os.path.samefile(target_path, blob):
+            return
+        target_folder = os.path.dirname(os.path.abspath(target_path))
+        tmp_path = os.path.join(target_folder,
+                                '.pyarxiv-%s' % uuid.uuid4().hex)
+        mode = self.link_mode
+        if mode == 'hardlink':
+            try:
+                os.link(blob, tmp_path)
+            except OSError:  # e.g. other file system
+                mode = 'symlink'
+        if mode == 'symlink':
+            os.symlink(blob, tmp_path)
+        elif mode == 'copy':
+            shutil.copyfile(blob, tmp_path)
+        os.replace(tmp_path, target_path)
+
+    def materialize(self, arxiv_id, version, target_path, fetch):
+        """
+        Places the PDF of arxiv_id at target_path,
+        calling fetch only if it is not in the store yet,
+        or if no version is given.
+
+        :param str arxiv_id: e.g. '1709.05312'
+        :param str version: e.g. '2', or None
+        :param str target_path: where the PDF should appear
+        :param fetch: fetch(filename) downloads the PDF to filename
+        :return: digest of the PDF
+        :rtype: str
+        """
+        digest = self.lookup(arxiv_id, version)
+        if digest is None:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.join(self.root,
+                                                             'tmp'))
+            os.close(fd)
+            try:
+                fetch(tmp_path)
+                digest = self.add_file(tmp_path, arxiv_id, version)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        self.link(digest, target_path)
+        return digest
@@ -0,0 +1,140 @@
+"""
+Finds papers in categories that are new or updated since the last poll.
+"""
+import json
+import os
+import tempfile
+
+import pyarxiv
+from pyarxiv.categories import expand_categories
+
+
+class CategoryWatcher(object):
+    """
+    Polls arXiv.org for entries in categories that appeared or were
+    updated since the previous poll.
+
+    The watcher keeps a high-water mark per category in state_path:
+    the latest 'updated' timestamp it has seen, and the ids seen at
+    exactly that timestamp. A poll is a single request for all categories,
+    sorted by lastUpdatedDate (new submissions count as updated too),
+    which stops paging as soon as entries are older than every mark.
+    Categories without entries get the newest timestamp of the poll
+    as their mark, so they do not make the next poll page further.
+    Polls bypass the client's response cache.
+
+    If more than max_results entries changed since a category's mark,
+    its mark is kept, so the next poll yields those entries again
+    instead of losing the older ones; raise max_results in that case.
+
+    :param str state_path: JSON file holding the marks, created on demand.
+    :param categories: categories to watch, archives like 'cs.*' are
+                       expanded to their categories
+    :type categories: List[str], List[ArxivCategory]
+    :param client: default is pyarxiv.get_default_client(),
+                   its cache is not used
+    :type client: ArxivClient
+    :param int page_size: Entries per request, a poll usually needs one.
+    :param int max_results: Upper bound of entries looked at per poll,
+                   e.g. on the first poll, when there are no marks yet.
+    """
+
+    def __init__(self, state_path, categories, client=None,
+                 page_size=25, max_results=1000):
+        self.state_path = state_path
+        self.categories = expand_categories(categories)
+        self.client = client
+        self.page_size = page_size
+        self.max_results = max_results
+
+    def load_state(self):
+        """
+        :return: category -> {'updated': str, 'seen': List[str]}
+        :rtype: dict
+        """
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (IOError, OSError):
+            return {}
+
+    def save_state(self, state):
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(state, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.state_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def poll(self):
+        """
+        Yields entries that are new or updated since the last poll,
+        most recently updated first. The marks are saved once the
+        generator is exhausted; entries of an abandoned poll
+        are yielded again by the next one.
+
+        :return: generator of arXiv entries
+        :rtype: Iterator[dict]
+        """
+        client = (self.client or pyarxiv.get_default_client()).copy(
+            cache=None)
+        state = self.load_state()
+        marks = dict((c, state.get(c, {'updated': '', 'seen': []}))
+                     for c in self.categories)
+        new_marks = dict((c, {'updated': m['updated'],
+                              'seen': list(m['seen'])})
+                         for c, m in marks.items())
+        oldest_mark = min(m['updated'] for m in marks.values())
+        entries = client.iter_query(max_results=self.max_results,
+                                    categories=self.categories,
+                                    page_size=self.page_size,
+                                    sort_by='lastUpdatedDate',
+                                    sort_order='descending')
+        looked_at = 0
+        newest = None
+        reached_marks = False
+        for entry in entries:
+            updated = entry['updated']
+            if updated < oldest_mark:
+                reached_marks = True
+                break
+            looked_at += 1
+            if newest is None:
+                newest = updated
+            is_new = False
+            for category in self._watched_tags(entry):
+                mark = marks[category]
+                if updated < mark['updated'] or \
+                        (updated == mark['updated']
+                         and entry['id'] in mark['seen']):
+                    continue
+                is_new = True
+                new_mark = new_marks[category]
+                if updated > new_mark['updated']:
+                    new_mark['updated'] = updated
+                    new_mark['seen'] = []
+                if updated == new_mark['updated']:
+                    new_mark['seen'].append(entry['id'])
+            if is_new:
+                yield entry
+        for mark in new_marks.values():
+            if not mark['updated'] and newest is not None:
+                # nothing in the category so far: the next poll need not
+                # look at entries older than the ones looked at now
+                mark['updated'] = newest
+        if looked_at >= self.max_results and not reached_marks:
+            for category, mark in marks.items():
+                if mark['updated'] and updated >= mark['updated']:
+                    # results were cut off before the mark, entries may
+                    # be missing between it and the oldest one looked at
+                    new_marks[category] = mark
+        state.update(new_marks)
+        self.save_state(state)
+
+    def _watched_tags(self, entry):
+        tags = set(t['term'] if isinstance(t, dict) else t
+                   for t in entry.get('tags', []))
+        return [c for c in self.categories if c in tags]
@@ -0,0 +1,334 @@
+"""
+Durable work queue for splitting downloads across processes and hosts.
+
+Elements (ids, URIs or entries) are put into a queue once.
+Any number of workers, see run_worker(), claim elements with a lease,
+keep the lease alive with heartbeats while downloading, and mark
+elements complete or failed. Elements whose lease expires, e.g. because
+their worker died, are handed out again; elements failing max_attempts
+times are set aside as failed.
+
+SQLiteWorkQueue keeps the queue in an SQLite file, which may live on
+storage shared between hosts as long as that storage supports file
+locking. Other backends only need to implement put(), claim(),
+heartbeat(), complete(), fail() and counts() with the same semantics.
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+import pyarxiv
+from pyarxiv._locks import ForkSafeLock, abandon_inherited, \
+    reset_after_fork
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def default_worker_id():
+    """
+    :return: '<hostname>:<pid>'
+    :rtype: str
+    """
+    return '%s:%i' % (socket.gethostname(), os.getpid())
+
+
+class SQLiteWorkQueue(object):
+    """
+    Work queue stored in an SQLite database file.
+
+    :param str path: database file, created if it does not exist
+    :param float lease_seconds: how long a claim lasts without heartbeat
+    :param int max_attempts: claims per element before it counts as failed
+    """
+
+    def __init__(self, path, lease_seconds=300.0, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = ForkSafeLock()
+        self._db = None
+        reset_after_fork(self)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_db'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        reset_after_fork(self)
+
+    def _after_fork(self):
+        abandon_inherited(self._db)
+        self._db = None
+
+    def _connection(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=60,
+                                       check_same_thread=False,
+                                       isolation_level=None)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS items ('
+                'position INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'element TEXT NOT NULL UNIQUE, '
+                'status TEXT NOT NULL, '
+                'attempts INTEGER NOT NULL DEFAULT 0, '
+                'worker TEXT, '
+                'lease_expires REAL, '
+                'last_error TEXT)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS items_status '
+                             'ON items (status, position)')
+        return self._db
+
+    def _transaction(self, statements):
+        with self._lock:
+            db = self._connection()
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                result = statements(db)
+                db.execute('COMMIT')
+                return result
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+
+    @staticmethod
+    def _key(element):
+        return json.dumps(element, sort_keys=True)
+
+    def put(self, elements):
+        """
+        Adds elements to the queue. Elements already queued,
+        whatever their status, are not added again.
+
+        :param elements: ids, URIs or entries to be downloaded
+        :return: number of elements added
+        :rtype: int
+        """
+        rows = [(self._key(e), PENDING) for e in elements]
+
+        def insert(db):
+            before = db.total_changes
+            db.executemany('INSERT OR IGNORE INTO items (element, status) '
+                           'VALUES (?, ?)', rows)
+            return db.total_changes - before
+        return self._transaction(insert)
+
+    def claim(self, worker_id, n=1):
+        """
+        Leases up to n pending elements, or elements whose lease expired.
+
+        :param str worker_id: identifies the claiming worker
+        :return: claimed elements
+        :rtype: list
+        """
+        now = time.time()
+
+        def lease(db):
+            claimed = []
+            while len(claimed) < n:
+                # rows that used up their attempts are set aside below,
+                # so each round selects new candidates
+                rows = db.execute(
+                    'SELECT position, element, attempts FROM items '
+                    'WHERE status = ? OR (status = ? AND lease_expires < ?) '
+                    'ORDER BY position LIMIT ?',
+                    (PENDING, LEASED, now, n - len(claimed))).fetchall()
+                if not rows:
+                    break
+                for position, element, attempts in rows:
+                    if attempts >= self.max_attempts:
+                        db.execute('UPDATE items SET status = ?, '
+                                   'last_error = ? WHERE position = ?',
+                                   (FAILED, 'lease expired', position))
+                        continue
+                    db.execute('UPDATE items SET status = ?, worker = ?, '
+                               'lease_expires = ?, attempts = attempts + 1 '
+                               'WHERE position = ?',
+                               (LEASED, worker_id, now + self.lease_seconds,
+                                position))
+                    claimed.append(json.loads(element))
+            return claimed
+        return self._transaction(lease)
+
+    def heartbeat(self, worker_id, elements):
+        """
+        Extends the leases worker_id holds on elements.
+        """
+        rows = [(time.time() + self.lease_seconds, self._key(e), LEASED,
+                 worker_id) for e in elements]
+        self._transaction(lambda db: db.executemany(
+            'UPDATE items SET lease_expires = ? '
+            'WHERE element = ? AND status = ? AND worker = ?', rows))
+
+    def complete(self, worker_id, element):
+        """
+        Marks element as done, even if its lease had expired meanwhile.
+        """
+        self._transaction(lambda db: db.execute(
+            'UPDATE items SET status = ?, worker = ?, last_error = NULL '
+            'WHERE element = ?', (DONE, worker_id, self._key(element))))
+
+    def fail(self, worker_id, element, error):
+        """
+        Records a failed attempt. The element is retried
+        until it failed max_attempts times. Ignored unless worker_id
+        still holds the lease, e.g. after it expired and another
+        worker claimed the element.
+
+        :param error: exception or message describing the failure
+        :return: FAILED if the element was given up, PENDING if it will
+                 be retried, None if the failure was ignored
+        :rtype: str
+        """
+        def record(db):
+            key = self._key(element)
+            row = db.execute('SELECT attempts FROM items WHERE element = ? '
+                             'AND status = ? AND worker = ?',
+                             (key, LEASED, worker_id)).fetchone()
+            if row is None:
+                return None
+            status = FAILED if row[0] >= self.max_attempts else PENDING
+            db.execute('UPDATE items SET status = ?, worker = NULL, '
+                       'lease_expires = NULL, last_error = ? '
+                       'WHERE element = ?', (status, str(error), key))
+            return status
+        return self._transaction(record)
+
+    def counts(self):
+        """
+        :return: number of elements per status
+        :rtype: dict
+        """
+        with self._lock:
+            rows = self._connection().execute(
+                'SELECT status, COUNT(*) FROM items GROUP BY status'
+            ).fetchall()
+        counts = dict((s, 0) for s in (PENDING, LEASED, DONE, FAILED))
+        counts.update(rows)
+        return counts
+
+    def failed(self):
+        """
+        :return: (element, last error) of every element that gave up
+        :rtype: List[tuple]
+        """
+        with self._lock:
+            rows = self._connection().execute(
+                'SELECT element, last_error FROM items WHERE status = ? '
+                'ORDER BY position', (FAILED,)).fetchall()
+        return [(json.loads(e), error) for e, error in rows]
+
+
+class _Heartbeat(object):
+    """
+    Renews the leases of the elements a worker is working on.
+    """
+
+    def __init__(self, queue, worker_id, interval):
+        self.queue = queue
+        self.worker_id = worker_id
+        self.interval = interval
+        self.elements = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not self.elements:
+                continue
+            try:
+                self.queue.heartbeat(self.worker_id, list(self.elements))
+            except Exception:
+                # e.g. the database is locked for a moment,
+                # the next beat is likely to succeed before leases expire
+                logger.warning('Heartbeat of %s failed', self.worker_id,
+                               exc_info=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(queue, client=None, worker_id=None, target_folder='.',
+               use_title_for_filename=False, append_id=False,
+               progress_callback=(lambda x, y: id), max_workers=1,
+               poll_interval=5.0, heartbeat_interval=None):
+    """
+    Downloads elements of queue until none are left.
+
+    Unlike download_entries(), any exception of a download counts as a
+    failed attempt. Attempts that will be retried are only recorded in
+    the queue; progress_callback and the returned list see an element's
+    exception once it is given up. While elements are pending or other
+    workers still hold leases, the worker waits poll_interval seconds
+    and tries again, so it takes over the elements of workers that died.
+
+    :param queue: e.g. SQLiteWorkQueue
+    :param client: default is pyarxiv.get_default_client()
+    :type client: ArxivClient
+    :param str worker_id: default is default_worker_id()
+    :param progress_callback: progress_callback(element, maybe_exception),
+               as for download_entries()
+    :param int max_workers: Elements claimed and downloaded at once.
+    :param float heartbeat_interval: default is a third of the lease
+    :return: exceptions of the elements given up by this worker
+    :rtype: List[Exception]
+    """
+    client = client or pyarxiv.get_default_client()
+    worker_id = worker_id or default_worker_id()
+    if heartbeat_interval is None:
+        heartbeat_interval = getattr(queue, 'lease_seconds', 300.0) / 3.0
+    exceptions = []
+    callback_lock = threading.Lock()
+
+    def download(element):
+        new_exception = None
+        try:
+            client.download_entry(
+                element, target_folder,
+                use_title_for_filename=use_title_for_filename,
+                append_id=append_id)
+        except Exception as exc:
+            if queue.fail(worker_id, element, exc) != FAILED:
+                return  # retried later, possibly by another worker
+            new_exception = exc
+        else:
+            queue.complete(worker_id, element)
+        with callback_lock:
+            if new_exception is not None:
+                exceptions.append(new_exception)
+            progress_callback(element, new_exception)
+
+    with _Heartbeat(queue, worker_id, heartbeat_interval) as heartbeat:
+        while True:
+            elements = queue.claim(worker_id, max_workers)
+            if not elements:
+                counts = queue.counts()
+                if counts[PENDING] == 0 and counts[LEASED] == 0:
+                    break
+                time.sleep(poll_interval)
+                continue
+            heartbeat.elements = elements
+            if max_workers <= 1:
+                for element in elements:
+                    download(element)
+            else:
+                from pyarxiv._pool import run_bounded
+                run_bounded(download, elements, max_workers)
+            heartbeat.elements = []
+    return exceptions
@@ -4,13 +4,12 @@ DO NOT USE THIS FILE IF YOU ARE NO MAINTAINER.
 THIS FILE WILL GENERATE PYTHON CODE.
 """
 
-from lxml import html
 import os
-import requests
 import re
 
 ARXIV_CATEGORIES_PAGE = "https://arxiv.org/help/api/user-manual"
 ARXIV_CATEGORIES_FILE_PATH = "../pyarxiv/arxiv_categories.py"
+ARXIV_CATEGORY_TABLE_FILE_PATH = "../pyarxiv/category_table.py"
 ARXIV_CATEGORIES_TESTS_FILE_PATH = "../tests/test_arxiv_categories.py"
 AUTOGENERATED_DISCLAIMER = "\"\"\"\n" \
                            "THIS FILE IS AUTOGENERATED.\n" \
@@ -20,6 +19,8 @@ AUTOGENERATED_DISCLAIMER = "\"\"\"\n" \
 
 
 def scrape_categories():
+    from lxml import html
+    import requests
     p = requests.get(ARXIV_CATEGORIES_PAGE)
     content = html.fromstring(p.content)
     categories_table_caption = content.xpath(
@@ -60,9 +61,20 @@ def create_category_enum(categories):
             "            arxiv_category_map[ArxivCategory.%s],\n" \
             "            '%s')\n" % (
                 escaped_name, e[0])
+    test_class += "\n" \
+        "    def test_reverse_map(self):\n" \
+        "        for member, category in arxiv_category_map.items():\n" \
+        "            self.assertIs(arxiv_category_from_str[category], " \
+        "member)\n"
     enum_file += "\n\n"
     category_mapping_dict += ',\n'.join(category_map_dict_items)
     category_mapping_dict += '\n}\n'
+    category_mapping_dict += \
+        "\n# category -> ArxivCategory, " \
+        "e.g. 'cs.AI' -> ArxivCategory.cs_AI\n" \
+        "arxiv_category_from_str = dict(\n" \
+        "    (category, member)\n" \
+        "    for member, category in arxiv_category_map.items())\n"
     usage_comment = "\n# print(arxiv_category_map[ArxivCategory.cs_AI])\n"
 
     if os.path.isfile(ARXIV_CATEGORIES_FILE_PATH):
@@ -79,6 +91,46 @@ def create_category_enum(categories):
     f.close()
 
 
+def create_category_table(categories):
+    """
+    Writes the categories as plain tuples and dicts,
+    which can be imported without building the ArxivCategory enum.
+    """
+    table_file = AUTOGENERATED_DISCLAIMER + \
+        "# (ArxivCategory member name, category, description)\n" \
+        "arxiv_categories = (\n"
+    table_items = []
+    for e in categories:
+        escaped_name = re.sub('-|\.', '_', e[0])
+        table_items.append("    (%r, %r, %r)"
+                           % (escaped_name, e[0], e[1]))
+    table_file += ',\n'.join(table_items)
+    table_file += "\n)\n\n" \
+        "# ArxivCategory member name -> category, e.g. 'cs_AI' -> 'cs.AI'\n" \
+        "arxiv_category_names = dict(\n" \
+        "    (name, category) for name, category, _ in arxiv_categories)\n" \
+        "\n" \
+        "# category -> ArxivCategory member name, e.g. 'cs.AI' -> 'cs_AI'\n" \
+        "arxiv_category_members = dict(\n" \
+        "    (category, name) for name, category, _ in arxiv_categories)\n" \
+        "\n" \
+        "# archive -> its categories, e.g. 'cs' -> ('cs.AR', 'cs.AI', ...)\n" \
+        "arxiv_archives = {\n"
+    archives = {}
+    for e in categories:
+        archives.setdefault(e[0].split('.')[0], []).append(e[0])
+    table_file += ',\n'.join("    %r: %r" % (archive, tuple(archives[archive]))
+                             for archive in sorted(archives))
+    table_file += "\n}\n"
+
+    if os.path.isfile(ARXIV_CATEGORY_TABLE_FILE_PATH):
+        os.remove(ARXIV_CATEGORY_TABLE_FILE_PATH)
+    f = open(ARXIV_CATEGORY_TABLE_FILE_PATH, 'w')
+    f.write(table_file)
+    f.close()
+
+
 if __name__ == "__main__":
     categories = scrape_categories()
     create_category_enum(categories)
+    create_category_table(categories)
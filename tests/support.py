@@ -0,0 +1,229 @@
+"""
+Fakes and helpers shared by the tests.
+"""
+import gzip
+import io
+import os
+import threading
+from http.server import BaseHTTPRequestHandler
+from urllib.error import HTTPError
+
+SAMPLE_ENTRY = u"""
+  <entry>
+    <id>http://arxiv.org/abs/%(id)s</id>
+    <updated>%(updated)s</updated>
+    <published>2017-09-21T10:00:00Z</published>
+    <title>%(title)s</title>
+    <summary>  A short
+ summary.</summary>
+    <author>
+      <name>A Einstein</name>
+    </author>
+    <author>
+      <name>B Zweistein</name>
+    </author>
+    <arxiv:comment xmlns:arxiv="http://arxiv.org/schemas/atom"
+      >5 pages</arxiv:comment>
+    <link href="http://arxiv.org/abs/%(id)s" rel="alternate"
+      type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/%(id)s" rel="related"
+      type="application/pdf"/>
+    <arxiv:primary_category xmlns:arxiv="http://arxiv.org/schemas/atom"
+      term="cs.AI" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.AI" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>"""
+
+
+def make_feed(ids, updated={}):
+    entries = u''.join(SAMPLE_ENTRY % {
+        'id': i, 'title': 'Paper ' + i,
+        'updated': updated.get(i, '2017-09-22T14:35:17Z')} for i in ids)
+    return (u'<?xml version="1.0" encoding="UTF-8"?>\n'
+            u'<feed xmlns="http://www.w3.org/2005/Atom">'
+            u'<title>ArXiv Query</title>%s</feed>' % entries).encode('utf-8')
+
+
+def http_error(code, headers=None, url='https://arxiv.org/pdf/1.pdf'):
+    return HTTPError(url, code, 'error', headers or {}, io.BytesIO())
+
+
+def run_in_child(fn):
+    """
+    Forks, calls fn() in the child and returns its exit status,
+    0 if fn() returned True.
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os._exit(0 if fn() else 1)
+        except BaseException:
+            os._exit(2)
+    return os.waitpid(pid, 0)[1]
+
+
+class TrickleStream(object):
+    """Returns at most one byte per read, records how much was read."""
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+        self.position = 0
+
+    def read(self, size=-1):
+        chunk = self.data.read(1)
+        self.position += len(chunk)
+        return chunk
+
+
+class FakeTransport(object):
+    """
+    Thread-safe, picklable transport serving canned responses,
+    recording requests.
+
+    :param bytes body: returned by open() for URLs not in bodies,
+                if None these fail with HTTP 404
+    :param dict bodies: URL -> body returned by open()
+    :param dict headers: headers of the responses of open()
+    :param pdf: written to the file by retrieve(), bytes or a function
+                of the URL; nothing is written if None
+    :param dict failures: URL -> exceptions raised by retrieve(); a list
+                is raised one by one by the first calls, a single
+                exception by every call
+    :param dict heads: URL -> headers answered by head(),
+                other URLs fail with HTTP 404
+    """
+
+    def __init__(self, body=b'', bodies=None, headers=None, pdf=None,
+                 failures=None, heads=None):
+        self.body = body
+        self.bodies = bodies or {}
+        self.headers = headers or {}
+        self.pdf = pdf
+        self.failures = failures or {}
+        self.heads = heads or {}
+        # URLs of open(), retrieve() and head(), files of retrieve()
+        self.opened = []
+        self.retrieved = []
+        self.paths = []
+        self.head_requests = []
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def _body(self, url):
+        return self.bodies.get(url, self.body)
+
+    def open(self, url):
+        with self.lock:
+            self.opened.append(url)
+        body = self._body(url)
+        if body is None:
+            raise HTTPError(url, 404, 'Not Found', {}, None)
+        response = io.BytesIO(body)
+        response.headers = dict(self.headers)
+        return response
+
+    def retrieve(self, url, filename):
+        with self.lock:
+            failure = self.failures.get(url)
+            if isinstance(failure, list):
+                failure = failure.pop(0) if failure else None
+        if failure is not None:
+            raise failure
+        with self.lock:
+            self.retrieved.append(url)
+            self.paths.append(filename)
+        if self.pdf is not None:
+            with open(filename, 'wb') as f:
+                f.write(self.pdf(url) if callable(self.pdf) else self.pdf)
+
+    def head(self, url):
+        with self.lock:
+            self.head_requests.append(url)
+        if url not in self.heads:
+            raise HTTPError(url, 404, 'Not Found', {}, None)
+        return self.heads[url]
+
+
+class FeedTransport(FakeTransport):
+    """
+    Serves feeds like the API: the entries of the ids in id_list,
+    or else those of all ids in updated, most recently updated first,
+    paged by start and max_results. Titles are 'Paper <id>'.
+
+    :param dict updated: id -> updated timestamp of the papers
+    :param known: ids id_list queries find, default is any id
+    :type known: List[str]
+    """
+
+    def __init__(self, updated=None, known=None, **kwargs):
+        super(FeedTransport, self).__init__(**kwargs)
+        self.updated = updated if updated is not None else {}
+        self.known = known
+
+    def _body(self, url):
+        if 'id_list=' in url:
+            ids = url.split('id_list=')[1].split('&')[0].split(',')
+            return make_feed([i for i in ids
+                              if self.known is None or i in self.known],
+                             self.updated)
+        ids = sorted(self.updated, key=lambda i: self.updated[i],
+                     reverse=True)
+        start = 0
+        if '&start=' in url:
+            start = int(url.split('&start=')[1].split('&')[0])
+        size = int(url.split('max_results=')[1].split('&')[0])
+        return make_feed(ids[start:start + size], self.updated)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """
+    HTTP/1.1 handler recording the client port of each request.
+    /redirect redirects to /body, /missing is not found, /gzip is
+    compressed if the client accepts it, other paths get 100000 bytes.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.ports.append(self.client_address[1])
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/body')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/missing':
+            self.send_error(404)
+            return
+        body = b'x' * 100000
+        self.send_response(200)
+        if self.path == '/gzip' and \
+                'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.server.ports.append(self.client_address[1])
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/body')
+        elif self.path == '/missing':
+            self.send_response(404)
+        else:
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', '100000')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
@@ -393,5 +393,9 @@ class TestArxivCategories(unittest.TestCase):
             arxiv_category_map[ArxivCategory.quant_ph],
             'quant-ph')
 
+    def test_reverse_map(self):
+        for member, category in arxiv_category_map.items():
+            self.assertIs(arxiv_category_from_str[category], member)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+
+from pyarxiv.authors import (AuthorIndex, author_key, normalize_author,
+                             parse_author)
+from pyarxiv.feed import parse_entries
+from tests.support import make_feed
+
+
+def entry(arxiv_id, *authors):
+    return {'id': 'http://arxiv.org/abs/' + arxiv_id,
+            'authors': [{'name': name} for name in authors]}
+
+
+class TestNormalization(unittest.TestCase):
+    def test_name_order(self):
+        self.assertEqual(parse_author('Geoffrey E. Hinton'),
+                         ('hinton', ['geoffrey', 'e']))
+        self.assertEqual(parse_author('Hinton, Geoffrey E.'),
+                         ('hinton', ['geoffrey', 'e']))
+
+    def test_particles(self):
+        self.assertEqual(parse_author(u'Aäron van den Oord'),
+                         ('van den oord', ['aaron']))
+        self.assertEqual(parse_author('van den Oord, A.'),
+                         ('van den oord', ['a']))
+        self.assertEqual(parse_author('Di Wu'), ('wu', ['di']))
+
+    def test_suffixes(self):
+        self.assertEqual(parse_author('John Smith, Jr.'),
+                         ('smith', ['john']))
+        self.assertEqual(parse_author('Smith, Jr., John'),
+                         ('smith', ['john']))
+        self.assertEqual(parse_author('John Smith III'), ('smith', ['john']))
+
+    def test_diacritics(self):
+        self.assertEqual(author_key(u'Paul Erdős'), 'erdos p')
+        self.assertEqual(author_key(u'Ø. Müller'), author_key('O. Muller'))
+
+    def test_normalize_author(self):
+        self.assertEqual(normalize_author('Hinton, Geoffrey E.'), 'hinton g e')
+        self.assertEqual(normalize_author('Jean-Pierre Serre'), 'serre j p')
+        self.assertEqual(normalize_author('A. Smith-Jones'), 'smith-jones a')
+
+    def test_author_key(self):
+        for name in ('Geoffrey Hinton', 'G. E. Hinton', 'G.E. Hinton',
+                     'Hinton, G.', 'HINTON, GEOFFREY'):
+            self.assertEqual(author_key(name), 'hinton g', name)
+        self.assertEqual(author_key('Hinton'), 'hinton')
+        self.assertEqual(author_key(''), '')
+
+
+class TestAuthorIndex(unittest.TestCase):
+    def setUp(self):
+        self.entries = [
+            entry('1', 'Geoffrey E. Hinton', 'Yann LeCun'),
+            entry('2', 'G. Hinton', u'Aäron van den Oord'),
+            entry('3', 'Hintze, Arend'),
+            entry('4', 'Leslie Hinton'),
+        ]
+        self.index = AuthorIndex(self.entries)
+
+    def ids(self, entries):
+        return [e['id'][-1] for e in entries]
+
+    def test_lookup(self):
+        self.assertEqual(self.ids(self.index.lookup('Hinton, Geoffrey')),
+                         ['1', '2'])
+        self.assertEqual(self.ids(self.index.lookup('A. van den Oord')),
+                         ['2'])
+        self.assertEqual(self.index.lookup('Someone Else'), [])
+
+    def test_lookup_returns_the_entries(self):
+        self.assertIs(self.index.lookup('Y. LeCun')[0], self.entries[0])
+
+    def test_lookup_by_last_name(self):
+        self.assertEqual(self.ids(self.index.lookup('Hinton')),
+                         ['1', '2', '4'])
+
+    def test_prefix(self):
+        self.assertEqual(self.ids(self.index.prefix('Hint')),
+                         ['1', '2', '3', '4'])
+        self.assertEqual(self.ids(self.index.prefix('hintz')), ['3'])
+        self.assertEqual(self.ids(self.index.prefix('van d')), ['2'])
+
+    def test_fuzzy(self):
+        self.assertEqual(self.ids(self.index.fuzzy('Geoffry Hintn')),
+                         ['1', '2'])
+        self.assertEqual(self.index.fuzzy('Zweistein'), [])
+
+    def test_names(self):
+        self.assertEqual(self.index.names('Hinton, G.'),
+                         {'Geoffrey E. Hinton', 'G. Hinton'})
+
+    def test_readding_replaces_entry(self):
+        self.index.add(entry('2', 'Someone Else'))
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.ids(self.index.lookup('G. Hinton')), ['1'])
+        self.assertNotIn('van den oord a', self.index.keys())
+        self.assertEqual(self.ids(self.index.lookup('S. Else')), ['2'])
+
+    def test_query_entries(self):
+        index = AuthorIndex(parse_entries(make_feed(['1', '2'])))
+        self.assertEqual(len(index.lookup('Einstein, Albert')), 2)
+        self.assertEqual(index.keys(), ['einstein a', 'zweistein b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import zipfile
+from urllib.error import HTTPError
+
+from pyarxiv import ArxivClient
+from pyarxiv.cassette import CassetteMiss, CassetteTransport, cassette_key
+from tests.support import FakeTransport, make_feed
+
+if sys.version_info >= (3, 3):  # starting python 3.3
+    from unittest.mock import patch, Mock
+
+else:
+    from mock import patch, Mock
+
+
+class TestCassetteTransport(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'run.zip')
+        self.network = FakeTransport(
+            body=None, bodies={'http://a/1': b'one' * 100,
+                               'http://a/2': b'two'},
+            headers={'Content-Type': 'application/pdf', 'Set-Cookie': 'x'})
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def record(self, *urls):
+        recorder = CassetteTransport(self.path, 'record', self.network)
+        for url in urls:
+            recorder.open(url).read()
+        return recorder
+
+    def test_replays_recorded_responses(self):
+        self.record('http://a/1', 'http://a/2')
+        replay = CassetteTransport(self.path)
+        response = replay.open('http://a/1')
+        self.assertEqual(response.read(), b'one' * 100)
+        self.assertEqual(response.headers,
+                         {'Content-Type': 'application/pdf',
+                          'Content-Length': '300'})
+        self.assertEqual(response.getheader('Content-Length'), '300')
+        self.assertEqual(replay.open('http://a/2').read(), b'two')
+        self.assertEqual(len(self.network.opened), 2)
+
+    def test_cassette_is_compressed_and_indexed_by_url(self):
+        self.record('http://a/1')
+        with zipfile.ZipFile(self.path) as z:
+            info = z.getinfo(cassette_key('http://a/1'))
+        self.assertEqual(info.compress_type, zipfile.ZIP_DEFLATED)
+        self.assertLess(info.compress_size, info.file_size)
+        self.assertEqual(CassetteTransport(self.path).urls(), ['http://a/1'])
+
+    def test_replay_miss_raises(self):
+        self.record('http://a/1')
+        replay = CassetteTransport(self.path)
+        self.assertRaises(CassetteMiss, replay.open, 'http://a/2')
+        self.assertRaises(IOError, CassetteTransport(
+            os.path.join(self.folder, 'missing.zip')).open, 'http://a/1')
+
+    def test_records_each_url_once(self):
+        recorder = self.record('http://a/1', 'http://a/1')
+        self.assertEqual(recorder.urls(), ['http://a/1'])
+
+    def test_auto_records_only_misses(self):
+        self.record('http://a/1')
+        self.network.opened = []
+        auto = CassetteTransport(self.path, 'auto', self.network)
+        self.assertEqual(auto.open('http://a/1').read(), b'one' * 100)
+        self.assertEqual(auto.open('http://a/2').read(), b'two')
+        self.assertEqual(self.network.opened, ['http://a/2'])
+        self.assertIn('http://a/2', CassetteTransport(self.path))
+
+    def test_errors_are_not_recorded(self):
+        recorder = CassetteTransport(self.path, 'auto', self.network)
+        self.assertRaises(HTTPError, recorder.open, 'http://a/404')
+        self.assertNotIn('http://a/404', recorder)
+
+    @patch('pyarxiv.cassette.time.sleep')
+    def test_simulated_latency(self, mock_sleep):
+        self.record('http://a/1')
+        CassetteTransport(self.path).open('http://a/1')
+        mock_sleep.assert_not_called()
+        CassetteTransport(self.path, latency=0.2).open('http://a/1')
+        mock_sleep.assert_called_once_with(0.2)
+
+    def test_retrieve(self):
+        self.record('http://a/2')
+        filename = os.path.join(self.folder, 'two.pdf')
+        CassetteTransport(self.path).retrieve('http://a/2', filename)
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read(), b'two')
+
+    def test_concurrent_recording(self):
+        urls = ['http://a/%i' % i for i in range(20)]
+        self.network.bodies = dict((url, url.encode()) for url in urls)
+        recorder = CassetteTransport(self.path, 'auto', self.network)
+        threads = [threading.Thread(target=lambda u=url: recorder.open(u))
+                   for url in urls]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        replay = CassetteTransport(self.path)
+        self.assertEqual(sorted(replay.urls()), sorted(urls))
+        for url in urls:
+            self.assertEqual(replay.open(url).read(), url.encode())
+
+    def test_pickle(self):
+        self.record('http://a/1')
+        replay = CassetteTransport(self.path)
+        replay.open('http://a/1')
+        copy = pickle.loads(pickle.dumps(replay))
+        self.assertEqual(copy.open('http://a/1').read(), b'one' * 100)
+
+    def test_invalid_mode(self):
+        self.assertRaises(ValueError, CassetteTransport, self.path, 'play')
+
+    def test_client_replays_query_and_download(self):
+        feed = make_feed(['1709.05312v1'])
+        pdf_url = 'https://arxiv.org/pdf/1709.05312v1.pdf'
+        api_url = 'http://export.arxiv.org/api/query?max_results=1' \
+                  '&id_list=1709.05312v1'
+        self.network.bodies = {api_url: feed, pdf_url: b'%PDF'}
+        recording = ArxivClient(transport=CassetteTransport(
+            self.path, 'record', self.network), max_results=1)
+        recording.query(ids=['1709.05312v1'])
+        recording.download_entries(['1709.05312v1'],
+                                   target_folder=self.folder)
+
+        client = ArxivClient(transport=CassetteTransport(self.path),
+                             max_results=1)
+        entries = client.query(ids=['1709.05312v1'])
+        self.assertEqual(entries[0]['id'],
+                         'http://arxiv.org/abs/1709.05312v1')
+        os.remove(os.path.join(self.folder, '1709.05312v1.pdf'))
+        client.download_entries(entries, target_folder=self.folder)
+        with open(os.path.join(self.folder, '1709.05312v1.pdf'), 'rb') as f:
+            self.assertEqual(f.read(), b'%PDF')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from pyarxiv.arxiv_categories import ArxivCategory
+from pyarxiv.categories import (is_category, validate_category,
+                                category_from_str, archive_of,
+                                expand_categories)
+from pyarxiv.category_table import arxiv_archives, arxiv_categories
+
+
+class TestCategories(unittest.TestCase):
+    def test_is_category(self):
+        self.assertTrue(is_category('cs.AI'))
+        self.assertTrue(is_category('hep-th'))
+        self.assertTrue(is_category(ArxivCategory.cs_AI))
+        self.assertFalse(is_category('cs.XY'))
+        self.assertFalse(is_category('cs_AI'))
+
+    def test_validate_category(self):
+        self.assertEqual(validate_category('cs.AI'), 'cs.AI')
+        self.assertEqual(validate_category('q_bio_BM'), 'q-bio.BM')
+        self.assertEqual(validate_category(ArxivCategory.math_AG), 'math.AG')
+        self.assertRaises(ValueError, validate_category, 'cs.XY')
+        self.assertRaises(ValueError, validate_category, None)
+
+    def test_category_from_str(self):
+        self.assertIs(category_from_str('physics.acc-ph'),
+                      ArxivCategory.physics_acc_ph)
+        self.assertRaises(ValueError, category_from_str, 'cs.XY')
+
+    def test_archive_of(self):
+        self.assertEqual(archive_of('cond-mat.soft'), 'cond-mat')
+        self.assertEqual(archive_of('quant-ph'), 'quant-ph')
+
+    def test_archives_cover_all_categories(self):
+        grouped = [c for members in arxiv_archives.values() for c in members]
+        self.assertEqual(sorted(grouped),
+                         sorted(c for _, c, _ in arxiv_categories))
+        for archive, members in arxiv_archives.items():
+            for category in members:
+                self.assertEqual(archive_of(category), archive)
+
+    def test_expand_categories(self):
+        self.assertEqual(expand_categories(['stat.*', 'cs.AI']),
+                         ['stat.AP', 'stat.CO', 'stat.ML', 'stat.ME',
+                          'stat.TH', 'cs.AI'])
+        self.assertEqual(expand_categories(['hep-th.*']), ['hep-th'])
+
+    def test_expand_categories_keeps_order_without_duplicates(self):
+        self.assertEqual(
+            expand_categories([ArxivCategory.stat_ML, 'stat.*', 'rand']),
+            ['stat.ML', 'stat.AP', 'stat.CO', 'stat.ME', 'stat.TH', 'rand'])
+
+    def test_expand_unknown_archive_raises(self):
+        self.assertRaises(ValueError, expand_categories, ['foo.*'])
+
+
+if __name__ == '__main__':
+    unittest.main()
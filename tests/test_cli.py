@@ -0,0 +1,180 @@
+import io
+import json
+import os
+import sys
+import unittest
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+
+from tests.support import make_feed
+
+ACCEPT_ENCODING = {'Accept-Encoding': 'gzip, deflate'}
+
+if sys.version_info >= (3, 3):  # starting python 3.3
+    from unittest.mock import patch, Mock
+
+else:
+    from mock import patch, Mock
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'scripts', 'pyarxiv-cli')
+
+
+def load_cli():
+    loader = SourceFileLoader('pyarxiv_cli', CLI_PATH)
+    module = module_from_spec(spec_from_loader('pyarxiv_cli', loader))
+    loader.exec_module(module)
+    return module
+
+
+cli = load_cli()
+
+
+class TestQueryCommand(unittest.TestCase):
+    @patch('pyarxiv.urlopen')
+    def test_prints_ids(self, mock_urlopen):
+        mock_urlopen.return_value = io.BytesIO(make_feed(['1v1', '2']))
+        with patch('sys.stdout', new_callable=io.StringIO) as out:
+            cli.main(['query', '--categories', 'cs.AI', '-m', '2'])
+        self.assertEqual(out.getvalue(), '1v1\n2\n')
+        mock_urlopen.assert_called_with(
+            'http://export.arxiv.org/api/query?max_results=2'
+            '&search_query=%28cat:cs.AI%29',
+            headers=ACCEPT_ENCODING)
+
+    @patch('pyarxiv.urlopen')
+    def test_accepts_member_names_of_categories(self, mock_urlopen):
+        mock_urlopen.return_value = io.BytesIO(make_feed([]))
+        with patch('sys.stdout', new_callable=io.StringIO):
+            cli.main(['query', '--categories', 'cs_AI', 'math.AG'])
+        self.assertIn('cat:cs.AI+OR+cat:math.AG',
+                      mock_urlopen.call_args[0][0])
+
+    @patch('pyarxiv.urlopen')
+    def test_sort_and_date_range(self, mock_urlopen):
+        mock_urlopen.return_value = io.BytesIO(make_feed([]))
+        with patch('sys.stdout', new_callable=io.StringIO):
+            cli.main(['query', '-c', 'cs.CL', '--sort-by', 'submittedDate',
+                      '--sort-order', 'descending',
+                      '--submitted-after', '2017-09-01'])
+        url = mock_urlopen.call_args[0][0]
+        self.assertIn('submittedDate:%5B201709010000+TO+', url)
+        self.assertIn('&sortBy=submittedDate&sortOrder=descending', url)
+
+    @patch('pyarxiv.urlopen')
+    def test_accepts_archives(self, mock_urlopen):
+        mock_urlopen.return_value = io.BytesIO(make_feed([]))
+        with patch('sys.stdout', new_callable=io.StringIO):
+            cli.main(['query', '--categories', 'stat.*'])
+        self.assertIn('cat:stat.AP+OR+cat:stat.CO',
+                      mock_urlopen.call_args[0][0])
+
+    def test_rejects_unknown_categories(self):
+        with patch('sys.stderr', new_callable=io.StringIO) as err:
+            with self.assertRaises(SystemExit):
+                cli.main(['query', '--categories', 'cs.XY'])
+        self.assertIn("unknown arXiv category 'cs.XY'", err.getvalue())
+
+    @patch('pyarxiv.urlopen')
+    def test_prints_json_lines(self, mock_urlopen):
+        mock_urlopen.return_value = io.BytesIO(make_feed(['1']))
+        with patch('sys.stdout', new_callable=io.StringIO) as out:
+            cli.main(['query', '1', '--format', 'json'])
+        self.assertEqual(json.loads(out.getvalue())['title'], 'Paper 1')
+
+    @patch('pyarxiv.urlopen')
+    def test_prints_selected_fields(self, mock_urlopen):
+        mock_urlopen.return_value = io.BytesIO(make_feed(['1']))
+        with patch('sys.stdout', new_callable=io.StringIO) as out:
+            cli.main(['query', '1', '--format', 'json', '--fields', 'title'])
+        self.assertEqual(json.loads(out.getvalue()),
+                         {'title': 'Paper 1',
+                          'title_detail': {'type': 'text/plain',
+                                           'language': None, 'base': '',
+                                           'value': 'Paper 1'}})
+
+    @patch('pyarxiv.urlopen')
+    def test_profile(self, mock_urlopen):
+        mock_urlopen.return_value = io.BytesIO(make_feed(['1']))
+        with patch('sys.stdout', new_callable=io.StringIO), \
+                patch('sys.stderr', new_callable=io.StringIO) as err:
+            cli.main(['query', '1', '--profile', 'json'])
+        stages = json.loads(err.getvalue())['stages']
+        self.assertEqual(stages['parse']['count'], 1)
+        self.assertIn('http wait', stages)
+
+    def test_rejects_unknown_fields(self):
+        with patch('sys.stderr', new_callable=io.StringIO) as err:
+            with self.assertRaises(SystemExit):
+                cli.main(['query', '1', '--fields', 'id,abstract'])
+        self.assertIn('Unknown fields abstract', err.getvalue())
+
+
+class TestDownloadCommand(unittest.TestCase):
+    def test_read_ids_streams_lines(self):
+        stdin = io.StringIO(u'1 2\n{"id": "3", "title": "t"}\n\n4\n')
+        ids = cli.read_ids(stdin)
+        self.assertEqual(next(ids), '1')
+        self.assertEqual(stdin.tell(), 4)
+        self.assertEqual(list(ids), ['2', {'id': '3', 'title': 't'}, '4'])
+
+    @patch('pyarxiv.ArxivClient.download_entries')
+    def test_passes_options(self, m_download_entries):
+        cli.main(['download', '1', '2', '--jobs', '4', '--silent',
+                  '--rate', '2'])
+        args, kwargs = m_download_entries.call_args
+        self.assertEqual(args[0], ['1', '2'])
+        self.assertEqual(kwargs['max_workers'], 4)
+        self.assertNotIn('retry_policy', kwargs)
+
+    @patch('pyarxiv.ArxivClient.download_entries')
+    def test_retries(self, m_download_entries):
+        cli.main(['download', '1', '--silent', '--retries', '2'])
+        kwargs = m_download_entries.call_args[1]
+        self.assertEqual(kwargs['retry_policy'].max_attempts, 3)
+
+    @patch('pyarxiv.ArxivClient.download_entries')
+    def test_reads_stdin_without_ids(self, m_download_entries):
+        with patch('sys.stdin', io.StringIO(u'1\n2\n')):
+            cli.main(['download', '--silent'])
+            ids = m_download_entries.call_args[0][0]
+            self.assertEqual(list(ids), ['1', '2'])
+
+    @patch('pyarxiv.ArxivClient.download_entries')
+    def test_ignores_terminal_without_ids(self, m_download_entries):
+        stdin = Mock()
+        stdin.isatty.return_value = True
+        with patch('sys.stdin', stdin):
+            cli.main(['download', '--silent'])
+        self.assertEqual(list(m_download_entries.call_args[0][0]), [])
+        stdin.readline.assert_not_called()
+
+    def test_make_client(self):
+        args = Mock(cache_dir=None, cache_ttl=600, rate=4.0, socket=None,
+                    store=None, bandwidth=None, profile=None)
+        client = cli.make_client(args)
+        self.assertEqual(client.limiter.min_interval, 0.25)
+        self.assertIsNone(client.cache)
+
+    @patch('pyarxiv.daemon.DaemonClient.is_running', return_value=True)
+    def test_make_client_finds_daemon_at_default_socket(self, m_running):
+        args = cli.make_parser().parse_args(['query'])
+        with patch.dict('os.environ', {'PYARXIV_SOCKET': '/tmp/d.sock'}):
+            client = cli.make_client(args)
+        self.assertEqual(client.socket_path, '/tmp/d.sock')
+
+    @patch('pyarxiv.daemon.DaemonClient.is_running', return_value=True)
+    def test_make_client_bypasses_daemon_for_local_options(self, m_running):
+        args = cli.make_parser().parse_args(
+            ['query', '--rate=4', '--profile', '--socket=/tmp/d.sock'])
+        stderr = io.StringIO()
+        with patch('sys.stderr', stderr):
+            client = cli.make_client(args)
+        self.assertIsInstance(client, cli.pyarxiv.ArxivClient)
+        self.assertEqual(client.limiter.min_interval, 0.25)
+        self.assertIn('--rate, --profile', stderr.getvalue())
+        self.assertIn('/tmp/d.sock', stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
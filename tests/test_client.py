@@ -0,0 +1,751 @@
+import io
+import os
+import pickle
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import pyarxiv
+from pyarxiv import ArxivClient
+from pyarxiv.cache import DirectoryCache, MemoryCache, SQLiteCache
+from pyarxiv.ratelimit import BandwidthScheduler, RateLimiter
+from tests.support import FakeTransport, make_feed, run_in_child
+
+if sys.version_info >= (3, 3):  # starting python 3.3
+    from unittest.mock import patch, Mock
+
+else:
+    from mock import patch, Mock
+
+
+class TestArxivClient(unittest.TestCase):
+    @patch('feedparser.parse')
+    def test_uses_own_endpoint_and_defaults(self, mock_parse):
+        transport = FakeTransport()
+        client = ArxivClient(transport=transport,
+                             api_url='http://mirror/api?',
+                             max_results=5)
+        client.query(ids=['1'])
+        self.assertEqual(transport.opened,
+                         ['http://mirror/api?max_results=5&id_list=1'])
+
+    @patch('feedparser.parse')
+    def test_cache_avoids_second_request(self, mock_parse):
+        transport = FakeTransport(b'<feed/>')
+        client = ArxivClient(transport=transport, cache=MemoryCache())
+        client.query(ids=['1'])
+        client.query(ids=['1'])
+        self.assertEqual(len(transport.opened), 1)
+        mock_parse.assert_called_with(b'<feed/>')
+
+    def test_limiter_called_before_download(self):
+        limiter = Mock()
+        transport = FakeTransport()
+        client = ArxivClient(transport=transport, limiter=limiter,
+                             pdf_url='http://mirror/pdf/')
+        client.download_entry('1709.05312')
+        limiter.wait.assert_called_once_with()
+        self.assertEqual(transport.retrieved,
+                         ['http://mirror/pdf/1709.05312.pdf'])
+        self.assertEqual(transport.paths, ['./1709.05312.pdf'])
+
+    def test_copy_shares_state_except_overrides(self):
+        client = ArxivClient(cache=MemoryCache())
+        other = client.copy(max_results=3)
+        self.assertIs(other.cache, client.cache)
+        self.assertIs(other.transport, client.transport)
+        self.assertEqual(other.max_results, 3)
+        self.assertEqual(client.max_results, 100)
+
+    def test_pickles(self):
+        client = ArxivClient(cache=MemoryCache(), limiter=RateLimiter(0))
+        client.cache.set('k', b'v')
+        clone = pickle.loads(pickle.dumps(client))
+        self.assertEqual(clone.cache.get('k'), b'v')
+        clone.limiter.wait()
+
+    def test_module_functions_use_default_client(self):
+        old = pyarxiv.get_default_client()
+        client = Mock()
+        try:
+            pyarxiv.set_default_client(client)
+            pyarxiv.query(ids=['1'])
+            self.assertTrue(client.query.called)
+        finally:
+            pyarxiv.set_default_client(old)
+
+    @patch('feedparser.parse')
+    def test_module_functions_use_default_client_settings(self, mock_parse):
+        old = pyarxiv.get_default_client()
+        transport = FakeTransport()
+        folder = tempfile.mkdtemp()
+        try:
+            pyarxiv.set_default_client(ArxivClient(
+                transport=transport, max_results=7, target_folder=folder))
+            pyarxiv.query(ids=['1'])
+            pyarxiv.download_entries(['1709.05312'])
+        finally:
+            pyarxiv.set_default_client(old)
+            shutil.rmtree(folder)
+        self.assertIn('max_results=7', transport.opened[0])
+        self.assertEqual(transport.paths[0],
+                         os.path.join(folder, '1709.05312.pdf'))
+
+
+class TestIterQuery(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeTransport()
+        self.pages = {
+            'api?max_results=2&id_list=a,b,c': make_feed(['a', 'b']),
+            'api?max_results=2&start=2&id_list=a,b,c': make_feed(['c']),
+        }
+        self.transport.open = self.open
+
+    def open(self, url):
+        self.transport.opened.append(url)
+        return io.BytesIO(self.pages[url])
+
+    def test_pages_until_short_page(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        titles = [e['title'] for e in client.iter_query(
+            max_results=10, ids=['a', 'b', 'c'], page_size=2)]
+        self.assertEqual(titles, ['Paper a', 'Paper b', 'Paper c'])
+        self.assertEqual(len(self.transport.opened), 2)
+
+    def test_next_page_requested_lazily(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        entries = client.iter_query(max_results=10, ids=['a', 'b', 'c'],
+                                    page_size=2)
+        next(entries)
+        next(entries)
+        self.assertEqual(len(self.transport.opened), 1)
+
+    def test_caches_consumed_pages(self):
+        client = ArxivClient(transport=self.transport, api_url='api?',
+                             cache=MemoryCache())
+        for _ in range(2):
+            list(client.iter_query(max_results=2, ids=['a', 'b', 'c']))
+        self.assertEqual(len(self.transport.opened), 1)
+
+    def test_wraps_errors(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        with self.assertRaises(pyarxiv.ArxivQueryError):
+            list(client.iter_query(ids=['unknown']))
+
+    def test_fields(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        entries = list(client.iter_query(max_results=10, ids=['a', 'b', 'c'],
+                                         page_size=2, fields=['id']))
+        self.assertEqual(entries, [
+            {'id': 'http://arxiv.org/abs/' + i, 'guidislink': True}
+            for i in 'abc'])
+
+    def test_unknown_fields_raise_immediately(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        with self.assertRaises(ValueError):
+            next(client.iter_query(ids=['a'], fields=['abstract']))
+        self.assertEqual(self.transport.opened, [])
+
+    @patch('feedparser.parse')
+    def test_query_fields_bypass_feedparser(self, mock_parse):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        entries = client.query(max_results=2, ids=['a', 'b', 'c'],
+                               fields=['title'])
+        self.assertEqual([e['title'] for e in entries],
+                         ['Paper a', 'Paper b'])
+        mock_parse.assert_not_called()
+
+
+class TestLookupIds(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeTransport()
+        self.transport.open = self.open
+        self.known = ['1709.05312v1', '1709.05312v2', '1709.00001v1',
+                      'math.GT/0309136v1']
+
+    def open(self, url):
+        self.transport.opened.append(url)
+        requested = url.split('id_list=')[1].split(',')
+        # the API answers unversioned ids with the latest version
+        found = [max(k for k in self.known if k.startswith(i))
+                 for i in requested
+                 if any(k.startswith(i) for k in self.known)]
+        return io.BytesIO(make_feed(found))
+
+    def test_resolves_in_input_order(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        found, missing = client.lookup_ids(
+            ['math.GT/0309136', '1709.00001', 'http://arxiv.org/abs/1709.0'
+             '5312v1', {'id': '1709.05312'}, '1709.99999', None])
+        self.assertEqual([e['id'][21:] for e in found],
+                         ['math.GT/0309136v1', '1709.00001v1',
+                          '1709.05312v1', '1709.05312v2'])
+        self.assertEqual(missing, ['1709.99999', None])
+        self.assertEqual(len(self.transport.opened), 1)
+
+    def test_fields(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        found, missing = client.lookup_ids(['1709.00001', '1709.99999'],
+                                           fields=['title'])
+        self.assertEqual(len(found), 1)
+        self.assertEqual(found[0]['title'], 'Paper 1709.00001v1')
+        self.assertNotIn('authors', found[0])
+        self.assertEqual(missing, ['1709.99999'])
+
+    def test_duplicates_are_requested_once(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        found, missing = client.lookup_ids(['1709.00001', '1709.00001v1'])
+        self.assertEqual(len(found), 2)
+        self.assertEqual(self.transport.opened,
+                         ['api?max_results=2&id_list=1709.00001,1709.00001v1'])
+
+    def test_chunks(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        ids = ['1709.%05i' % i for i in range(25)]
+        found, missing = client.lookup_ids(ids, chunk_size=10)
+        self.assertEqual(len(self.transport.opened), 3)
+        self.assertEqual(len(found), 1)
+        self.assertEqual(len(missing), 24)
+
+    def test_chunks_stay_below_url_limit(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        ids = ['1709.%05i' % i for i in range(1000)]
+        client.lookup_ids(ids, chunk_size=1000)
+        self.assertGreater(len(self.transport.opened), 1)
+        for url in self.transport.opened:
+            self.assertLessEqual(len(url), pyarxiv.MAX_URL_LENGTH)
+        requested = [i for url in self.transport.opened
+                     for i in url.split('id_list=')[1].split(',')]
+        self.assertEqual(requested, ids)
+
+    def test_concurrent_chunks(self):
+        client = ArxivClient(transport=self.transport, api_url='api?')
+        ids = ['1709.%05i' % i for i in range(50)] + self.known
+        found, missing = client.lookup_ids(ids, chunk_size=5, max_workers=4)
+        self.assertEqual(len(self.transport.opened), 11)
+        self.assertEqual([e['id'][21:] for e in found],
+                         ['1709.00001v1'] + self.known)
+
+    @patch('feedparser.parse')
+    def test_uses_cache(self, mock_parse):
+        mock_parse.return_value = Mock(entries=[])
+        client = ArxivClient(transport=self.transport, api_url='api?',
+                             cache=MemoryCache())
+        client.lookup_ids(['1709.00001'])
+        client.lookup_ids(['1709.00001'])
+        self.assertEqual(len(self.transport.opened), 1)
+
+    @patch('pyarxiv.ArxivClient.lookup_ids')
+    def test_module_function(self, mock_lookup_ids):
+        pyarxiv.lookup_ids(['1'], max_workers=3)
+        mock_lookup_ids.assert_called_with(['1'], 100, 3, None)
+
+
+class TestConcurrentDownloads(unittest.TestCase):
+    def test_all_downloaded_and_errors_collected(self):
+        transport = FakeTransport()
+        client = ArxivClient(transport=transport)
+        seen = []
+        exceptions = client.download_entries(
+            iter(['1', '2', None, '3']), max_workers=3,
+            progress_callback=lambda e, exc: seen.append(e))
+        self.assertEqual(len(exceptions), 1)
+        self.assertEqual(sorted(seen, key=str), ['1', '2', '3', None])
+        self.assertEqual(sorted(transport.retrieved),
+                         ['https://arxiv.org/pdf/1.pdf',
+                          'https://arxiv.org/pdf/2.pdf',
+                          'https://arxiv.org/pdf/3.pdf'])
+
+    def test_downloads_overlap(self):
+        barrier = threading.Barrier(2, timeout=5)
+        transport = FakeTransport()
+        transport.retrieve = lambda url, filename: barrier.wait()
+        client = ArxivClient(transport=transport)
+        self.assertEqual(
+            client.download_entries(['1', '2'], max_workers=2), [])
+
+
+class GatedStream(object):
+    """
+    Returns the feed up to the end of its first entry,
+    then waits for gate before returning the rest.
+    """
+
+    def __init__(self, data, gate):
+        split = data.index(b'</entry>') + len(b'</entry>')
+        self.chunks = [data[:split], data[split:]]
+        self.gate = gate
+        self.gate_was_open = None
+
+    def read(self, size=-1):
+        if len(self.chunks) == 1:
+            self.gate_was_open = self.gate.wait(5)
+        return self.chunks.pop(0) if self.chunks else b''
+
+
+class TestDownloadQuery(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_downloads_start_while_query_runs(self):
+        first_download = threading.Event()
+        stream = GatedStream(make_feed(['1', '2', '3']), first_download)
+        transport = FakeTransport()
+        transport.open = lambda url: stream
+
+        def retrieve(url, filename):
+            transport.retrieved.append(url)
+            first_download.set()
+
+        transport.retrieve = retrieve
+        client = ArxivClient(transport=transport)
+        exceptions = client.download_query(self.directory, max_workers=2,
+                                           ids=['1', '2', '3'],
+                                           max_results=3)
+        self.assertEqual(exceptions, [])
+        self.assertTrue(stream.gate_was_open)
+        self.assertEqual(len(transport.retrieved), 3)
+
+    def test_titles_come_from_parsed_entries(self):
+        transport = FakeTransport(make_feed(['1', '2']))
+        client = ArxivClient(transport=transport)
+        client.download_query(self.directory, use_title_for_filename=True,
+                              title='paper', max_results=2,
+                              fields=['published'])
+        self.assertEqual(len(transport.opened), 1)
+        self.assertEqual(
+            sorted(os.path.basename(f) for f in transport.paths),
+            ['Paper_1.pdf', 'Paper_2.pdf'])
+
+    def test_query_error_raised_after_downloads(self):
+        pages = [io.BytesIO(make_feed(['1', '2']))]
+
+        def open_page(url):
+            if not pages:
+                raise IOError('connection reset')
+            return pages.pop()
+
+        transport = FakeTransport()
+        transport.open = open_page
+        client = ArxivClient(transport=transport)
+        with self.assertRaises(pyarxiv.ArxivQueryError):
+            client.download_query(self.directory, title='paper',
+                                  max_results=4, page_size=2)
+        self.assertEqual(len(transport.retrieved), 2)
+
+
+class TestPrefetch(unittest.TestCase):
+    def test_bounded_and_stops_when_closed(self):
+        from pyarxiv._pool import prefetch
+        produced = []
+
+        def produce():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        items = prefetch(produce(), 2)
+        self.assertEqual(next(items), 0)
+        time.sleep(0.05)
+        self.assertLessEqual(len(produced), 4)
+        items.close()
+        self.assertLessEqual(len(produced), 5)
+
+    def test_reraises_after_items(self):
+        from pyarxiv._pool import prefetch
+
+        def produce():
+            yield 1
+            raise KeyError('broken')
+
+        items = prefetch(produce(), 10)
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(KeyError):
+            next(items)
+
+
+class TestDirectoryCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_shared_between_instances(self):
+        DirectoryCache(self.directory).set('http://a', b'body')
+        self.assertEqual(DirectoryCache(self.directory).get('http://a'),
+                         b'body')
+        self.assertIsNone(DirectoryCache(self.directory).get('http://b'))
+
+    def test_ttl(self):
+        cache = DirectoryCache(self.directory, ttl=60)
+        cache.set('http://a', b'body')
+        self.assertEqual(cache.get('http://a'), b'body')
+        path = cache._path('http://a')
+        os.utime(path, (time.time() - 61, time.time() - 61))
+        self.assertIsNone(cache.get('http://a'))
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(len(cache), 2)
+
+    @patch('pyarxiv.cache.time')
+    def test_ttl(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        cache = MemoryCache(ttl=60)
+        cache.set('a', 1)
+        mock_time.monotonic.return_value = 159.0
+        self.assertEqual(cache.get('a'), 1)
+        mock_time.monotonic.return_value = 160.0
+        self.assertIsNone(cache.get('a'))
+
+    def test_concurrent_writers(self):
+        cache = MemoryCache(max_entries=50)
+
+        def write(offset):
+            for i in range(200):
+                cache.set(offset + i, i)
+                cache.get(offset + i - 1)
+
+        threads = [threading.Thread(target=write, args=(1000 * n,))
+                   for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(cache), 50)
+
+
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_shared_between_instances(self):
+        SQLiteCache(self.path).set('http://a', b'body')
+        self.assertEqual(SQLiteCache(self.path).get('http://a'), b'body')
+        self.assertIsNone(SQLiteCache(self.path).get('http://b'))
+
+    @patch('pyarxiv.cache.time.time')
+    def test_evicts_least_recently_used(self, m_time):
+        cache = SQLiteCache(self.path, max_entries=2, touch_interval=1)
+        for now, key in enumerate(['a', 'b']):
+            m_time.return_value = now
+            cache.set(key, key.encode())
+        m_time.return_value = 2
+        cache.get('a')
+        m_time.return_value = 3
+        cache.set('c', b'c')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'a')
+        self.assertEqual(len(cache), 2)
+
+    @patch('pyarxiv.cache.time.time')
+    def test_access_time_updated_lazily(self, m_time):
+        m_time.return_value = 100.0
+        cache = SQLiteCache(self.path, touch_interval=60)
+        cache.set('a', b'1')
+
+        def accessed():
+            with sqlite3.connect(self.path) as db:
+                return db.execute('SELECT accessed FROM entries').fetchone()[0]
+        m_time.return_value = 159.0
+        self.assertEqual(cache.get('a'), b'1')
+        self.assertEqual(accessed(), 100.0)
+        m_time.return_value = 160.0
+        self.assertEqual(cache.get('a'), b'1')
+        self.assertEqual(accessed(), 160.0)
+
+    def test_reads_do_not_wait_for_writers(self):
+        cache = SQLiteCache(self.path)
+        cache.set('a', b'1')
+        writer = sqlite3.connect(self.path, isolation_level=None)
+        writer.execute('BEGIN IMMEDIATE')
+        try:
+            values = []
+            reader = threading.Thread(
+                target=lambda: values.append(cache.get('a')))
+            reader.start()
+            reader.join(5)
+            self.assertEqual(values, [b'1'])
+        finally:
+            writer.execute('ROLLBACK')
+            writer.close()
+            reader.join()
+
+    @patch('pyarxiv.cache.time.time')
+    def test_ttl(self, m_time):
+        m_time.return_value = 100.0
+        cache = SQLiteCache(self.path, ttl=60)
+        cache.set('a', b'1')
+        m_time.return_value = 159.0
+        self.assertEqual(cache.get('a'), b'1')
+        m_time.return_value = 160.0
+        self.assertIsNone(cache.get('a'))
+
+    def test_only_one_caller_loads(self):
+        loads = []
+
+        def load():
+            loads.append(1)
+            time.sleep(0.1)
+            return b'body'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            SQLiteCache(self.path).get_or_set('http://a', load)))
+            for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [b'body'] * 6)
+        self.assertEqual(len(loads), 1)
+
+    def test_stale_value_while_refreshing(self):
+        cache = SQLiteCache(self.path, ttl=-1)
+        cache.set('http://a', b'old')
+        other = SQLiteCache(self.path, ttl=-1)
+        self.assertTrue(other._start_refresh('http://a'))
+        load = Mock(return_value=b'new')
+        self.assertEqual(cache.get_or_set('http://a', load), b'old')
+        load.assert_not_called()
+        other._end_refresh('http://a')
+        self.assertEqual(cache.get_or_set('http://a', load), b'new')
+
+    def test_abandoned_refresh_times_out(self):
+        cache = SQLiteCache(self.path, lock_timeout=0.1)
+        self.assertTrue(cache._start_refresh('http://a'))
+        self.assertFalse(cache._start_refresh('http://a'))
+        self.assertEqual(cache.get_or_set('http://a', lambda: b'body'),
+                         b'body')
+
+    def test_load_errors_release_refresh(self):
+        cache = SQLiteCache(self.path)
+        with self.assertRaises(IOError):
+            cache.get_or_set('http://a', Mock(side_effect=IOError))
+        self.assertTrue(cache._start_refresh('http://a'))
+
+    def test_client_fetch_uses_get_or_set(self):
+        transport = FakeTransport(b'body')
+        cache = SQLiteCache(self.path)
+        client = ArxivClient(transport=transport, cache=cache)
+        self.assertEqual(client.fetch('http://a'), b'body')
+        self.assertEqual(pickle.loads(pickle.dumps(client)).fetch('http://a'),
+                         b'body')
+        self.assertEqual(transport.opened, ['http://a'])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def test_child_opens_own_connection(self):
+        cache = SQLiteCache(self.path)
+        cache.set('a', b'1')
+        self.assertEqual(run_in_child(
+            lambda: cache._db is None and cache.get('a') == b'1'), 0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    @patch('pyarxiv.ratelimit.time')
+    def test_spaces_requests(self, mock_time):
+        mock_time.monotonic.return_value = 10.0
+        limiter = RateLimiter(3.0)
+        limiter.wait()
+        mock_time.sleep.assert_not_called()
+        limiter.wait()
+        mock_time.sleep.assert_called_once_with(3.0)
+
+    def test_per_second(self):
+        self.assertEqual(RateLimiter.per_second(4).min_interval, 0.25)
+        with self.assertRaises(ValueError):
+            RateLimiter.per_second(0)
+
+
+class TestBandwidthScheduler(unittest.TestCase):
+    def grant_order(self, scheduler, mock_time, tickets):
+        """
+        Queues tickets (priority, job) behind a drained bucket,
+        then lets time pass one grant at a time.
+
+        :return: tickets in the order they were granted
+        """
+        order = []
+        threads = []
+        for priority, job in tickets:
+            def take(priority=priority, job=job):
+                scheduler.acquire(10, priority, job)
+                order.append((priority, job))
+            threads.append(threading.Thread(target=take))
+            threads[-1].start()
+            while len(scheduler._waiting) < len(threads):
+                time.sleep(0.001)
+        for granted in range(1, len(threads) + 1):
+            mock_time.monotonic.return_value += 1.0
+            with scheduler._changed:
+                scheduler._changed.notify_all()
+            while len(order) < granted:
+                time.sleep(0.001)
+        for t in threads:
+            t.join()
+        return order
+
+    def frozen_scheduler(self, mock_time):
+        mock_time.monotonic.return_value = 0.0
+        scheduler = BandwidthScheduler(bytes_per_second=10, burst=10)
+        scheduler.acquire(10, job='drain')
+        return scheduler
+
+    def test_unlimited_does_not_block(self):
+        scheduler = BandwidthScheduler()
+        scheduler.acquire(10 ** 9, job='a')
+        self.assertEqual(scheduler.served('a'), 10 ** 9)
+
+    def test_limits_rate(self):
+        scheduler = BandwidthScheduler(bytes_per_second=1000, burst=100)
+        start = time.monotonic()
+        for _ in range(5):
+            scheduler.acquire(100)
+        # the burst and the first debt are free, then 100 bytes per 0.1s
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+    @patch('pyarxiv.ratelimit.time')
+    def test_lower_priority_value_first(self, mock_time):
+        scheduler = self.frozen_scheduler(mock_time)
+        order = self.grant_order(scheduler, mock_time,
+                                 [(5, 'bulk'), (0, 'single')])
+        self.assertEqual(order, [(0, 'single'), (5, 'bulk')])
+
+    @patch('pyarxiv.ratelimit.time')
+    def test_jobs_take_turns(self, mock_time):
+        scheduler = self.frozen_scheduler(mock_time)
+        scheduler._served['old'] = 10 ** 10
+        order = self.grant_order(scheduler, mock_time,
+                                 [(0, 'old'), (0, 'old'),
+                                  (0, 'new'), (0, 'new')])
+        self.assertEqual([job for _, job in order],
+                         ['old', 'new', 'old', 'new'])
+
+    def test_pickles(self):
+        scheduler = BandwidthScheduler(bytes_per_second=100)
+        scheduler.acquire(10, job='a')
+        clone = pickle.loads(pickle.dumps(scheduler))
+        self.assertEqual(clone.served('a'), 10)
+        clone.acquire(10, job='a')
+
+
+class TestByteProgress(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def make_transport(self, body):
+        transport = FakeTransport()
+        transport.open = lambda url: Mock(read=io.BytesIO(body).read,
+                                          headers={'Content-Length':
+                                                   str(len(body))})
+        return transport
+
+    @patch('pyarxiv.DOWNLOAD_CHUNK_SIZE', 4)
+    def test_reports_bytes_per_file(self):
+        client = ArxivClient(transport=self.make_transport(b'%PDF-1.4'))
+        progress = []
+        client.download_entries(['1709.05312'], target_folder=self.folder,
+                                byte_progress_callback=lambda *a:
+                                progress.append(a))
+        self.assertEqual(progress, [('1709.05312', 4, 8),
+                                    ('1709.05312', 8, 8)])
+        with open(self.folder + '/1709.05312.pdf', 'rb') as f:
+            self.assertEqual(f.read(), b'%PDF-1.4')
+
+    @patch('pyarxiv.DOWNLOAD_CHUNK_SIZE', 4)
+    def test_chunks_go_through_scheduler(self):
+        scheduler = Mock()
+        client = ArxivClient(transport=self.make_transport(b'%PDF-1.4'),
+                             bandwidth=scheduler, priority=2, job='sync')
+        client.download_entry('1709.05312', self.folder)
+        scheduler.acquire.assert_called_with(4, 2, 'sync')
+        self.assertEqual(scheduler.acquire.call_count, 2)
+        self.assertIs(client.copy(priority=0).bandwidth, scheduler)
+
+    def test_no_partial_file_on_error(self):
+        response = Mock(headers={})
+        response.read.side_effect = [b'%PDF', IOError('connection reset')]
+        transport = FakeTransport()
+        transport.open = lambda url: response
+        client = ArxivClient(transport=transport)
+        with self.assertRaises(IOError):
+            client.download_entry('1709.05312', self.folder,
+                                  byte_progress_callback=Mock())
+        self.assertEqual(os.listdir(self.folder), [])
+        response.close.assert_called_once_with()
+
+
+class TestFetchPdf(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeTransport()
+        self.transport.open = self.open
+        self.client = ArxivClient(transport=self.transport)
+
+    def open(self, url):
+        self.transport.opened.append(url)
+        return io.BytesIO(b'%PDF-1.4 body')
+
+    def test_fetch_pdf(self):
+        self.assertEqual(self.client.fetch_pdf({'id': 'abs/1709.05312v2'}),
+                         b'%PDF-1.4 body')
+        self.assertEqual(self.transport.opened,
+                         ['https://arxiv.org/pdf/1709.05312v2.pdf'])
+        with self.assertRaises(ValueError):
+            self.client.fetch_pdf({})
+
+    def test_iter_pdf(self):
+        self.assertEqual(list(self.client.iter_pdf('1709.05312', 5)),
+                         [b'%PDF-', b'1.4 b', b'ody'])
+
+    def test_fetch_pdf_into_file_or_buffer(self):
+        sink = io.BytesIO()
+        self.assertEqual(self.client.fetch_pdf_into('1', sink), 13)
+        self.assertEqual(sink.getvalue(), b'%PDF-1.4 body')
+        buffer = bytearray(16)
+        self.client.fetch_pdf_into('1', memoryview(buffer)[2:])
+        self.assertEqual(bytes(buffer[2:15]), b'%PDF-1.4 body')
+        with self.assertRaises(ValueError):
+            self.client.fetch_pdf_into('1', bytearray(4))
+
+    def test_reads_from_store(self):
+        from pyarxiv.store import PdfStore
+        folder = tempfile.mkdtemp()
+        try:
+            path = os.path.join(folder, 'paper.pdf')
+            with open(path, 'wb') as f:
+                f.write(b'%PDF stored')
+            store = PdfStore(os.path.join(folder, 'store'))
+            store.add_file(path, '1709.05312', '1')
+            client = self.client.copy(store=store)
+            self.assertEqual(client.fetch_pdf('1709.05312v1'),
+                             b'%PDF stored')
+            self.assertEqual(self.transport.opened, [])
+        finally:
+            shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import gzip
+import io
+import threading
+import unittest
+import zlib
+from http.server import HTTPServer
+
+import pyarxiv
+from pyarxiv import UrllibTransport
+from pyarxiv.compression import (DecompressingReader, TransferStats,
+                                 decode_response)
+from pyarxiv.feed import iter_entries
+from tests.support import KeepAliveHandler, TrickleStream, make_feed
+
+
+def encoded_response(body, encoding):
+    response = io.BytesIO(body)
+    response.headers = {'Content-Encoding': encoding,
+                        'Content-Length': str(len(body)),
+                        'Content-Type': 'application/atom+xml'}
+    return response
+
+
+def raw_deflate(data):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class TestDecompressingReader(unittest.TestCase):
+    def setUp(self):
+        self.body = make_feed(['%i' % i for i in range(50)])
+
+    def test_encodings(self):
+        for encoding, data in [('gzip', gzip.compress(self.body)),
+                               ('x-gzip', gzip.compress(self.body)),
+                               ('deflate', zlib.compress(self.body)),
+                               ('deflate', raw_deflate(self.body))]:
+            reader = decode_response(encoded_response(data, encoding))
+            self.assertIsInstance(reader, DecompressingReader)
+            self.assertEqual(reader.read(), self.body)
+            self.assertEqual(reader.read(), b'')
+
+    def test_identity_is_passed_through(self):
+        response = io.BytesIO(self.body)
+        self.assertIs(decode_response(response), response)
+        response.headers = {'Content-Encoding': 'identity'}
+        self.assertIs(decode_response(response), response)
+
+    def test_unsupported_encoding(self):
+        self.assertRaises(ValueError, decode_response,
+                          encoded_response(b'', 'br'))
+
+    def test_encoding_headers_are_dropped(self):
+        reader = decode_response(
+            encoded_response(gzip.compress(self.body), 'gzip'))
+        self.assertEqual(reader.headers,
+                         {'Content-Type': 'application/atom+xml'})
+        self.assertEqual(reader.getheader('content-type'),
+                         'application/atom+xml')
+        self.assertIsNone(pyarxiv._content_length(reader))
+
+    def test_reads_in_chunks(self):
+        data = gzip.compress(self.body)
+        reader = decode_response(encoded_response(data, 'gzip'))
+        chunks = []
+        while True:
+            chunk = reader.read(100)
+            if not chunk:
+                break
+            self.assertLessEqual(len(chunk), 100)
+            chunks.append(chunk)
+        self.assertEqual(b''.join(chunks), self.body)
+        self.assertEqual(reader.compressed_bytes, len(data))
+        self.assertEqual(reader.uncompressed_bytes, len(self.body))
+
+    def test_parses_while_streaming(self):
+        data = gzip.compress(self.body)
+        raw = TrickleStream(data)
+        raw.headers = {'Content-Encoding': 'gzip'}
+        entries = iter_entries(decode_response(raw))
+        self.assertEqual(next(entries)['id'], 'http://arxiv.org/abs/0')
+        self.assertLess(raw.position, len(data))
+        self.assertEqual(len(list(entries)), 49)
+
+    def test_stats(self):
+        stats = TransferStats()
+        self.assertIsNone(stats.ratio())
+        data = gzip.compress(self.body)
+        for _ in range(2):
+            decode_response(encoded_response(data, 'gzip'), stats).read()
+        self.assertEqual(stats.responses, 2)
+        self.assertEqual(stats.compressed_bytes, 2 * len(data))
+        self.assertEqual(stats.uncompressed_bytes, 2 * len(self.body))
+        self.assertAlmostEqual(stats.ratio(),
+                               float(len(self.body)) / len(data))
+
+    def test_close_counts_once(self):
+        stats = TransferStats()
+        reader = decode_response(
+            encoded_response(gzip.compress(self.body), 'gzip'), stats)
+        reader.read()
+        reader.close()
+        self.assertEqual(stats.responses, 1)
+
+
+class TestUrllibTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        self.server.ports = []
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = 'http://127.0.0.1:%i/gzip' % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+
+    def test_negotiates_compression(self):
+        transport = UrllibTransport()
+        self.assertEqual(transport.open(self.url).read(), b'x' * 100000)
+        self.assertEqual(transport.stats.responses, 1)
+        self.assertLess(transport.stats.compressed_bytes, 1000)
+
+    def test_compression_can_be_disabled(self):
+        transport = UrllibTransport(compress=False)
+        self.assertEqual(transport.open(self.url).read(), b'x' * 100000)
+        self.assertIsNone(transport.stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
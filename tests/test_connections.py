@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import HTTPServer
+from urllib.error import HTTPError
+
+from pyarxiv.connections import PooledTransport
+from tests.support import KeepAliveHandler, run_in_child
+
+
+class TestPooledTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        self.server.ports = []
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.base = 'http://127.0.0.1:%i' % self.server.server_address[1]
+        self.transport = PooledTransport()
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def test_child_does_not_share_connections(self):
+        self.transport.open(self.base + '/').read()
+        self.assertEqual(run_in_child(lambda: self.transport._idle == {}), 0)
+        self.assertEqual(len(self.transport._idle), 1)
+
+    def test_reuses_connection(self):
+        for _ in range(3):
+            self.assertEqual(len(self.transport.open(self.base + '/').read()),
+                             100000)
+        self.assertEqual(len(set(self.server.ports)), 1)
+
+    def test_follows_redirects(self):
+        self.assertEqual(
+            len(self.transport.open(self.base + '/redirect').read()), 100000)
+
+    def test_decompresses_encoded_responses(self):
+        for _ in range(2):
+            response = self.transport.open(self.base + '/gzip')
+            self.assertEqual(response.read(), b'x' * 100000)
+            self.assertIsNone(response.getheader('Content-Length'))
+        self.assertEqual(len(set(self.server.ports)), 1)
+        self.assertEqual(self.transport.stats.responses, 2)
+        self.assertEqual(self.transport.stats.uncompressed_bytes, 200000)
+        self.assertGreater(self.transport.stats.ratio(), 10)
+
+    def test_compression_can_be_disabled(self):
+        transport = PooledTransport(compress=False)
+        response = transport.open(self.base + '/gzip')
+        self.assertEqual(response.read(), b'x' * 100000)
+        self.assertIsNone(transport.stats)
+        transport.close()
+
+    def test_raises_http_errors(self):
+        with self.assertRaises(HTTPError) as cm:
+            self.transport.open(self.base + '/missing')
+        self.assertEqual(cm.exception.code, 404)
+
+    def test_head(self):
+        for _ in range(2):
+            headers = self.transport.head(self.base + '/redirect')
+            self.assertEqual(headers['Content-Length'], '100000')
+            self.assertEqual(headers['ETag'], '"v1"')
+        self.assertEqual(len(set(self.server.ports)), 1)
+        with self.assertRaises(HTTPError) as cm:
+            self.transport.head(self.base + '/missing')
+        self.assertEqual(cm.exception.code, 404)
+
+    def test_retrieve(self):
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'a.pdf')
+            self.transport.retrieve(self.base + '/', filename)
+            self.assertEqual(os.path.getsize(filename), 100000)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from pyarxiv import ArxivClient
+from pyarxiv.cache import MemoryCache
+from pyarxiv.daemon import ArxivDaemon, DaemonClient, DaemonError
+from pyarxiv.retry import DownloadReport, RetryPolicy
+from tests.support import FakeTransport, make_feed
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.directory, 'd.sock')
+        self.transport = FakeTransport(make_feed(['1', '2']))
+        client = ArxivClient(transport=self.transport, cache=MemoryCache())
+        self.server = ArxivDaemon(self.socket_path, client)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.client = DaemonClient(self.socket_path)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def test_socket_private_and_removed(self):
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o077, 0)
+        self.assertTrue(self.client.is_running())
+
+    def test_refuses_second_daemon(self):
+        with self.assertRaises(DaemonError):
+            ArxivDaemon(self.socket_path, ArxivClient())
+
+    def test_query_shares_cache_between_clients(self):
+        for _ in range(2):
+            entries = DaemonClient(self.socket_path).query(ids=['1', '2'])
+            self.assertEqual([e['title'] for e in entries],
+                             ['Paper 1', 'Paper 2'])
+        self.assertEqual(len(self.transport.opened), 1)
+
+    def test_query_error(self):
+        with self.assertRaises(DaemonError):
+            self.client.query(no_such_argument=1)
+
+    def test_download_streams_elements(self):
+        seen = []
+        exceptions = self.client.download_entries(
+            iter(['1', None, '2']), target_folder=self.directory,
+            progress_callback=lambda e, exc: seen.append((e, exc is None)))
+        self.assertEqual(len(exceptions), 1)
+        self.assertEqual(seen, [('1', True), (None, False), ('2', True)])
+        self.assertEqual(self.transport.retrieved[0],
+                         'https://arxiv.org/pdf/1.pdf')
+        self.assertEqual(self.transport.paths[0],
+                         os.path.join(self.directory, '1.pdf'))
+
+    def test_download_forwards_retry_policy_and_fills_report(self):
+        report = DownloadReport()
+        exceptions = self.client.download_entries(
+            ['1', None], target_folder=self.directory,
+            retry_policy=RetryPolicy(max_attempts=2), report=report)
+        self.assertEqual(len(exceptions), 1)
+        self.assertEqual(report.succeeded, ['1'])
+        self.assertEqual([e for e, _ in report.failed], [None])
+
+
+class TestDaemonClient(unittest.TestCase):
+    def test_not_running(self):
+        client = DaemonClient('/nonexistent/pyarxiv.sock')
+        self.assertFalse(client.is_running())
+        with self.assertRaises(DaemonError):
+            client.query(ids=['1'])
+
+
+if __name__ == "__main__":
+    unittest.main()
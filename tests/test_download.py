@@ -21,7 +21,7 @@ class TestDownloadEntry(unittest.TestCase):
             download_entry('1',
                            target_folder='/\/\/\/\/\\\\\\////\\\\/')
 
-    @patch('pyarxiv.query')
+    @patch('pyarxiv.ArxivClient.query')
     @patch('pyarxiv.retrieve')
     def test_title_for_filename_exception(self,
                                           m_retrieve,
@@ -38,7 +38,7 @@ class TestDownloadEntry(unittest.TestCase):
             'https://arxiv.org/pdf/1709.05312.pdf',
             './1709.05312.pdf')
 
-    @patch('pyarxiv.query')
+    @patch('pyarxiv.ArxivClient.query')
     @patch('pyarxiv.retrieve')
     def test_query_extracts_title(self,
                                   m_retrieve,
@@ -50,7 +50,7 @@ class TestDownloadEntry(unittest.TestCase):
             'https://arxiv.org/pdf/1709.05312.pdf',
             './test_this_title_works.pdf')
 
-    @patch('pyarxiv.query')
+    @patch('pyarxiv.ArxivClient.query')
     @patch('pyarxiv.retrieve')
     def test_append_id(self,
                        m_retrieve,
@@ -84,7 +84,7 @@ class TestDownloadEntry(unittest.TestCase):
 
 
 class TestDownloadMultipleEntries(unittest.TestCase):
-    @patch('pyarxiv.download_entry')
+    @patch('pyarxiv.ArxivClient.download_entry')
     def test_proress_callback(self,
                               m_download_entry):
         def test_method_correctly_iterates(id_used, exception):
@@ -96,7 +96,7 @@ class TestDownloadMultipleEntries(unittest.TestCase):
                              progress_callback=test_method_correctly_iterates),
             [])
 
-    @patch('pyarxiv.download_entry')
+    @patch('pyarxiv.ArxivClient.download_entry')
     def test_exceptions_correctly_logged(self,
                                          m_download_entry):
         def side_effect(arg, arg2,
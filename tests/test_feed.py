@@ -0,0 +1,98 @@
+import io
+import sys
+import unittest
+
+from pyarxiv import convert_to_native_types
+from pyarxiv.feed import FIELDS, iter_entries, parse_entries
+from tests.support import TrickleStream, make_feed
+
+if sys.version_info >= (3, 3):  # starting python 3.3
+    from unittest.mock import patch
+
+else:
+    from mock import patch
+
+
+class TestParseEntries(unittest.TestCase):
+    def test_feedparser_compatible_keys(self):
+        entry = parse_entries(make_feed(['1709.05312v1']))[0]
+        self.assertEqual(entry['id'], 'http://arxiv.org/abs/1709.05312v1')
+        self.assertEqual(entry['title'], 'Paper 1709.05312v1')
+        self.assertEqual(entry['title_detail']['value'], entry['title'])
+        self.assertEqual([a['name'] for a in entry['authors']],
+                         ['A Einstein', 'B Zweistein'])
+        self.assertEqual([t['term'] for t in entry['tags']],
+                         ['cs.AI', 'cs.LG'])
+        self.assertEqual(entry['arxiv_primary_category']['term'], 'cs.AI')
+        self.assertEqual(entry['arxiv_comment'], '5 pages')
+        self.assertEqual(entry['link'], 'http://arxiv.org/abs/1709.05312v1')
+
+    def test_same_as_feedparser(self):
+        import feedparser
+        raw = make_feed(['1709.05312v1'])
+        expected = feedparser.parse(raw).entries[0]
+        entry = parse_entries(raw)[0]
+        self.assertEqual(sorted(entry), sorted(expected))
+        for key in expected:
+            self.assertEqual(entry[key], expected[key], key)
+
+    def test_convertible_to_native_types(self):
+        entry = parse_entries(make_feed(['1']))[0]
+        convert_to_native_types(entry)
+        self.assertEqual(entry['tags'], ['cs.AI', 'cs.LG'])
+        self.assertEqual(entry['summary'], 'A short summary.')
+        self.assertEqual(entry['published'].year, 2017)
+
+    def test_empty_feed(self):
+        self.assertEqual(parse_entries(make_feed([])), [])
+
+    def test_fields(self):
+        entry = parse_entries(make_feed(['1']), fields=['id', 'title'])[0]
+        self.assertEqual(sorted(entry),
+                         ['guidislink', 'id', 'title', 'title_detail'])
+        entry = parse_entries(make_feed(['1']), fields=['tags'])[0]
+        self.assertEqual(entry, {'tags': [
+            {'term': 'cs.AI', 'scheme': 'http://arxiv.org/schemas/atom',
+             'label': None},
+            {'term': 'cs.LG', 'scheme': 'http://arxiv.org/schemas/atom',
+             'label': None}]})
+
+    def test_all_fields_same_as_default(self):
+        raw = make_feed(['1709.05312v1'])
+        self.assertEqual(parse_entries(raw, fields=FIELDS),
+                         parse_entries(raw))
+
+    @patch('pyarxiv.feed._parse_date')
+    def test_skips_dates_not_asked_for(self, mock_parse_date):
+        parse_entries(make_feed(['1', '2']), fields=['id'])
+        mock_parse_date.assert_not_called()
+
+    def test_unknown_fields(self):
+        self.assertRaises(ValueError, parse_entries, make_feed(['1']),
+                          ['id', 'abstract'])
+
+    def test_convert_fields(self):
+        entry = parse_entries(make_feed(['1']),
+                              fields=['title', 'tags', 'updated'])[0]
+        convert_to_native_types(entry, fields=['title', 'tags', 'updated'])
+        self.assertEqual(entry['tags'], ['cs.AI', 'cs.LG'])
+        self.assertEqual(entry['updated'].year, 2017)
+        self.assertNotIn('published', entry)
+
+
+class TestIterEntries(unittest.TestCase):
+    def test_yields_before_feed_is_complete(self):
+        feed = make_feed(['1', '2'])
+        stream = TrickleStream(feed)
+        first = next(iter_entries(stream))
+        self.assertEqual(first['title'], 'Paper 1')
+        self.assertLess(stream.position, len(feed))
+
+    def test_all_entries(self):
+        stream = io.BytesIO(make_feed(['1', '2', '3']))
+        self.assertEqual([e['title'] for e in iter_entries(stream, 7)],
+                         ['Paper 1', 'Paper 2', 'Paper 3'])
+
+
+if __name__ == "__main__":
+    unittest.main()
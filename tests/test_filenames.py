@@ -0,0 +1,177 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from pyarxiv import ArxivClient, make_filename_safe
+from pyarxiv.filenames import FilenamePlanner
+from tests.support import FakeTransport, FeedTransport
+
+
+def old_make_filename_safe(filename):
+    return "".join([c if c.isalnum() or c in '.' else '_' for c in filename])
+
+
+def entry(arxiv_id, title):
+    return {'id': 'http://arxiv.org/abs/' + arxiv_id, 'title': title}
+
+
+def names(transport):
+    return [os.path.basename(path) for path in transport.paths]
+
+
+class TestMakeFilenameSafe(unittest.TestCase):
+    def test_same_as_character_loop(self):
+        for name in (u'A new approach: 3.5 ways/to\nparse', u'Erdős–Rényi',
+                     u'über_ämter', u'x́y', u'日本語 タイトル', u'a\tb$c',
+                     u'math-ph/0701001v2', u'Ⅸ ² ٠'):
+            self.assertEqual(make_filename_safe(name),
+                             old_make_filename_safe(name), name)
+
+
+class TestFilenamePlanner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.client = ArxivClient()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def planner(self, **kwargs):
+        kwargs.setdefault('use_title_for_filename', True)
+        return FilenamePlanner(self.client, self.directory, **kwargs)
+
+    def test_appends_ids_only_on_collisions(self):
+        planner = self.planner()
+        names = [name for _, name, _ in planner.plan([
+            entry('1v1', 'Introduction'), entry('2v1', 'Other'),
+            entry('3v1', 'introduction'), entry('1v1', 'Introduction'),
+            entry('4v2', 'Introduction')])]
+        self.assertEqual(names, ['Introduction', 'Other', 'introduction3v1',
+                                 'Introduction', 'Introduction4v2'])
+
+    def test_suffixes_if_id_name_taken(self):
+        planner = self.planner()
+        self.assertEqual(planner.name(entry('1v1', 'T3v1')), 'T3v1')
+        self.assertEqual(planner.name(entry('2v1', 'T')), 'T')
+        self.assertEqual(planner.name(entry('3v1', 'T')), 'T3v1_2')
+        self.assertEqual(planner.name(entry('2v1', 'T')), 'T')
+        self.assertEqual(planner.name(entry('5v1', 'T3v1')), 'T3v15v1')
+
+    def test_ids_and_append_id(self):
+        self.assertEqual(self.planner(use_title_for_filename=False).name(
+            'math-ph/0701001v2'), 'math_ph_0701001v2')
+        planner = self.planner(append_id=True)
+        self.assertEqual(planner.name(entry('1v1', 'T')), 'T1v1')
+        self.assertEqual(planner.name(entry('2v1', 'T')), 'T2v1')
+
+    def test_plan_is_lazy_and_reports_errors(self):
+        consumed = []
+
+        def elements():
+            for e in [entry('1v1', 'A'), {'title': 'no id'}]:
+                consumed.append(e)
+                yield e
+
+        plan = self.planner().plan(elements())
+        self.assertEqual(next(plan)[1], 'A')
+        self.assertEqual(len(consumed), 1)
+        element, name, error = next(plan)
+        self.assertIsNone(name)
+        self.assertIsInstance(error, ValueError)
+
+    def test_pickles(self):
+        planner = self.planner()
+        planner.name(entry('1v1', 'T'))
+        copy = pickle.loads(pickle.dumps(planner))
+        self.assertEqual(copy.name(entry('2v1', 'T')), 'T2v1')
+
+    def test_reserve(self):
+        open(os.path.join(self.directory, 'Taken.pdf'), 'wb').close()
+        with open(os.path.join(self.directory, 'Mine2v1.pdf'), 'wb') as f:
+            f.write(b'%PDF')
+        planner = self.planner(reserve=True)
+        self.assertEqual(planner.name(entry('1v1', 'Taken')), 'Taken1v1')
+        self.assertEqual(planner.name(entry('2v1', 'Mine')), 'Mine')
+        self.assertEqual(planner.name(entry('3v1', 'Mine')), 'Mine3v1')
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['Mine.pdf', 'Mine2v1.pdf', 'Mine3v1.pdf',
+                          'Taken.pdf', 'Taken1v1.pdf'])
+        other = self.planner(reserve=True)
+        self.assertEqual(other.name(entry('2v1', 'Mine')), 'Mine2v1')
+        planner.release('Taken1v1')
+        self.assertFalse(os.path.exists(planner.path('Taken1v1')))
+        planner.release('Mine2v1')
+        self.assertTrue(os.path.exists(planner.path('Mine2v1')))
+
+
+class TestDownloadEntriesNames(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_concurrent_downloads_get_distinct_names(self):
+        entries = [entry('%iv1' % i, 'Title %i' % (i % 3))
+                   for i in range(12)]
+        transport = FakeTransport()
+        client = ArxivClient(transport=transport)
+        self.assertEqual(client.download_entries(
+            entries, self.directory, use_title_for_filename=True,
+            max_workers=4), [])
+        self.assertEqual(len(set(names(transport))), 12)
+        self.assertIn('Title_0.pdf', names(transport))
+        self.assertIn('Title_03v1.pdf', names(transport))
+
+    def test_does_not_overwrite_other_files(self):
+        with open(os.path.join(self.directory, 'Title.pdf'), 'wb') as f:
+            f.write(b'%PDF other')
+        transport = FakeTransport()
+        client = ArxivClient(transport=transport)
+        client.download_entries([entry('1v1', 'Title')], self.directory,
+                                use_title_for_filename=True)
+        self.assertEqual(names(transport), ['Title1v1.pdf'])
+        with open(os.path.join(self.directory, 'Title.pdf'), 'rb') as f:
+            self.assertEqual(f.read(), b'%PDF other')
+
+    def test_failed_download_releases_name(self):
+        def fail(url, filename):
+            with open(filename, 'wb') as f:
+                f.write(b'%PD')
+            raise IOError('connection reset')
+        transport = FakeTransport()
+        transport.retrieve = fail
+        client = ArxivClient(transport=transport)
+        exceptions = client.download_entries(
+            [entry('1v1', 'Title')], self.directory,
+            use_title_for_filename=True)
+        self.assertEqual(len(exceptions), 1)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_titles_of_ids_looked_up_in_one_request(self):
+        transport = FeedTransport()
+        client = ArxivClient(transport=transport, api_url='api?')
+        self.assertEqual(client.download_entries(
+            ['1v1', '2v1', '1v1', '3v1'], self.directory,
+            use_title_for_filename=True), [])
+        self.assertEqual(transport.opened,
+                         ['api?max_results=3&id_list=1v1,2v1,3v1'])
+        self.assertEqual(names(transport),
+                         ['Paper_1v1.pdf', 'Paper_2v1.pdf',
+                          'Paper_1v1.pdf', 'Paper_3v1.pdf'])
+
+    def test_missing_title_fails_without_another_request(self):
+        transport = FeedTransport(known=['1v1'])
+        client = ArxivClient(transport=transport, api_url='api?')
+        exceptions = client.download_entries(
+            ['1v1', '9v1'], self.directory, use_title_for_filename=True)
+        self.assertEqual(len(exceptions), 1)
+        self.assertIn('9v1', str(exceptions[0]))
+        self.assertEqual(len(transport.opened), 1)
+        self.assertEqual(names(transport), ['Paper_1v1.pdf'])
+
+
+if __name__ == '__main__':
+    unittest.main()
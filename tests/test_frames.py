@@ -0,0 +1,128 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyarxiv.feed import parse_entries
+from pyarxiv.snapshot import Snapshot, write_snapshot
+from tests.support import make_feed
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+if pandas is not None:
+    from pyarxiv.frames import filter_frames, papers_per_month, \
+        to_frames, top_authors
+
+
+def make_entries():
+    entries = parse_entries(make_feed(
+        ['1709.05312v1', '1710.00001v2', '1710.00002v1'],
+        updated={'1710.00002v1': '2017-10-03T10:00:00Z'}))
+    entries[1]['published'] = '2017-10-02T09:00:00Z'
+    entries[1]['summary'] = 'A Transformer for parsing'
+    entries[1]['tags'] = [{'term': 'math.AG'}]
+    del entries[1]['arxiv_primary_category']
+    entries[2]['published'] = '2017-10-03T09:00:00Z'
+    entries[2]['authors'] = [{'name': 'Einstein, Albert'}]
+    return entries
+
+
+@unittest.skipIf(pandas is None, 'needs pandas')
+class TestToFrames(unittest.TestCase):
+    def test_columns(self):
+        frames = to_frames(make_entries())
+        papers = frames.papers
+        self.assertEqual(list(papers['arxiv_id']),
+                         ['1709.05312', '1710.00001', '1710.00002'])
+        self.assertEqual(list(papers['version']), [1, 2, 1])
+        self.assertTrue(pandas.api.types.is_datetime64_any_dtype(
+            papers['published']))
+        self.assertEqual(str(papers['published'].dt.tz), 'UTC')
+        self.assertEqual(papers['updated'][2],
+                         pandas.Timestamp('2017-10-03 10:00', tz='UTC'))
+        self.assertEqual(list(papers['primary_category']),
+                         ['cs.AI', 'math.AG', 'cs.AI'])
+        self.assertEqual(str(frames.tags['category'].dtype), 'category')
+        self.assertEqual(len(frames.tags), 5)
+        self.assertEqual(list(frames.authors['key'][-3:]),
+                         ['einstein a', 'zweistein b', 'einstein a'])
+        self.assertEqual(list(frames.authors['position'][:2]), [0, 1])
+
+    def test_converted_entries_and_snapshots(self):
+        from pyarxiv import convert_to_native_types
+        entries = make_entries()
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'corpus.snap')
+            write_snapshot(path, entries)
+            with Snapshot(path) as snapshot:
+                from_snapshot = to_frames(snapshot)
+            for entry in entries:
+                convert_to_native_types(entry)
+            from_converted = to_frames(entries)
+        finally:
+            shutil.rmtree(directory)
+        for frames in (from_snapshot, from_converted):
+            self.assertEqual(list(frames.papers['published']),
+                             list(to_frames(make_entries()).papers[
+                                 'published']))
+            self.assertEqual(len(frames.authors), 5)
+
+    def test_missing_dates(self):
+        frames = to_frames([{'id': 'http://arxiv.org/abs/1709.05312'}])
+        self.assertTrue(pandas.isna(frames.papers['published'][0]))
+        self.assertTrue(pandas.isna(frames.papers['version'][0]))
+        self.assertEqual(len(frames.tags), 0)
+
+
+@unittest.skipIf(pandas is None, 'needs pandas')
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.frames = to_frames(make_entries())
+
+    def ids(self, frames):
+        return list(frames.papers['arxiv_id'])
+
+    def test_filter_dates(self):
+        after = filter_frames(self.frames, published_after='2017-10-01')
+        self.assertEqual(self.ids(after), ['1710.00001', '1710.00002'])
+        self.assertEqual(set(after.tags['arxiv_id']), set(self.ids(after)))
+        before = filter_frames(
+            self.frames, published_before=datetime.datetime(2017, 10, 3))
+        self.assertEqual(self.ids(before), ['1709.05312', '1710.00001'])
+
+    def test_filter_categories_and_keyword(self):
+        self.assertEqual(
+            self.ids(filter_frames(self.frames, categories=['math.*'])),
+            ['1710.00001'])
+        self.assertEqual(
+            self.ids(filter_frames(self.frames, keyword='transformer')),
+            ['1710.00001'])
+        self.assertIs(filter_frames(self.frames, categories=['cs.AI',
+                                                             'math.AG']),
+                      self.frames)
+
+    def test_papers_per_month(self):
+        counts = papers_per_month(self.frames)
+        self.assertEqual([str(month) for month in counts.index],
+                         ['2017-09', '2017-10'])
+        self.assertEqual(counts.loc[pandas.Period('2017-10', 'M'), 'cs.AI'],
+                         1)
+        self.assertEqual(counts.loc[pandas.Period('2017-10', 'M'),
+                                    'math.AG'], 1)
+        primary = papers_per_month(self.frames, primary_only=True)
+        self.assertNotIn('cs.LG', primary.columns)
+
+    def test_top_authors(self):
+        top = top_authors(self.frames, n=1)
+        self.assertEqual(list(top['key']), ['einstein a'])
+        self.assertEqual(list(top['name']), ['A Einstein'])
+        self.assertEqual(list(top['papers']), [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import pyarxiv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI_PATH = os.path.join(REPO_ROOT, 'scripts', 'pyarxiv-cli')
+HEAVY_MODULES = ['feedparser', 'dateutil.parser', 'urllib.request',
+                 'pyarxiv.arxiv_categories']
+# Generous, so that slow CI machines do not fail;
+# importing pyarxiv eagerly took ~80ms on a laptop.
+MAX_IMPORT_MICROSECONDS = 40000
+
+
+def import_times(*args):
+    """
+    Runs python -X importtime with args.
+
+    :return: cumulative import time in microseconds by module name
+    :rtype: dict
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = REPO_ROOT
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + list(args),
+                             env=env, cwd=REPO_ROOT,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             universal_newlines=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_import_is_lazy(self):
+        times = import_times('-c', 'import pyarxiv')
+        self.assertIn('pyarxiv', times)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_import_is_fast(self):
+        times = import_times('-c', 'import pyarxiv')
+        self.assertLess(times['pyarxiv'], MAX_IMPORT_MICROSECONDS)
+
+    def test_category_table_does_not_build_enum(self):
+        times = import_times('-c', 'import pyarxiv.category_table')
+        self.assertNotIn('pyarxiv.arxiv_categories', times)
+
+    def test_category_to_str_does_not_build_enum(self):
+        times = import_times('-c', 'import pyarxiv; '
+                             'from collections import namedtuple; '
+                             'member = namedtuple("M", "name")("cs_AI"); '
+                             'assert pyarxiv.category_to_str(member) '
+                             '== "cs.AI"')
+        self.assertNotIn('pyarxiv.arxiv_categories', times)
+
+    def test_cli_help_is_lazy(self):
+        times = import_times(CLI_PATH, '--help')
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+
+
+class TestLazyAttributes(unittest.TestCase):
+    def test_categories_still_importable_from_package(self):
+        from pyarxiv import ArxivCategory, arxiv_category_map
+        self.assertEqual(arxiv_category_map[ArxivCategory.cs_AI], 'cs.AI')
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            pyarxiv.does_not_exist
+
+    def test_category_table_matches_enum(self):
+        from pyarxiv.arxiv_categories import ArxivCategory, \
+            arxiv_category_map
+        from pyarxiv.category_table import arxiv_category_names
+        self.assertEqual(len(arxiv_category_names), len(ArxivCategory))
+        for member in ArxivCategory:
+            self.assertEqual(arxiv_category_names[member.name],
+                             arxiv_category_map[member])
+
+
+if __name__ == "__main__":
+    unittest.main()
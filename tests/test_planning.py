@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pyarxiv
+from pyarxiv import ArxivClient, UrllibTransport
+from pyarxiv.retry import DownloadReport
+from pyarxiv.store import PdfStore
+from tests.support import FakeTransport
+
+if sys.version_info >= (3, 3):  # starting python 3.3
+    from unittest.mock import patch, Mock
+
+else:
+    from mock import patch, Mock
+
+
+def url(arxiv_id):
+    return 'https://arxiv.org/pdf/%s.pdf' % arxiv_id
+
+
+class TestPlanDownloads(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeTransport(pdf=b'%PDF', heads={
+            url('1v1'): {'Content-Length': '100', 'ETag': '"a"'},
+            url('2v1'): {'Content-Length': '300',
+                         'Last-Modified': 'Mon, 02 Oct 2017 09:00:00 GMT'},
+            url('3'): {}})
+        self.client = ArxivClient(transport=self.transport)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def synced_state(self, plan):
+        report = DownloadReport()
+        self.client.download_entries(plan.to_download(), self.directory,
+                                     report=report)
+        return plan.state(report)
+
+    def test_orders_by_size(self):
+        plan = self.client.plan_downloads(['1v1', '3', '2v1', None, '4'],
+                                          max_workers=3)
+        self.assertEqual(plan.to_download(), ['2v1', '1v1', '3', '4'])
+        self.assertEqual(plan.invalid, [None])
+        self.assertEqual(plan.total_bytes, 400)
+        self.assertEqual([e for e, _ in plan.errors()], ['4'])
+        self.assertEqual(plan.errors()[0][1].code, 404)
+        self.assertEqual(plan.estimate_seconds(100), 4.0)
+        self.assertEqual(plan.estimate_seconds(100, max_workers=2,
+                                               seconds_per_file=1.0), 6.0)
+        self.assertIn('4 to download (400 bytes)', repr(plan))
+
+    def test_skips_unchanged(self):
+        state = json.loads(json.dumps(self.synced_state(
+            self.client.plan_downloads(['1v1', '2v1', '3']))))
+        self.assertEqual(sorted(state), ['1v1', '2v1'])
+        self.transport.heads[url('1v1')] = {'Content-Length': '120',
+                                            'ETag': '"b"'}
+        plan = self.client.plan_downloads(['1v1', '2v1', '3'], known=state)
+        self.assertEqual(plan.to_download(), ['1v1', '3'])
+        self.assertEqual(plan.unchanged(), ['2v1'])
+        self.assertEqual(plan.total_bytes, 120)
+
+    def test_changed_size_without_etag(self):
+        state = self.synced_state(self.client.plan_downloads(['2v1']))
+        self.transport.heads[url('2v1')]['Content-Length'] = '301'
+        plan = self.client.plan_downloads(['2v1'], known=state)
+        self.assertEqual(plan.to_download(), ['2v1'])
+
+    def test_state_leaves_out_failed_downloads(self):
+        plan = self.client.plan_downloads(['1v1', '2v1'])
+        report = DownloadReport()
+        report.add('1v1')
+        report.add('2v1', IOError('disk full'))
+        self.assertEqual(sorted(plan.state(report)), ['1v1'])
+        state = plan.state(DownloadReport())
+        self.assertEqual(state, {})
+        plan = self.client.plan_downloads(['1v1', '2v1'],
+                                          known=plan.state(report))
+        self.assertEqual(plan.to_download(), ['2v1'])
+        self.assertEqual(sorted(plan.state(DownloadReport())), ['1v1'])
+
+    def test_store_needs_no_request(self):
+        client = self.client.copy(
+            store=PdfStore(os.path.join(self.directory, 'store')))
+        client.download_entry('1v1', self.directory)
+        plan = client.plan_downloads(['1v1', '2v1'])
+        self.assertEqual(plan.unchanged(), ['1v1'])
+        self.assertEqual(self.transport.head_requests, [url('2v1')])
+
+    def test_transport_without_head(self):
+        client = ArxivClient(transport=Mock(spec=['open', 'retrieve']))
+        with self.assertRaises(ValueError):
+            client.plan_downloads(['1'])
+
+    @patch('pyarxiv.ArxivClient.plan_downloads')
+    def test_module_function(self, m_plan):
+        pyarxiv.plan_downloads(['1'], known={})
+        m_plan.assert_called_once_with(['1'], 8, {})
+
+
+class TestUrllibTransportHead(unittest.TestCase):
+    @patch('pyarxiv.urlopen')
+    def test_head(self, m_urlopen):
+        m_urlopen.return_value.headers = {'Content-Length': '5'}
+        headers = UrllibTransport().head(url('1'))
+        self.assertEqual(headers, {'Content-Length': '5'})
+        m_urlopen.assert_called_once_with(url('1'), method='HEAD')
+        m_urlopen.return_value.close.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
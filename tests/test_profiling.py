@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from pyarxiv import ArxivClient, convert_to_native_types
+from pyarxiv.profiling import (BODY_READ, CONVERT, DISK_WRITE, FILENAME,
+                               HTTP_WAIT, PARSE, RETRIEVE, URL_BUILD,
+                               Profiler, is_active, profile, stage)
+from tests.support import FakeTransport, make_feed
+
+
+class TestProfiler(unittest.TestCase):
+    def test_keeps_slowest_items(self):
+        profiler = Profiler(outliers=2)
+        for i, wall in enumerate([0.1, 0.5, 0.2, 0.4]):
+            profiler.record(HTTP_WAIT, wall, 0.01, 'url%i' % i)
+        stats = profiler.stats()[HTTP_WAIT]
+        self.assertEqual(stats['count'], 4)
+        self.assertAlmostEqual(stats['wall'], 1.2)
+        self.assertAlmostEqual(stats['mean_wall'], 0.3)
+        self.assertEqual(stats['max_wall'], 0.5)
+        self.assertEqual([o['item'] for o in profiler.outliers(HTTP_WAIT)],
+                         ['url1', 'url3'])
+
+    def test_summary_and_json(self):
+        with profile() as profiler:
+            with stage('custom'):
+                pass
+            with stage(HTTP_WAIT, 'http://a'):
+                pass
+        summary = profiler.summary()
+        self.assertLess(summary.index(HTTP_WAIT), summary.index('custom'))
+        self.assertIn('slowest http wait:', summary)
+        self.assertIn('total', summary)
+        data = json.loads(profiler.to_json())
+        self.assertEqual(data['stages']['custom']['count'], 1)
+        self.assertEqual(data['outliers'][HTTP_WAIT][0]['item'], 'http://a')
+        self.assertGreaterEqual(data['wall'], 0)
+
+    def test_stages_outside_profile_do_nothing(self):
+        self.assertFalse(is_active())
+        timer = stage(PARSE, accumulate=True)
+        with timer:
+            pass
+        timer.record()
+        with profile() as profiler:
+            self.assertTrue(is_active())
+        self.assertFalse(is_active())
+        self.assertEqual(profiler.stats(), {})
+
+    def test_nested_profiles_and_threads(self):
+        with profile() as outer:
+            with profile() as inner:
+                thread = threading.Thread(
+                    target=lambda: stage(PARSE).__enter__().__exit__(
+                        None, None, None))
+                thread.start()
+                thread.join()
+            with stage(PARSE):
+                pass
+        self.assertEqual(inner.stats()[PARSE]['count'], 1)
+        self.assertEqual(outer.stats()[PARSE]['count'], 2)
+
+    def test_accumulate(self):
+        with profile() as profiler:
+            timer = stage(BODY_READ, 'file', accumulate=True)
+            for _ in range(3):
+                with timer:
+                    pass
+            timer.record()
+        self.assertEqual(profiler.stats()[BODY_READ]['count'], 1)
+
+
+class TestClientStages(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_query(self):
+        client = ArxivClient(transport=FakeTransport(make_feed(['1', '2'])))
+        with profile() as profiler:
+            entries = client.query(ids=['1', '2'], fields=['id', 'updated'])
+            for entry in entries:
+                convert_to_native_types(entry, ['updated'])
+        stats = profiler.stats()
+        for name in (URL_BUILD, HTTP_WAIT, BODY_READ, PARSE):
+            self.assertEqual(stats[name]['count'], 1, name)
+        self.assertEqual(stats[CONVERT]['count'], 2)
+        self.assertEqual(profiler.outliers(CONVERT)[0]['item'][:17],
+                         'http://arxiv.org/')
+
+    def test_iter_query_times_each_page(self):
+        client = ArxivClient(transport=FakeTransport(make_feed(['1', '2'])))
+        with profile() as profiler:
+            list(client.iter_query(ids=['1', '2'], max_results=4,
+                                   page_size=2))
+        stats = profiler.stats()
+        self.assertEqual(stats[URL_BUILD]['count'], 2)
+        self.assertEqual(stats[HTTP_WAIT]['count'], 2)
+        self.assertEqual(stats[PARSE]['count'], 2)
+
+    def test_download_times_transport_retrieve(self):
+        transport = FakeTransport(b'%PDF' * 1000, pdf=b'%PDF' * 1000)
+        client = ArxivClient(transport=transport)
+        with profile() as profiler:
+            client.download_entry('1709.05312v1', self.directory)
+        stats = profiler.stats()
+        for name in (URL_BUILD, FILENAME, RETRIEVE):
+            self.assertEqual(stats[name]['count'], 1, name)
+        self.assertNotIn(HTTP_WAIT, stats)
+        self.assertEqual(transport.retrieved,
+                         ['https://arxiv.org/pdf/1709.05312v1.pdf'])
+        self.assertEqual(transport.opened, [])
+        self.assertEqual(profiler.outliers(FILENAME)[0]['item'],
+                         '1709.05312v1')
+
+    def test_chunked_download_splits_transfer(self):
+        transport = FakeTransport(b'%PDF' * 1000, pdf=b'%PDF' * 1000)
+        client = ArxivClient(transport=transport)
+        with profile() as profiler:
+            client.download_entry('1709.05312v1', self.directory,
+                                  byte_progress_callback=lambda *a: None)
+        stats = profiler.stats()
+        for name in (HTTP_WAIT, BODY_READ, DISK_WRITE):
+            self.assertEqual(stats[name]['count'], 1, name)
+        self.assertNotIn(RETRIEVE, stats)
+        with open(os.path.join(self.directory, '1709.05312v1.pdf'),
+                  'rb') as f:
+            self.assertEqual(f.read(), b'%PDF' * 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
+import datetime
 import sys
 import unittest
 
 import pyarxiv as paq
 from pyarxiv.arxiv_categories import ArxivCategory
 
+ACCEPT_ENCODING = {'Accept-Encoding': 'gzip, deflate'}
+
 if sys.version_info >= (3, 3):  # starting python 3.3
     from unittest.mock import patch, Mock
 
@@ -22,7 +25,8 @@ class TestQuery(unittest.TestCase):
         mock_parse.return_value = parse_ret
         self.assertEqual(paq.query(max_results=100), 'asdf')
         mock_req.assert_called_with(
-            "http://export.arxiv.org/api/query?max_results=100")
+            "http://export.arxiv.org/api/query?max_results=100",
+            headers=ACCEPT_ENCODING)
 
     @patch('feedparser.parse')
     @patch('pyarxiv.urlopen')
@@ -35,7 +39,8 @@ class TestQuery(unittest.TestCase):
                   querystring='somequerystring')
         mock_req.assert_called_with(
             "http://export.arxiv.org/api/query?max_results=100"
-            "&search_query=somequerystring&id_list=1")
+            "&search_query=somequerystring&id_list=1",
+            headers=ACCEPT_ENCODING)
 
     @patch('feedparser.parse')
     @patch('pyarxiv.urlopen')
@@ -45,7 +50,8 @@ class TestQuery(unittest.TestCase):
         paq.query(ids=['1', '2'])
         mock_req.assert_called_with(
             "http://export.arxiv.org/api/query?max_results=100"
-            "&id_list=1,2")
+            "&id_list=1,2",
+            headers=ACCEPT_ENCODING)
 
     @patch('feedparser.parse')
     @patch('pyarxiv.urlopen')
@@ -54,7 +60,23 @@ class TestQuery(unittest.TestCase):
                                       mock_parse):
         paq.query()
         mock_req.assert_called_with(
-            "http://export.arxiv.org/api/query?max_results=100")
+            "http://export.arxiv.org/api/query?max_results=100",
+            headers=ACCEPT_ENCODING)
+
+    @patch('feedparser.parse')
+    @patch('pyarxiv.urlopen')
+    def test_latest_in_category(self,
+                                mock_req,
+                                mock_parse):
+        paq.query(max_results=10, categories=['cs.CL'],
+                  sort_by='submittedDate', sort_order='descending',
+                  submitted_after='2017-09-01')
+        mock_req.assert_called_with(
+            "http://export.arxiv.org/api/query?max_results=10"
+            "&search_query=%28cat:cs.CL%29+AND+"
+            "submittedDate:%5B201709010000+TO+999912312359%5D"
+            "&sortBy=submittedDate&sortOrder=descending",
+            headers=ACCEPT_ENCODING)
 
     @patch('pyarxiv.urlopen')
     def test_wraps_exceptions_in_valueerror(self,
@@ -82,6 +104,11 @@ class TestQueryConstruction(unittest.TestCase):
                          '%28cat:rand1+OR+cat:cs.AI+OR+'
                          'cat:otherRandomString%29')
 
+    def test_categories_expands_archives(self):
+        self.assertEqual(paq.get_querystring(['nlin.*']),
+                         '%28cat:nlin.AO+OR+cat:nlin.CG+OR+cat:nlin.CD+OR+'
+                         'cat:nlin.SI+OR+cat:nlin.PS%29')
+
     def test_title(self):
         self.assertEqual(paq.get_querystring(title=''), '')
         self.assertEqual(paq.get_querystring(title='some random title'),
@@ -111,6 +138,49 @@ class TestQueryConstruction(unittest.TestCase):
                          'abs:%22some+abstract%22+AND+'
                          'jr:%22journal+ref%22')
 
+    def test_submitted_date_range(self):
+        self.assertEqual(paq.get_querystring(
+            ['cs.CL'], submitted_after=datetime.date(2017, 9, 1),
+            submitted_before='2017-09-30 23:59'),
+            '%28cat:cs.CL%29+AND+'
+            'submittedDate:%5B201709010000+TO+201709302359%5D')
+        self.assertEqual(paq.get_querystring(
+            title='x', submitted_before=datetime.datetime(2017, 9, 1)),
+            'ti:%22x%22+AND+'
+            'submittedDate:%5B199101010000+TO+201709010000%5D')
+
+    def test_date_only_upper_bound_includes_the_day(self):
+        for before in ('2017-09-30', datetime.date(2017, 9, 30)):
+            self.assertEqual(paq.get_querystring(
+                title='x', submitted_after='2017-09-01',
+                submitted_before=before),
+                'ti:%22x%22+AND+'
+                'submittedDate:%5B201709010000+TO+201709302359%5D')
+
+    def test_format_submitted_date(self):
+        utc_plus_2 = datetime.timezone(datetime.timedelta(hours=2))
+        self.assertEqual(paq.format_submitted_date(
+            datetime.datetime(2017, 9, 1, 12, 30, tzinfo=utc_plus_2)),
+            '201709011030')
+        self.assertEqual(paq.format_submitted_date('20170901'),
+                         '201709010000')
+        self.assertEqual(paq.format_submitted_date('2017-09-01 12'),
+                         '201709011200')
+        self.assertEqual(paq.format_submitted_date('2017-09-01 12',
+                                                   end_of_day=True),
+                         '201709011259')
+        with self.assertRaises(ValueError):
+            paq.format_submitted_date('last week')
+
+    def test_sort_params(self):
+        self.assertEqual(paq.get_query_params(
+            5, sort_by='submittedDate', sort_order='descending'),
+            'max_results=5&sortBy=submittedDate&sortOrder=descending')
+        with self.assertRaises(ValueError):
+            paq.get_query_params(5, sort_by='date')
+        with self.assertRaises(ValueError):
+            paq.get_query_params(5, sort_order='up')
+
 
 if __name__ == "__main__":
     unittest.main()
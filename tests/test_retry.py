@@ -0,0 +1,171 @@
+import os
+import pickle
+import shutil
+import socket
+import sys
+import tempfile
+import unittest
+from urllib.error import HTTPError, URLError
+
+from pyarxiv import ArxivClient
+from pyarxiv.retry import (DownloadReport, NotFoundError, PermanentError,
+                           RetryPolicy, ThrottledError, TransientError,
+                           classify_error)
+from pyarxiv.store import PdfStore
+from tests.support import FakeTransport, http_error
+
+if sys.version_info >= (3, 3):  # starting python 3.3
+    from unittest.mock import patch, Mock
+
+else:
+    from mock import patch, Mock
+
+
+class TestClassifyError(unittest.TestCase):
+    def test_http_errors(self):
+        self.assertIsInstance(classify_error(http_error(404)), NotFoundError)
+        self.assertIsInstance(classify_error(http_error(410)), NotFoundError)
+        self.assertIsInstance(classify_error(http_error(500)), TransientError)
+        self.assertIsInstance(classify_error(http_error(408)), TransientError)
+        self.assertIsInstance(classify_error(http_error(403)), PermanentError)
+
+    def test_throttled_reads_retry_after(self):
+        error = classify_error(http_error(429, {'Retry-After': '7'}))
+        self.assertIsInstance(error, ThrottledError)
+        self.assertEqual(error.retry_after, 7.0)
+        self.assertIsNone(classify_error(http_error(503)).retry_after)
+
+    def test_network_errors_are_transient(self):
+        for exc in (URLError('reset'), socket.timeout('timed out'),
+                    ConnectionResetError()):
+            error = classify_error(exc)
+            self.assertIsInstance(error, TransientError)
+            self.assertIs(error.cause, exc)
+
+    def test_other_errors_are_permanent(self):
+        self.assertIsInstance(classify_error(ValueError('bad id')),
+                              PermanentError)
+        error = TransientError('already classified')
+        self.assertIs(classify_error(error), error)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+        with self.assertRaises(ValueError):
+            RetryPolicy(jitter=2)
+
+    def test_delay_backs_off_exponentially(self):
+        policy = RetryPolicy(base_delay=1, max_delay=5, jitter=0)
+        self.assertEqual([policy.delay(a) for a in range(1, 5)],
+                         [1, 2, 4, 5])
+
+    def test_delay_jitter_and_retry_after(self):
+        policy = RetryPolicy(base_delay=2, jitter=0.5)
+        for _ in range(20):
+            self.assertTrue(1 <= policy.delay(1) <= 3)
+        throttled = ThrottledError('slow down', retry_after=30)
+        self.assertGreaterEqual(policy.delay(1, throttled), 30)
+
+    @patch('pyarxiv.retry.time.sleep')
+    def test_call_retries_transient_errors(self, m_sleep):
+        fn = Mock(side_effect=[URLError('reset'), http_error(500), 'done'])
+        policy = RetryPolicy(max_attempts=3, jitter=0)
+        self.assertEqual(policy.call(fn, 1, a=2), 'done')
+        self.assertEqual(fn.call_count, 3)
+        fn.assert_called_with(1, a=2)
+        self.assertEqual([c[0][0] for c in m_sleep.call_args_list], [1, 2])
+
+    @patch('pyarxiv.retry.time.sleep')
+    def test_call_gives_up(self, m_sleep):
+        error = URLError('reset')
+        fn = Mock(side_effect=error)
+        with self.assertRaises(URLError) as cm:
+            RetryPolicy(max_attempts=2).call(fn)
+        self.assertIs(cm.exception, error)
+        self.assertEqual(fn.call_count, 2)
+
+    @patch('pyarxiv.retry.time.sleep')
+    def test_call_does_not_retry_permanent_errors(self, m_sleep):
+        fn = Mock(side_effect=http_error(404))
+        with self.assertRaises(HTTPError):
+            RetryPolicy(max_attempts=5).call(fn)
+        self.assertEqual(fn.call_count, 1)
+        m_sleep.assert_not_called()
+
+
+class TestDownloadEntries(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def url(self, arxiv_id):
+        return 'https://arxiv.org/pdf/%s.pdf' % arxiv_id
+
+    def test_continues_after_any_error(self):
+        transport = FakeTransport(
+            pdf=b'%PDF', failures={self.url('1'): [URLError('reset')]})
+        client = ArxivClient(transport=transport)
+        exceptions = client.download_entries(['1', '2'], self.directory)
+        self.assertEqual(len(exceptions), 1)
+        self.assertIsInstance(exceptions[0], URLError)
+        self.assertEqual(transport.retrieved, [self.url('2')])
+
+    def check_retries_and_reports(self, max_workers):
+        transport = FakeTransport(pdf=b'%PDF', failures={
+            self.url('1'): [URLError('reset'), http_error(503)],
+            self.url('2'): [http_error(404)],
+            self.url('3'): [URLError('reset')] * 3})
+        client = ArxivClient(transport=transport)
+        report = DownloadReport()
+        exceptions = client.download_entries(
+            ['1', '2', '3'], self.directory, max_workers=max_workers,
+            retry_policy=RetryPolicy(max_attempts=3), report=report)
+        self.assertEqual(len(exceptions), 2)
+        self.assertEqual(report.succeeded, ['1'])
+        self.assertEqual(sorted(e for e, _ in report.failed), ['2', '3'])
+        self.assertEqual(report.resume_list(), ['3'])
+        self.assertEqual(sorted(report.resume_list(True)), ['2', '3'])
+
+    @patch('pyarxiv.retry.time.sleep')
+    def test_retries_and_reports(self, m_sleep):
+        self.check_retries_and_reports(1)
+
+    @patch('pyarxiv.retry.time.sleep')
+    def test_retries_and_reports_concurrently(self, m_sleep):
+        self.check_retries_and_reports(3)
+
+    def test_report_pickles(self):
+        report = DownloadReport()
+        report.add('1')
+        report.add('2', http_error(404))
+        report.add('3', http_error(503, {'Retry-After': '5'}))
+        copy = pickle.loads(pickle.dumps(report))
+        self.assertEqual(copy.succeeded, ['1'])
+        self.assertEqual(copy.resume_list(), ['3'])
+        error = copy.errors()[1][1]
+        self.assertIsInstance(error, ThrottledError)
+        self.assertEqual(error.retry_after, 5.0)
+        self.assertIn('HTTPError', str(error))
+        copy.add('4')
+        self.assertEqual(copy.succeeded, ['1', '4'])
+        self.assertIsInstance(report.failed[0][1], HTTPError)
+
+    def test_report_skips_stored(self):
+        store = PdfStore(os.path.join(self.directory, 'store'))
+        client = ArxivClient(transport=FakeTransport(pdf=b'%PDF'), store=store)
+        target = os.path.join(self.directory, 'papers')
+        os.mkdir(target)
+        client.download_entries(['1v1'], target)
+        report = DownloadReport()
+        client.download_entries(['1v1', '2v1'], target, report=report)
+        self.assertEqual(report.skipped, ['1v1'])
+        self.assertEqual(report.succeeded, ['2v1'])
+        self.assertIn('1 skipped', repr(report))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import datetime
+import sys
+import unittest
+
+import pyarxiv as paq
+from pyarxiv.arxiv_categories import ArxivCategory
+from pyarxiv.search import (Title, Author, Abstract, Cat, All,
+                            SubmittedDate, And, Or)
+
+ACCEPT_ENCODING = {'Accept-Encoding': 'gzip, deflate'}
+
+if sys.version_info >= (3, 3):  # starting python 3.3
+    from unittest.mock import patch, Mock
+
+else:
+    from mock import patch, Mock
+
+
+class TestSearch(unittest.TestCase):
+    def test_terms(self):
+        self.assertEqual(Title('WaveNet').compile(), 'ti:WaveNet')
+        self.assertEqual(Author('van den Oord').compile(),
+                         'au:"van den Oord"')
+        self.assertEqual(Abstract('"speech"').compile(), 'abs:speech')
+        self.assertEqual(Cat(ArxivCategory.cs_AI).compile(), 'cat:cs.AI')
+        self.assertEqual(Cat('math.AG').compile(), 'cat:math.AG')
+
+    def test_empty_term_raises(self):
+        self.assertRaises(ValueError, Title(' ').compile)
+
+    def test_composition(self):
+        q = (Title('neural') & (Author('Hinton') | Author('LeCun'))
+             & ~Cat(ArxivCategory.cs_AI))
+        self.assertEqual(q.compile(),
+                         'ti:neural AND (au:Hinton OR au:LeCun) '
+                         'ANDNOT cat:cs.AI')
+        self.assertEqual(q.encode(),
+                         'ti:neural+AND+%28au:Hinton+OR+au:LeCun%29'
+                         '+ANDNOT+cat:cs.AI')
+
+    def test_negation_moves_after_positive_terms(self):
+        q = ~Cat('cs.AI') & Title('neural')
+        self.assertEqual(q.compile(), 'ti:neural ANDNOT cat:cs.AI')
+
+    def test_nested_operators_are_flattened(self):
+        q = Title('a') & Title('b') & Title('c')
+        self.assertIsInstance(q, And)
+        self.assertEqual(len(q.operands), 3)
+        q = All('a') | (All('b') | All('c'))
+        self.assertIsInstance(q, Or)
+        self.assertEqual(q.compile(), 'all:a OR all:b OR all:c')
+
+    def test_and_inside_or_is_grouped(self):
+        q = (Title('a') & ~Title('b')) | Title('c')
+        self.assertEqual(q.compile(), '(ti:a ANDNOT ti:b) OR ti:c')
+
+    def test_double_negation(self):
+        self.assertEqual((~~Title('a')).compile(), 'ti:a')
+
+    def test_negation_without_positive_term_raises(self):
+        self.assertRaises(ValueError, (~Title('a')).compile)
+        self.assertRaises(ValueError, (~Title('a') & ~Title('b')).compile)
+        self.assertRaises(ValueError, (Title('a') | ~Title('b')).compile)
+
+    def test_submitted_date(self):
+        q = Cat('cs.CL') & SubmittedDate(after=datetime.date(2017, 9, 1))
+        self.assertEqual(q.compile(),
+                         'cat:cs.CL AND '
+                         'submittedDate:[201709010000 TO 999912312359]')
+
+    def test_compiled_once(self):
+        q = Title('a') & Author('b')
+        with patch.object(And, '_compile',
+                          return_value='ti:a AND au:b') as mock_compile:
+            q.encode()
+            q.encode()
+            q.compile()
+        self.assertEqual(mock_compile.call_count, 1)
+
+    def test_equal_queries_share_hash_and_cache_key(self):
+        q1 = Title('neural net') & Cat(ArxivCategory.cs_AI)
+        q2 = Title('neural net') & Cat('cs.AI')
+        self.assertEqual(q1, q2)
+        self.assertEqual(hash(q1), hash(q2))
+        self.assertEqual(q1.cache_key(), q2.cache_key())
+        self.assertEqual(len({q1, q2}), 1)
+        self.assertNotEqual(q1.cache_key(), Title('neural net').cache_key())
+
+    def test_cache_key_is_stable(self):
+        self.assertEqual(Title('WaveNet').cache_key(),
+                         'a20caa89b399173def859072e5de576997175058')
+
+    @patch('feedparser.parse')
+    @patch('pyarxiv.urlopen')
+    def test_query_accepts_search(self, mock_req, mock_parse):
+        mock_parse.return_value = Mock(entries=[])
+        paq.query(max_results=10, title='ignored',
+                  querystring=Title('a b') & ~Cat('cs.AI'))
+        mock_req.assert_called_with(
+            'http://export.arxiv.org/api/query?max_results=10'
+            '&search_query=ti:%22a+b%22+ANDNOT+cat:cs.AI',
+            headers=ACCEPT_ENCODING)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import datetime
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import pyarxiv
+from pyarxiv.feed import parse_entries
+from pyarxiv.snapshot import Snapshot, write_snapshot
+from tests.support import make_feed
+
+UTC = datetime.timezone.utc
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'corpus.snap')
+        self.entries = parse_entries(make_feed(
+            ['1709.05312v1', '1709.05313v2', 'math.GT/0309136v1'],
+            updated={'1709.05313v2': '2017-10-01T08:00:00Z'}))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_round_trip(self):
+        self.assertEqual(write_snapshot(self.path, self.entries), 3)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 3)
+            self.assertEqual(snapshot.ids(), ['1709.05312', '1709.05313',
+                                              'math.GT/0309136'])
+            for entry, record in zip(self.entries, snapshot):
+                self.assertEqual(record.id, entry['id'])
+                self.assertEqual(record.title, entry['title'])
+                self.assertEqual(record.summary, entry['summary'])
+                self.assertEqual(record.authors,
+                                 [a['name'] for a in entry['authors']])
+                self.assertEqual(record.tags,
+                                 [t['term'] for t in entry['tags']])
+            record = snapshot[1]
+            self.assertEqual(record.version, 2)
+            self.assertEqual(record.updated,
+                             datetime.datetime(2017, 10, 1, 8, tzinfo=UTC))
+            self.assertEqual(snapshot[-1].arxiv_id, 'math.GT/0309136')
+
+    def test_converted_entries(self):
+        for entry in self.entries:
+            pyarxiv.convert_to_native_types(entry)
+        write_snapshot(self.path, self.entries)
+        with Snapshot(self.path) as snapshot:
+            record = snapshot[0].to_dict()
+            self.assertEqual(record['published'], self.entries[0]['published'])
+            self.assertEqual(record['tags'], self.entries[0]['tags'])
+            self.assertEqual(record['title'], self.entries[0]['title'])
+
+    def test_missing_fields(self):
+        write_snapshot(self.path, [{'id': '1709.05312'}])
+        with Snapshot(self.path) as snapshot:
+            record = snapshot[0]
+            self.assertIsNone(record.version)
+            self.assertIsNone(record.published)
+            self.assertEqual(record.authors, [])
+            self.assertEqual(record.title, '')
+            self.assertEqual(record.id, 'http://arxiv.org/abs/1709.05312')
+
+    def test_get(self):
+        write_snapshot(self.path, self.entries)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.get('1709.05313v1').version, 2)
+            self.assertIsNone(snapshot.get('1709.99999'))
+
+    def test_short_strings_are_stored_once(self):
+        write_snapshot(self.path, self.entries)
+        with Snapshot(self.path) as snapshot:
+            authors = [snapshot[i]._get(8) for i in range(3)]
+        self.assertEqual(len(set(authors)), 1)
+
+    def test_raw_field_is_a_view(self):
+        write_snapshot(self.path, self.entries)
+        snapshot = Snapshot(self.path)
+        raw = snapshot[0].raw('title')
+        self.assertIsInstance(raw, memoryview)
+        self.assertEqual(raw.tobytes(), b'Paper 1709.05312v1')
+        raw.release()
+        snapshot.close()
+
+    def test_pickle(self):
+        write_snapshot(self.path, self.entries)
+        with Snapshot(self.path) as snapshot:
+            copy = pickle.loads(pickle.dumps(snapshot))
+        self.assertEqual(copy[0].title, 'Paper 1709.05312v1')
+        copy.close()
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'<feed>' * 10)
+        self.assertRaises(ValueError, Snapshot, self.path)
+
+    def test_invalid_entry_leaves_no_file(self):
+        self.assertRaises(ValueError, write_snapshot, self.path, [{}])
+        self.assertEqual(os.listdir(self.folder), [])
+
+    def test_index_out_of_range(self):
+        write_snapshot(self.path, self.entries)
+        with Snapshot(self.path) as snapshot:
+            self.assertRaises(IndexError, snapshot.__getitem__, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
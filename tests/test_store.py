@@ -0,0 +1,106 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from pyarxiv import ArxivClient
+from pyarxiv.store import PdfStore
+from tests.support import FakeTransport, run_in_child
+
+
+class TestPdfStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.folders = []
+        for name in ('a', 'b'):
+            folder = os.path.join(self.directory, name)
+            os.makedirs(folder)
+            self.folders.append(folder)
+        self.store = PdfStore(os.path.join(self.directory, 'store'))
+        self.transport = FakeTransport(
+            pdf=lambda url: b'%PDF ' + url.encode('utf-8'))
+        self.client = ArxivClient(transport=self.transport, store=self.store)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_downloads_once_for_several_folders(self):
+        self.client.download_entry('1709.05312v1', self.folders[0])
+        self.client.download_entry({'id': '1709.05312v1', 'title': 'A B'},
+                                   self.folders[1],
+                                   use_title_for_filename=True)
+        self.assertEqual(self.transport.retrieved,
+                         ['https://arxiv.org/pdf/1709.05312v1.pdf'])
+        first = os.path.join(self.folders[0], '1709.05312v1.pdf')
+        second = os.path.join(self.folders[1], 'A_B.pdf')
+        self.assertTrue(os.path.samefile(first, second))
+        self.assertEqual(os.stat(first).st_nlink, 3)
+
+    def test_versions_are_separate(self):
+        self.client.download_entry('1709.05312v1', self.folders[0])
+        self.client.download_entry('1709.05312v2', self.folders[0])
+        self.assertEqual(len(self.transport.retrieved), 2)
+        self.assertIn(('1709.05312', '1'), self.store)
+        self.assertNotIn(('1709.05312', None), self.store)
+
+    def test_identical_content_stored_once(self):
+        for i in ('1', '2'):
+            path = os.path.join(self.directory, i)
+            with open(path, 'wb') as f:
+                f.write(b'same')
+            self.store.add_file(path, i, '1')
+        self.assertEqual(self.store.lookup('1', '1'),
+                         self.store.lookup('2', '1'))
+
+    def test_refetches_missing_blob(self):
+        self.client.download_entry('1v1', self.folders[0])
+        os.remove(self.store.blob_path(self.store.lookup('1', '1')))
+        self.client.download_entry('1v1', self.folders[1])
+        self.assertEqual(len(self.transport.retrieved), 2)
+
+    def test_unversioned_always_fetched(self):
+        self.client.download_entry('1', self.folders[0])
+        self.client.download_entry('1', self.folders[1])
+        self.assertEqual(len(self.transport.retrieved), 2)
+        self.assertNotIn(('1', None), self.store)
+        self.assertTrue(os.path.samefile(
+            os.path.join(self.folders[0], '1.pdf'),
+            os.path.join(self.folders[1], '1.pdf')))
+
+    def test_symlink_and_copy(self):
+        for mode, folder in zip(('symlink', 'copy'), self.folders):
+            store = PdfStore(self.store.root, link=mode)
+            client = self.client.copy(store=store)
+            client.download_entry('1', folder)
+            path = os.path.join(folder, '1.pdf')
+            self.assertEqual(os.path.islink(path), mode == 'symlink')
+        with self.assertRaises(ValueError):
+            PdfStore(self.store.root, link='move')
+
+    def test_failed_fetch_leaves_nothing(self):
+        def fail(url, filename):
+            raise IOError('network down')
+        self.transport.retrieve = fail
+        with self.assertRaises(IOError):
+            self.client.download_entry('1', self.folders[0])
+        self.assertEqual(os.listdir(os.path.join(self.store.root, 'tmp')), [])
+        self.assertEqual(os.listdir(self.folders[0]), [])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def test_child_opens_own_connection(self):
+        self.store.lookup('1', '1')
+        self.assertIsNotNone(self.store._db)
+        self.assertEqual(run_in_child(
+            lambda: self.store._db is None
+            and self.store.lookup('1', '1') is None), 0)
+        self.assertIsNone(self.store.lookup('1', '1'))
+
+    def test_pickles(self):
+        self.store.lookup('1', '1')
+        clone = pickle.loads(pickle.dumps(self.store))
+        self.assertIsNone(clone.lookup('1', '1'))
+
+
+if __name__ == "__main__":
+    unittest.main()
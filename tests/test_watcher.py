@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyarxiv import ArxivClient
+from pyarxiv.cache import MemoryCache
+from pyarxiv.watcher import CategoryWatcher
+from tests.support import FeedTransport
+
+
+class TestCategoryWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.directory, 'state.json')
+        self.transport = FeedTransport()
+        self.client = ArxivClient(transport=self.transport)
+        self.transport.updated = {'1': '2017-01-01T00:00:00Z',
+                                  '2': '2017-01-02T00:00:00Z'}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def watcher(self, page_size=2):
+        return CategoryWatcher(self.state_path, ['cs.AI'],
+                               client=self.client, page_size=page_size)
+
+    def poll_ids(self, page_size=2):
+        return [e['id'].split('/')[-1]
+                for e in self.watcher(page_size).poll()]
+
+    def test_sorted_query(self):
+        self.poll_ids()
+        self.assertIn('&sortBy=lastUpdatedDate&sortOrder=descending',
+                      self.transport.opened[0])
+        self.assertIn('search_query=%28cat:cs.AI%29',
+                      self.transport.opened[0])
+
+    def test_only_new_and_updated_entries(self):
+        self.assertEqual(self.poll_ids(), ['2', '1'])
+        self.assertEqual(self.poll_ids(), [])
+        self.transport.updated['3'] = '2017-01-03T00:00:00Z'
+        self.transport.updated['1'] = '2017-01-04T00:00:00Z'
+        self.assertEqual(self.poll_ids(), ['1', '3'])
+
+    def test_same_timestamp_as_mark(self):
+        self.poll_ids()
+        self.transport.updated['3'] = '2017-01-02T00:00:00Z'
+        self.assertEqual(self.poll_ids(), ['3'])
+
+    def test_stops_paging_at_mark(self):
+        for i in range(10):
+            self.transport.updated[str(10 + i)] = '2016-01-%02iT00:00:00Z' \
+                % (i + 1)
+        self.poll_ids()
+        self.transport.opened = []
+        self.transport.updated['99'] = '2018-01-01T00:00:00Z'
+        self.assertEqual(self.poll_ids(page_size=3), ['99'])
+        self.assertEqual(len(self.transport.opened), 1)
+
+    def test_stops_paging_with_empty_category(self):
+        for i in range(10):
+            self.transport.updated[str(10 + i)] = '2016-01-%02iT00:00:00Z' \
+                % (i + 1)
+        watcher = CategoryWatcher(self.state_path, ['cs.AI', 'cs.GL'],
+                                  client=self.client, page_size=3)
+        self.assertEqual(len(list(watcher.poll())), 12)
+        self.assertEqual(watcher.load_state()['cs.GL']['updated'],
+                         '2017-01-02T00:00:00Z')
+        self.transport.opened = []
+        self.transport.updated['99'] = '2018-01-01T00:00:00Z'
+        self.assertEqual([e['id'] for e in watcher.poll()],
+                         ['http://arxiv.org/abs/99'])
+        self.assertEqual(len(self.transport.opened), 1)
+
+    def test_ignores_client_cache(self):
+        self.client.cache = MemoryCache()
+        self.poll_ids()
+        self.transport.updated['3'] = '2017-01-03T00:00:00Z'
+        self.assertEqual(self.poll_ids(), ['3'])
+
+    def test_mark_kept_when_results_cut_off(self):
+        self.poll_ids()
+        for i in range(3):
+            self.transport.updated[str(10 + i)] = '2017-02-%02iT00:00:00Z' \
+                % (i + 1)
+        watcher = CategoryWatcher(self.state_path, ['cs.AI'],
+                                  client=self.client, max_results=2)
+        self.assertEqual(len(list(watcher.poll())), 2)
+        self.assertEqual(watcher.load_state()['cs.AI']['updated'],
+                         '2017-01-02T00:00:00Z')
+        self.assertEqual(self.poll_ids(), ['12', '11', '10'])
+
+    def test_abandoned_poll_does_not_advance(self):
+        next(self.watcher().poll())
+        self.assertFalse(os.path.exists(self.state_path))
+        self.assertEqual(self.poll_ids(), ['2', '1'])
+        with open(self.state_path) as f:
+            self.assertEqual(json.load(f)['cs.AI']['updated'],
+                             '2017-01-02T00:00:00Z')
+
+
+if __name__ == "__main__":
+    unittest.main()
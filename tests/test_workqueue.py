@@ -0,0 +1,169 @@
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from pyarxiv import ArxivClient
+from pyarxiv.workqueue import DONE, FAILED, LEASED, PENDING, \
+    SQLiteWorkQueue, _Heartbeat, run_worker
+from tests.support import FakeTransport, run_in_child
+
+if sys.version_info >= (3, 3):  # starting python 3.3
+    from unittest.mock import patch, Mock
+
+else:
+    from mock import patch, Mock
+
+
+class TestSQLiteWorkQueue(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'queue.sqlite')
+        self.queue = SQLiteWorkQueue(self.path, lease_seconds=60,
+                                     max_attempts=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def test_child_opens_own_connection(self):
+        self.queue.put(['1'])
+        self.assertEqual(run_in_child(
+            lambda: self.queue._db is None
+            and self.queue.claim('child') == ['1']), 0)
+        self.assertEqual(self.queue.counts()[LEASED], 1)
+
+    def test_put_is_idempotent(self):
+        self.assertEqual(self.queue.put(['1', '2', {'id': '3'}]), 3)
+        self.assertEqual(self.queue.put(['1', {'id': '3'}]), 0)
+        self.assertEqual(self.queue.counts()[PENDING], 3)
+
+    def test_claims_are_exclusive(self):
+        self.queue.put(['1', '2', '3'])
+        other = SQLiteWorkQueue(self.path)
+        self.assertEqual(self.queue.claim('a', 2), ['1', '2'])
+        self.assertEqual(other.claim('b', 2), ['3'])
+        self.assertEqual(other.claim('b', 2), [])
+
+    def test_expired_lease_is_reclaimed(self):
+        self.queue.put(['1'])
+        self.queue.claim('dead worker')
+        with patch('pyarxiv.workqueue.time.time', return_value=1e12):
+            self.assertEqual(self.queue.claim('b'), ['1'])
+            self.assertEqual(self.queue.counts()[LEASED], 1)
+
+    def test_heartbeat_extends_lease(self):
+        self.queue.put(['1'])
+        with patch('pyarxiv.workqueue.time.time', return_value=1000.0):
+            self.queue.claim('a')
+        with patch('pyarxiv.workqueue.time.time', return_value=1050.0):
+            self.queue.heartbeat('a', ['1'])
+        with patch('pyarxiv.workqueue.time.time', return_value=1070.0):
+            self.assertEqual(self.queue.claim('b'), [])
+
+    def test_retries_then_fails(self):
+        self.queue.put(['1'])
+        for _ in range(2):
+            self.assertEqual(self.queue.claim('a'), ['1'])
+            self.queue.fail('a', '1', IOError('boom'))
+        self.assertEqual(self.queue.claim('a'), [])
+        self.assertEqual(self.queue.failed(), [('1', 'boom')])
+
+    def test_claim_skips_exhausted_rows(self):
+        queue = SQLiteWorkQueue(self.path, max_attempts=1)
+        queue.put(['1', '2'])
+        queue.claim('dead worker')
+        with patch('pyarxiv.workqueue.time.time', return_value=1e12):
+            self.assertEqual(queue.claim('b'), ['2'])
+        self.assertEqual(queue.failed(), [('1', 'lease expired')])
+
+    def test_fail_ignored_after_lease_taken_over(self):
+        self.queue.put(['1'])
+        self.queue.claim('a')
+        with patch('pyarxiv.workqueue.time.time', return_value=1e12):
+            self.queue.claim('b')
+        self.assertIsNone(self.queue.fail('a', '1', 'too late'))
+        self.assertEqual(self.queue.counts()[LEASED], 1)
+        self.assertEqual(self.queue.fail('b', '1', 'boom'), FAILED)
+
+    def test_complete(self):
+        self.queue.put(['1'])
+        self.queue.claim('a')
+        self.queue.complete('a', '1')
+        self.queue.fail('a', '1', 'late failure')
+        self.assertEqual(self.queue.counts()[DONE], 1)
+
+
+class TestRunWorker(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'queue.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_workers_share_queue_without_double_work(self):
+        ids = [str(i) for i in range(40)]
+        SQLiteWorkQueue(self.path).put(ids)
+        transport = FakeTransport()
+        client = ArxivClient(transport=transport)
+        workers = [threading.Thread(target=run_worker, kwargs=dict(
+            queue=SQLiteWorkQueue(self.path), client=client,
+            worker_id='w%i' % i, target_folder=self.directory,
+            max_workers=2, poll_interval=0.01)) for i in range(3)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        self.assertEqual(sorted(transport.retrieved),
+                         sorted('https://arxiv.org/pdf/%s.pdf' % i
+                                for i in ids))
+        self.assertEqual(SQLiteWorkQueue(self.path).counts()[DONE], 40)
+
+    def test_failures_reported_and_retried(self):
+        queue = SQLiteWorkQueue(self.path, max_attempts=2)
+        queue.put(['1', '2'])
+        transport = FakeTransport(failures={
+            'https://arxiv.org/pdf/2.pdf': IOError('HTTP Error 503')})
+        reported = []
+        exceptions = run_worker(
+            queue, ArxivClient(transport=transport),
+            target_folder=self.directory,
+            progress_callback=lambda e, exc: reported.append((e, exc)))
+        self.assertEqual(len(exceptions), 1)
+        self.assertEqual([e for e, exc in reported], ['1', '2'])
+        self.assertIs(reported[1][1], exceptions[0])
+        self.assertEqual(queue.counts()[FAILED], 1)
+
+    def test_pending_work_left_by_dead_worker_is_done(self):
+        queue = SQLiteWorkQueue(self.path, lease_seconds=0.05,
+                                max_attempts=1)
+        queue.put(['1', '2'])
+        queue.claim('dead worker')
+        transport = FakeTransport()
+        run_worker(queue, ArxivClient(transport=transport),
+                   target_folder=self.directory, poll_interval=0.01)
+        self.assertEqual(transport.retrieved,
+                         ['https://arxiv.org/pdf/2.pdf'])
+        self.assertEqual(queue.counts()[PENDING], 0)
+        self.assertEqual(queue.counts()[FAILED], 1)
+
+    def test_heartbeat_survives_errors(self):
+        queue = Mock()
+        queue.heartbeat.side_effect = [sqlite3.OperationalError('locked'),
+                                       None, None]
+        with patch('pyarxiv.workqueue.logger') as m_logger:
+            with _Heartbeat(queue, 'a', 0.001) as heartbeat:
+                heartbeat.elements = ['1']
+                while queue.heartbeat.call_count < 2:
+                    time.sleep(0.001)
+                heartbeat.elements = []
+        self.assertTrue(m_logger.warning.called)
+
+
+if __name__ == "__main__":
+    unittest.main()